@@ -5,7 +5,8 @@ This module defines the database schema using SQLAlchemy ORM. It includes models
 for users, groups, recipes, ingredients, shopping lists, and more.
 """
 
-from sqlalchemy import Column, Integer, String, Float, Boolean, Date, ForeignKey, DateTime, Text, MetaData
+from sqlalchemy import (Column, Integer, String, Float, Boolean, Date, ForeignKey, DateTime, Text,
+                        MetaData, Index, func)
 from sqlalchemy.orm import relationship
 from sqlalchemy.ext.declarative import declarative_base
 
@@ -29,6 +30,11 @@ class UserModel(Base):
     creation_date = Column(String(255), nullable=False)
     update_date = Column(String(255), nullable=False)
 
+    __table_args__ = (
+        Index("uq_user_username", "username", unique=True),
+        Index("uq_user_email", "email", unique=True),
+    )
+
 
 class Unit(Base):
     """SQLAlchemy model representing a unit of measurement."""
@@ -95,6 +101,13 @@ class Recipe(Base):
     group_id = Column(Integer, ForeignKey("Group.group_id"), nullable=True)
     time_unit_id = Column(Integer, ForeignKey("TimeUnit.time_unit_id"), nullable=True)
 
+    __table_args__ = (
+        Index("ft_recipe_text", "title", "description", "instructions", mysql_prefix="FULLTEXT"),
+        Index("ix_recipe_difficulty_cooking_time", "difficulty", "cooking_time"),
+        Index("ix_recipe_cooking_time", "cooking_time"),
+        Index("ix_recipe_total_calories", "total_calories"),
+    )
+
 
 class RecipeCategory(Base):
     """SQLAlchemy model representing a category for recipes."""
@@ -110,6 +123,10 @@ class RecipeCategoryBridge(Base):
     recipe_id = Column(Integer, ForeignKey("Recipe.recipe_id"), primary_key=True)
     category_id = Column(Integer, ForeignKey("RecipeCategory.category_id"), primary_key=True)
 
+    __table_args__ = (
+        Index("ix_recipe_category_bridge_category_recipe", "category_id", "recipe_id"),
+    )
+
 
 class Pantry(Base):
     """SQLAlchemy model representing a pantry for a group."""
@@ -127,6 +144,10 @@ class PantryItem(Base):
     unit_id = Column(Integer, ForeignKey("Unit.unit_id"), nullable=False)
     expiry_date = Column(Date, nullable=True)
 
+    __table_args__ = (
+        Index("ix_pantry_item_expiry_date", "expiry_date", "pantry_id", "ingredient_id"),
+    )
+
 
 class Notification(Base):
     """SQLAlchemy model representing a notification for a group."""
@@ -135,6 +156,7 @@ class Notification(Base):
     group_id = Column(Integer, ForeignKey("Group.group_id"), nullable=False)
     message = Column(Text, nullable=False)
     date = Column(DateTime, nullable=False)
+    dedupe_key = Column(String(255), nullable=True, unique=True)
 
 
 class Menu(Base):
@@ -211,4 +233,35 @@ class CalorieUnit(Base):
     calorie_unit_id = Column(Integer, primary_key=True, index=True)
     name = Column(String(255), nullable=False)
     abbreviation = Column(String(10), nullable=False)
-    
\ No newline at end of file
+
+
+class ApiKey(Base):
+    """SQLAlchemy model representing an API client key and its rate limit."""
+    __tablename__ = "ApiKey"
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    name = Column(String(255), nullable=False)
+    key_hash = Column(String(64), nullable=False, unique=True)
+    rate_limit = Column(Float, nullable=False)
+    burst = Column(Integer, nullable=False)
+    is_active = Column(Boolean, nullable=False, default=True)
+    creation_date = Column(Date, nullable=False)
+    update_date = Column(Date, nullable=False)
+
+
+class UnitConversion(Base):
+    """SQLAlchemy model representing a unit conversion factor, optionally per ingredient."""
+    __tablename__ = "UnitConversion"
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    from_unit_id = Column(Integer, ForeignKey("Unit.unit_id"), nullable=False)
+    to_unit_id = Column(Integer, ForeignKey("Unit.unit_id"), nullable=False)
+    factor = Column(Float, nullable=False)
+    ingredient_id = Column(Integer, ForeignKey("Ingredient.ingredient_id"), nullable=True)
+    creation_date = Column(Date, nullable=False)
+    update_date = Column(Date, nullable=False)
+
+    __table_args__ = (
+        # NULL ingredients are distinct in a plain unique index, so allowing one
+        # general factor per pair needs COALESCE
+        Index("uq_unit_conversion_pair_ingredient", from_unit_id, to_unit_id,
+              func.coalesce(ingredient_id, 0), unique=True),
+    )
@@ -0,0 +1,39 @@
+"""
+recompute_calories.py
+
+Recompute the stored calorie totals of every recipe and menu.
+
+Recipe totals are recomputed first from their ingredient lines, then menu
+totals from the new recipe totals. Each chunk of IDs is one set-based UPDATE
+in its own transaction.
+
+Usage (from the app directory):
+    python -m commands.recompute_calories --chunk-size 1000
+"""
+
+import argparse
+import time
+from config.database import database
+from services.calorie_service import RECOMPUTE_CHUNK_SIZE, CalorieService
+
+
+def main():
+    """Recompute every recipe and menu total and report how long it took."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n", maxsplit=1)[0])
+    parser.add_argument("--chunk-size", type=int, default=RECOMPUTE_CHUNK_SIZE,
+                        help="IDs per UPDATE")
+    parser.add_argument("--skip-menus", action="store_true",
+                        help="only recompute the recipe totals")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    with database.connection_context():
+        recipes = CalorieService.recompute_recipes(chunk_size=args.chunk_size)
+        print(f"Recomputed {recipes} recipes in {time.perf_counter() - start:.2f}s")
+        if not args.skip_menus:
+            menus = CalorieService.recompute_menus(chunk_size=args.chunk_size)
+            print(f"Recomputed {menus} menus in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,8 +5,13 @@ This module defines the database models using Peewee ORM to interact with a MySQ
 """
 
 import os
+import threading
+import time
+from contextvars import ContextVar
 from dotenv import load_dotenv
 from peewee import (
+    mysql as mysql_driver,
+    _ConnectionState,
     MySQLDatabase,
     Model,
     AutoField,
@@ -14,24 +19,272 @@ from peewee import (
     ForeignKeyField,
     IntegerField,
     DecimalField,
+    FloatField,
     DateField,
     TextField,
     BooleanField,
     DateTimeField,
-    CompositeKey
+    CompositeKey,
+    NodeList,
+    SQL,
+    fn,
 )
+from playhouse.pool import PooledMySQLDatabase, PooledSqliteDatabase
 
 # Load environment variables
 load_dotenv()
 
-# Set up the database connection
-database = MySQLDatabase(
-    os.getenv("MYSQL_DATABASE"),
-    user=os.getenv("MYSQL_USER"),
-    passwd=os.getenv("MYSQL_PASSWORD"),
-    host=os.getenv("MYSQL_HOST"),
-    port=int(os.getenv("MYSQL_PORT")),
-)
+# Per-request connection state. Each request gets its own dict so the pooled
+# connection checked out while serving it is never shared with another request.
+_connection_state: ContextVar[dict | None] = ContextVar("connection_state", default=None)
+_thread_state = threading.local()
+
+
+def _new_state() -> dict:
+    """Return an empty Peewee connection state."""
+    return {"closed": True, "conn": None, "ctx": [], "transactions": []}
+
+
+class ContextConnectionState(_ConnectionState):
+    """
+    Peewee connection state stored in a context variable.
+
+    Peewee keeps the open connection in a thread-local by default, which breaks
+    once a request is served by the event loop and several worker threads. The
+    state is looked up in the current context instead, falling back to a
+    thread-local for code running outside of a request (scripts, jobs).
+    """
+
+    @staticmethod
+    def _current() -> dict:
+        state = _connection_state.get()
+        if state is None:
+            state = getattr(_thread_state, "state", None)
+            if state is None:
+                state = _thread_state.state = _new_state()
+        return state
+
+    def __setattr__(self, name, value):
+        self._current()[name] = value
+
+    def __getattr__(self, name):
+        try:
+            return self._current()[name]
+        except KeyError as exc:
+            raise AttributeError(name) from exc
+
+
+def begin_connection_scope():
+    """
+    Start a fresh connection scope for the current context.
+
+    Returns:
+        Token: The token needed to restore the previous scope.
+    """
+    return _connection_state.set(_new_state())
+
+
+def end_connection_scope(token) -> None:
+    """
+    Return the scope's connection to the pool and restore the previous scope.
+
+    Args:
+        token (Token): The token returned by `begin_connection_scope`.
+    """
+    try:
+        if not database.is_closed():
+            database.close()
+    finally:
+        _connection_state.reset(token)
+
+
+# Callables notified with (sql, duration in seconds) after every query.
+_query_listeners = []
+
+
+def add_query_listener(listener) -> None:
+    """
+    Register a callable notified after every query executed by the database.
+
+    Args:
+        listener (Callable[[str, float], None]): Called with the SQL and its duration.
+    """
+    _query_listeners.append(listener)
+
+
+def remove_query_listener(listener) -> None:
+    """
+    Unregister a callable added with `add_query_listener`.
+
+    Args:
+        listener (Callable[[str, float], None]): The listener to remove.
+    """
+    _query_listeners.remove(listener)
+
+
+def _notify_query(sql: str, duration: float) -> None:
+    for listener in _query_listeners:
+        listener(sql, duration)
+
+
+class InstrumentedPoolMixin:
+    """
+    Mixin for pooled databases that records how long callers wait for a
+    connection and reports every query to the query listeners.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self._stats_lock = threading.Lock()
+        self._checkouts = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        super().__init__(*args, **kwargs)
+
+    def connect(self, reuse_if_open=False):
+        """Check a connection out of the pool, recording how long the caller waited."""
+        start = time.perf_counter()
+        try:
+            return super().connect(reuse_if_open)
+        finally:
+            waited = time.perf_counter() - start
+            with self._stats_lock:
+                self._checkouts += 1
+                self._wait_total += waited
+                self._wait_max = max(self._wait_max, waited)
+
+    def execute_sql(self, sql, params=None, commit=None):
+        """Run a query and report its SQL and duration to the query listeners."""
+        start = time.perf_counter()
+        try:
+            return super().execute_sql(sql, params, commit)
+        finally:
+            _notify_query(sql, time.perf_counter() - start)
+
+    def pool_stats(self) -> dict:
+        """
+        Get a snapshot of the connection pool.
+
+        Returns:
+            dict: Connections in use and idle, the pool limits and wait times.
+        """
+        with self._pool_lock:
+            in_use = len(self._in_use)
+            idle = len(self._connections)
+        with self._stats_lock:
+            checkouts = self._checkouts
+            wait_total = self._wait_total
+            wait_max = self._wait_max
+        return {
+            "max_connections": self._max_connections,
+            "in_use": in_use,
+            "idle": idle,
+            "checkouts": checkouts,
+            "wait_seconds_total": wait_total,
+            "wait_seconds_avg": wait_total / checkouts if checkouts else 0.0,
+            "wait_seconds_max": wait_max,
+        }
+
+
+class InstrumentedPooledMySQLDatabase(InstrumentedPoolMixin, PooledMySQLDatabase):
+    """Pooled MySQL database with checkout statistics."""
+
+
+class InstrumentedPooledSqliteDatabase(InstrumentedPoolMixin, PooledSqliteDatabase):
+    """Pooled SQLite database with checkout statistics, used for local runs and benchmarks."""
+
+
+def _create_database():
+    """Create the pooled database selected by the DATABASE_ENGINE environment variable."""
+    pool_options = {
+        "max_connections": int(os.getenv("MYSQL_POOL_MAX_CONNECTIONS", "20")),
+        "stale_timeout": int(os.getenv("MYSQL_POOL_STALE_TIMEOUT", "300")),
+        "timeout": int(os.getenv("MYSQL_POOL_WAIT_TIMEOUT", "10")),
+    }
+    if os.getenv("DATABASE_ENGINE", "mysql") == "sqlite":
+        return InstrumentedPooledSqliteDatabase(
+            os.getenv("SQLITE_PATH", "recipe_master.db"),
+            pragmas={"journal_mode": "wal", "synchronous": "normal"},
+            check_same_thread=False,
+            **pool_options,
+        )
+    return InstrumentedPooledMySQLDatabase(
+        os.getenv("MYSQL_DATABASE"),
+        user=os.getenv("MYSQL_USER"),
+        passwd=os.getenv("MYSQL_PASSWORD"),
+        host=os.getenv("MYSQL_HOST"),
+        port=int(os.getenv("MYSQL_PORT")),
+        # Report matched rather than changed rows, so an UPDATE that leaves a row
+        # as it was is not mistaken for a missing row.
+        client_flag=mysql_driver.constants.CLIENT.FOUND_ROWS,
+        **pool_options,
+    )
+
+
+# Set up the pooled database connection
+database = _create_database()
+database._state = ContextConnectionState()  # pylint: disable=protected-access
+
+
+def lock_for_update(query):
+    """
+    Lock the rows selected by a query until the end of the transaction.
+
+    MySQL locks them with SELECT ... FOR UPDATE; SQLite has no row locks, so
+    the query is returned unchanged and `write_transaction` serializes writers.
+
+    Args:
+        query (Select): The query selecting the rows.
+
+    Returns:
+        Select: The query to run.
+    """
+    return query.for_update() if isinstance(database, MySQLDatabase) else query
+
+
+def write_transaction():
+    """
+    Open a transaction that will write rows it has read.
+
+    On SQLite the write lock is taken when the transaction begins, so two
+    transactions cannot read the same rows before either writes them.
+
+    Returns:
+        ContextManager: The transaction.
+    """
+    if isinstance(database, PooledSqliteDatabase):
+        return database.atomic(lock_type="IMMEDIATE")
+    return database.atomic()
+
+
+def iterate_unbuffered(query):
+    """
+    Yield the rows of a query as dicts without buffering the whole result set.
+
+    On MySQL the query runs on a server-side cursor, so rows are fetched from
+    the server as they are consumed; other backends use Peewee's `.iterator()`.
+    The connection must not run other queries until the iteration finishes.
+
+    Args:
+        query (Select): The Peewee query to run.
+
+    Yields:
+        dict: One row, keyed by column name.
+    """
+    if not isinstance(database, MySQLDatabase):
+        yield from query.dicts().iterator()
+        return
+
+    sql, params = query.sql()
+    cursor = database.connection().cursor(mysql_driver.cursors.SSCursor)
+    try:
+        start = time.perf_counter()
+        cursor.execute(sql, params)
+        _notify_query(sql, time.perf_counter() - start)
+        columns = [column[0] for column in cursor.description]
+        for row in cursor:
+            yield dict(zip(columns, row))
+    finally:
+        cursor.close()
 
 
 class UserModel(Model):
@@ -48,6 +301,10 @@ class UserModel(Model):
     class Meta:
         database = database
         table_name = "User"
+        indexes = (
+            (("username",), True),
+            (("email",), True),
+        )
 
 
 class GroupModel(Model):
@@ -107,6 +364,11 @@ class RecipeModel(Model):
     class Meta:
         database = database
         table_name = "Recipe"
+        indexes = (
+            (("difficulty", "cooking_time"), False),
+            (("cooking_time",), False),
+            (("total_calories",), False),
+        )
 
 
 class RecipeCategoryModel(Model):
@@ -129,6 +391,9 @@ class RecipeCategoryBridgeModel(Model):
         database = database
         table_name = "RecipeCategoryBridge"
         primary_key = CompositeKey('recipe', 'category')
+        indexes = (
+            (("category", "recipe"), False),
+        )
 
 
 class IngredientModel(Model):
@@ -302,6 +567,9 @@ class PantryItemModel(Model):
         database = database
         table_name = "PantryItem"
         primary_key = CompositeKey('pantry', 'ingredient')
+        indexes = (
+            (("expiry_date", "pantry", "ingredient"), False),
+        )
 
 
 class NotificationModel(Model):
@@ -310,6 +578,8 @@ class NotificationModel(Model):
     group = ForeignKeyField(GroupModel, backref='notifications', null=True)
     message = TextField()
     date = DateField()
+    # Identifies what the notification is about, so it is only sent once
+    dedupe_key = CharField(max_length=255, null=True, unique=True)
     creation_date = DateField()
     update_date = DateField()
 
@@ -327,4 +597,45 @@ class TimeUnitModel(Model):
     class Meta:
         database = database
         table_name = "TimeUnit"
-        
\ No newline at end of file
+
+
+class ApiKeyModel(Model):
+    """ApiKey model representing a client key and its rate limit."""
+    id = AutoField(primary_key=True)
+    name = CharField(max_length=255)
+    key_hash = CharField(max_length=64, unique=True)
+    rate_limit = FloatField()
+    burst = IntegerField()
+    is_active = BooleanField(default=True)
+    creation_date = DateField()
+    update_date = DateField()
+
+    class Meta:
+        database = database
+        table_name = "ApiKey"
+
+
+class UnitConversionModel(Model):
+    """UnitConversion model storing the factor converting one unit to another."""
+    id = AutoField(primary_key=True)
+    from_unit = ForeignKeyField(UnitModel, backref='conversions_from')
+    to_unit = ForeignKeyField(UnitModel, backref='conversions_to')
+    factor = FloatField()
+    ingredient = ForeignKeyField(IngredientModel, backref='unit_conversions', null=True)
+    creation_date = DateField()
+    update_date = DateField()
+
+    class Meta:
+        database = database
+        table_name = "UnitConversion"
+
+
+# NULL ingredients (general factors) are distinct in a plain unique index, so
+# the index covers COALESCE(ingredient_id, 0) to allow one general factor per pair.
+UnitConversionModel.add_index(UnitConversionModel.index(
+    UnitConversionModel.from_unit,
+    UnitConversionModel.to_unit,
+    NodeList((fn.COALESCE(UnitConversionModel.ingredient, SQL("0")),), parens=True),
+    unique=True,
+    name="uq_unit_conversion_pair_ingredient",
+))
@@ -2,23 +2,185 @@
 api_key_auth.py
 
 This module provides functionality to handle API key authentication using FastAPI.
+
+Client keys are stored hashed in the ApiKey table and loaded into an in-memory
+index that is refreshed periodically, so authenticating a request never touches
+the database. Each key has a token bucket that throttles it before any database
+work is done for the request.
 """
 
+import hashlib
+import hmac
+import math
 import os
+import time
 from dotenv import load_dotenv
 from fastapi import HTTPException, Security, status
 from fastapi.security.api_key import APIKeyHeader
+from config.database import ApiKeyModel, database
+from helpers.db_executor import run_in_db_executor
+from helpers.periodic import run_periodically
 
 # Load environment variables from a .env file
 load_dotenv()
 
 API_KEY = os.getenv("API_KEY")
 API_KEY_NAME = "x-api-key"
+API_KEY_RATE_LIMIT = float(os.getenv("API_KEY_RATE_LIMIT", "50"))
+API_KEY_BURST = int(os.getenv("API_KEY_BURST", "100"))
+API_KEY_REFRESH_INTERVAL = float(os.getenv("API_KEY_REFRESH_INTERVAL", "60"))
 
 # Create an API key header instance for security
 api_key_header = APIKeyHeader(name=API_KEY_NAME, auto_error=False)
 
 
+def hash_api_key(api_key: str) -> str:
+    """
+    Hash an API key the way it is stored in the ApiKey table.
+
+    Args:
+        api_key (str): The plain API key.
+
+    Returns:
+        str: The hex SHA-256 digest of the key.
+    """
+    return hashlib.sha256(api_key.encode()).hexdigest()
+
+
+class TokenBucket:
+    """Token bucket refilled at `rate` tokens per second up to `capacity`."""
+
+    __slots__ = ("rate", "capacity", "tokens", "updated")
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+
+    def take(self) -> float:
+        """
+        Take one token from the bucket.
+
+        Returns:
+            float: 0 if a token was taken, otherwise the seconds until one is available.
+        """
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        if self.rate <= 0:
+            return math.inf
+        return (1 - self.tokens) / self.rate
+
+
+class ApiKeyEntry:
+    """A registered API key with its rate limit and usage counters."""
+
+    __slots__ = ("name", "key_hash", "bucket", "allowed", "throttled")
+
+    def __init__(self, name: str, key_hash: str, rate_limit: float, burst: int):
+        self.name = name
+        self.key_hash = key_hash
+        self.bucket = TokenBucket(rate_limit, burst)
+        self.allowed = 0
+        self.throttled = 0
+
+
+class ApiKeyRegistry:
+    """
+    In-memory index of the active API keys, keyed by their hash.
+
+    The index is replaced as a whole on refresh; buckets and counters of keys
+    whose limits did not change are carried over.
+    """
+
+    def __init__(self):
+        self._keys: dict[str, ApiKeyEntry] = {}
+        if API_KEY:
+            self._add_bootstrap_key(self._keys)
+
+    @staticmethod
+    def _add_bootstrap_key(keys: dict) -> None:
+        """Register the key from the API_KEY environment variable."""
+        key_hash = hash_api_key(API_KEY)
+        keys[key_hash] = ApiKeyEntry("default", key_hash, API_KEY_RATE_LIMIT, API_KEY_BURST)
+
+    def load(self, rows) -> None:
+        """
+        Replace the index with the given keys.
+
+        Args:
+            rows (Iterable[dict]): Rows with `name`, `key_hash`, `rate_limit` and `burst`.
+        """
+        keys = {}
+        if API_KEY:
+            self._add_bootstrap_key(keys)
+        for row in rows:
+            keys[row["key_hash"]] = ApiKeyEntry(row["name"], row["key_hash"],
+                                                float(row["rate_limit"]), int(row["burst"]))
+        for key_hash, entry in keys.items():
+            previous = self._keys.get(key_hash)
+            if previous is not None and (previous.bucket.rate, previous.bucket.capacity) == (
+                    entry.bucket.rate, entry.bucket.capacity):
+                keys[key_hash] = previous
+        self._keys = keys
+
+    def refresh(self) -> None:
+        """Reload the active keys from the database."""
+        with database.connection_context():
+            rows = list(ApiKeyModel
+                        .select(ApiKeyModel.name, ApiKeyModel.key_hash, ApiKeyModel.rate_limit,
+                                ApiKeyModel.burst)
+                        .where(ApiKeyModel.is_active == True)  # noqa: E712  pylint: disable=singleton-comparison
+                        .dicts())
+        self.load(rows)
+
+    def authenticate(self, api_key: str):
+        """
+        Find the entry of a presented API key.
+
+        Args:
+            api_key (str): The key from the request header.
+
+        Returns:
+            ApiKeyEntry: The matching entry, or None if the key is unknown.
+        """
+        key_hash = hash_api_key(api_key)
+        entry = self._keys.get(key_hash)
+        if entry is not None and hmac.compare_digest(entry.key_hash, key_hash):
+            return entry
+        return None
+
+    def usage(self) -> dict:
+        """
+        Get the usage counters of every key.
+
+        Returns:
+            dict: Allowed and throttled requests and limits, keyed by key name.
+        """
+        return {
+            entry.name: {
+                "allowed": entry.allowed,
+                "throttled": entry.throttled,
+                "rate_limit": entry.bucket.rate,
+                "burst": entry.bucket.capacity,
+            }
+            for entry in self._keys.values()
+        }
+
+
+api_key_registry = ApiKeyRegistry()
+
+
+async def refresh_api_keys_periodically() -> None:
+    """Reload the API key index every API_KEY_REFRESH_INTERVAL seconds."""
+    await run_periodically(lambda: run_in_db_executor(api_key_registry.refresh),
+                           API_KEY_REFRESH_INTERVAL, "API key refresh")
+
+
 async def get_api_key(api_key: str = Security(api_key_header)):
     """
     Retrieve and validate the API key from the request header.
@@ -27,14 +189,25 @@ async def get_api_key(api_key: str = Security(api_key_header)):
         api_key (str): The API key provided in the request header.
 
     Returns:
-        str: The valid API key if it matches the expected value.
+        str: The valid API key if it is registered and active.
 
     Raises:
-        HTTPException: If the API key is invalid or missing.
+        HTTPException: If the API key is invalid or missing (403).
+        HTTPException: If the key exceeded its rate limit (429).
     """
-    if api_key == API_KEY:
-        return api_key
-    raise HTTPException(
-        status_code=status.HTTP_403_FORBIDDEN,
-        detail="Unauthorized access: Invalid or missing API key.",
-    )
+    entry = api_key_registry.authenticate(api_key) if api_key else None
+    if entry is None:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Unauthorized access: Invalid or missing API key.",
+        )
+    retry_after = entry.bucket.take()
+    if retry_after:
+        entry.throttled += 1
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Rate limit exceeded for this API key.",
+            headers={"Retry-After": str(max(1, math.ceil(min(retry_after, 3600))))},
+        )
+    entry.allowed += 1
+    return api_key
@@ -0,0 +1,178 @@
+"""
+autocomplete_index.py
+
+This module provides an in-process prefix index of names for type-ahead
+suggestions. Every word of a name is a key of one sorted array, so a prefix
+lookup is a binary search followed by a scan of the matching range. Matches are
+ranked by a popularity weight, and the best matches of the prefixes asked for
+are memoized until a name or weight under them changes.
+"""
+
+import heapq
+import threading
+import unicodedata
+from bisect import bisect_left, insort
+from collections import OrderedDict
+from typing import Iterable
+
+
+def normalize(text: str) -> str:
+    """
+    Fold a name for matching: lower case, without accents and with single spaces.
+
+    Args:
+        text (str): The text to fold.
+
+    Returns:
+        str: The folded text.
+    """
+    folded = text.casefold()
+    if not folded.isascii():
+        decomposed = unicodedata.normalize("NFKD", folded)
+        folded = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return " ".join(folded.split())
+
+
+def _word_keys(normalized: str) -> list[str]:
+    """Return the name from the start of each of its words."""
+    keys = [normalized]
+    keys.extend(normalized[index + 1:] for index, char in enumerate(normalized) if char == " ")
+    return keys
+
+
+class AutocompleteIndex:
+    """
+    Names matched by the prefix of any of their words, most popular first.
+
+    Among equally popular matches, shorter names come first, then names in
+    alphabetical order.
+    """
+
+    def __init__(self, max_results: int, memo_size: int):
+        """
+        Create an empty index.
+
+        Args:
+            max_results (int): The most suggestions a lookup can ask for.
+            memo_size (int): The number of prefixes whose results are memoized.
+        """
+        self.max_results = max_results
+        self.memo_size = memo_size
+        self._lock = threading.Lock()
+        self._keys: list[tuple[str, int]] = []
+        self._names: dict[int, tuple[str, str]] = {}
+        self._weights: dict[int, int] = {}
+        self._memo: OrderedDict[str, list[int]] = OrderedDict()
+
+    def __len__(self):
+        return len(self._names)
+
+    def load(self, names: Iterable[tuple[int, str]], weights: dict[int, int]) -> None:
+        """
+        Replace the whole content of the index.
+
+        Args:
+            names (Iterable[tuple[int, str]]): (ID, name) pairs.
+            weights (dict[int, int]): The popularity of the IDs; missing IDs weigh 0.
+        """
+        entries = {doc_id: (name, normalize(name)) for doc_id, name in names}
+        keys = sorted((key, doc_id) for doc_id, (_, normalized) in entries.items()
+                      for key in _word_keys(normalized))
+        with self._lock:
+            self._names = entries
+            self._keys = keys
+            self._weights = {doc_id: weight for doc_id, weight in weights.items()
+                             if doc_id in entries}
+            self._memo.clear()
+
+    def _forget(self, normalized: str) -> None:
+        """Drop the memoized results of every prefix of the words of a name."""
+        for key in _word_keys(normalized):
+            for end in range(1, len(key) + 1):
+                self._memo.pop(key[:end], None)
+
+    def _remove(self, doc_id: int) -> None:
+        entry = self._names.pop(doc_id, None)
+        if entry is None:
+            return
+        for key in _word_keys(entry[1]):
+            index = bisect_left(self._keys, (key, doc_id))
+            if index < len(self._keys) and self._keys[index] == (key, doc_id):
+                del self._keys[index]
+        self._forget(entry[1])
+
+    def upsert(self, doc_id: int, name: str) -> None:
+        """
+        Add a name, replacing the previous name of the ID.
+
+        Args:
+            doc_id (int): The ID of the name.
+            name (str): The name.
+        """
+        normalized = normalize(name)
+        with self._lock:
+            self._remove(doc_id)
+            self._names[doc_id] = (name, normalized)
+            for key in _word_keys(normalized):
+                insort(self._keys, (key, doc_id))
+            self._forget(normalized)
+
+    def remove(self, doc_id: int) -> None:
+        """
+        Remove a name from the index.
+
+        Args:
+            doc_id (int): The ID of the name.
+        """
+        with self._lock:
+            self._remove(doc_id)
+            self._weights.pop(doc_id, None)
+
+    def add_weight(self, doc_id: int, delta: int) -> None:
+        """
+        Change the popularity of a name.
+
+        Args:
+            doc_id (int): The ID of the name.
+            delta (int): The amount to add to its weight.
+        """
+        with self._lock:
+            entry = self._names.get(doc_id)
+            if entry is None:
+                return
+            self._weights[doc_id] = max(0, self._weights.get(doc_id, 0) + delta)
+            self._forget(entry[1])
+
+    def suggest(self, prefix: str, limit: int) -> list[tuple[int, str, int]]:
+        """
+        Get the most popular names with a word starting with a prefix.
+
+        Args:
+            prefix (str): The text typed so far.
+            limit (int): The maximum number of suggestions, at most `max_results`.
+
+        Returns:
+            list[tuple[int, str, int]]: (ID, name, weight) triples, best first.
+        """
+        prefix = normalize(prefix)
+        if not prefix:
+            return []
+        with self._lock:
+            ranked = self._memo.get(prefix)
+            if ranked is None:
+                matches = set()
+                index = bisect_left(self._keys, (prefix,))
+                while index < len(self._keys) and self._keys[index][0].startswith(prefix):
+                    matches.add(self._keys[index][1])
+                    index += 1
+                ranked = heapq.nsmallest(
+                    self.max_results, matches,
+                    key=lambda doc_id: (-self._weights.get(doc_id, 0), len(self._names[doc_id][1]),
+                                        self._names[doc_id][1], doc_id))
+                self._memo[prefix] = ranked
+                while len(self._memo) > self.memo_size:
+                    self._memo.popitem(last=False)
+            else:
+                self._memo.move_to_end(prefix)
+            return [(doc_id, self._names[doc_id][0], self._weights.get(doc_id, 0))
+                    for doc_id in ranked[:limit]]
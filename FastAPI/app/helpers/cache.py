@@ -0,0 +1,299 @@
+"""
+cache.py
+
+This module provides the key/value caches used in front of the database. Each
+cache is bounded and expires its entries; the backend is chosen with the
+CACHE_BACKEND environment variable so several workers can share one Redis
+instance, while the in-process backend serves single workers and local setups.
+
+Read-through callers take `version(key)` before reading the database and pass
+it to `set`; every `delete` bumps the version, so a reader that loaded a row
+before a write committed cannot put the stale row back after the write
+invalidated it.
+"""
+
+import abc
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+from dotenv import load_dotenv
+
+# Load environment variables from a .env file
+load_dotenv()
+
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "local")
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+
+# Seconds a shared key version outlives its last invalidation
+VERSION_TTL = 86400
+
+_caches = {}
+
+
+class CacheBackend(abc.ABC):
+    """
+    Interface shared by the cache backends.
+
+    Values must be JSON-serializable so every backend stores them alike.
+    """
+
+    def __init__(self, namespace: str, ttl: float):
+        self.namespace = namespace
+        self.ttl = ttl
+        self._counter_lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0,
+                          "invalidations": 0}
+
+    def _count(self, name: str) -> None:
+        with self._counter_lock:
+            self._counters[name] += 1
+
+    @abc.abstractmethod
+    def get(self, key):
+        """
+        Get a cached value.
+
+        Args:
+            key (Hashable): The key of the value.
+
+        Returns:
+            Any: The cached value, or None on a miss.
+        """
+
+    @abc.abstractmethod
+    def version(self, key) -> int:
+        """
+        Get the version of a key, to take before reading the value from the database.
+
+        Args:
+            key (Hashable): The key of the value.
+
+        Returns:
+            int: A version to pass to `set`.
+        """
+
+    @abc.abstractmethod
+    def set(self, key, value, version: Optional[int] = None) -> None:
+        """
+        Store a value for the cache's TTL.
+
+        Args:
+            key (Hashable): The key of the value.
+            value (Any): The JSON-serializable value to cache.
+            version (Optional[int]): The version taken before the value was read;
+                the value is dropped if the key was invalidated since.
+        """
+
+    @abc.abstractmethod
+    def delete(self, key) -> None:
+        """
+        Invalidate a cached value and bump the version of its key.
+
+        Args:
+            key (Hashable): The key of the value.
+        """
+
+    @abc.abstractmethod
+    def clear(self) -> None:
+        """Invalidate every value of the cache."""
+
+    def stats(self) -> dict:
+        """
+        Get the cache counters.
+
+        Returns:
+            dict: The backend, hits, misses, evictions, expirations and invalidations.
+        """
+        with self._counter_lock:
+            return {"backend": type(self).__name__, **self._counters}
+
+
+class LocalCache(CacheBackend):
+    """
+    In-process LRU cache whose entries expire after a TTL.
+
+    Versions come from one counter bumped by every invalidation. The last
+    invalidation of at most `max_size` keys is remembered; keys forgotten
+    since count as invalidated at the newest forgotten version.
+    """
+
+    def __init__(self, namespace: str, ttl: float, max_size: int):
+        super().__init__(namespace, ttl)
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._generation = 0
+        self._invalidated = OrderedDict()
+        self._forgotten = 0
+
+    def _invalidate(self, key) -> None:
+        """Record that a key was invalidated at a new version; the lock must be held."""
+        self._generation += 1
+        self._invalidated[key] = self._generation
+        self._invalidated.move_to_end(key)
+        while len(self._invalidated) > self.max_size:
+            _, generation = self._invalidated.popitem(last=False)
+            self._forgotten = max(self._forgotten, generation)
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires, value = entry
+                if expires > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self._counters["hits"] += 1
+                    return value
+                del self._entries[key]
+                self._counters["expirations"] += 1
+            self._counters["misses"] += 1
+            return None
+
+    def version(self, key) -> int:
+        with self._lock:
+            return self._generation
+
+    def set(self, key, value, version: Optional[int] = None) -> None:
+        with self._lock:
+            if version is not None and self._invalidated.get(key, self._forgotten) > version:
+                return
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self._counters["evictions"] += 1
+
+    def delete(self, key) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+            self._invalidate(key)
+            self._counters["invalidations"] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
+            self._invalidated.clear()
+            self._forgotten = self._generation
+            self._counters["invalidations"] += 1
+
+    def stats(self) -> dict:
+        stats = super().stats()
+        with self._lock:
+            stats["size"] = len(self._entries)
+        stats["max_size"] = self.max_size
+        return stats
+
+
+class RedisCache(CacheBackend):
+    """
+    Cache shared by every worker through Redis.
+
+    Redis expires keys after the TTL and evicts them under its own memory
+    policy, so the size bound is configured on the server. Each key has a
+    version counter, compared and set in one script so workers cannot
+    interleave.
+
+    Clearing the cache bumps a namespace generation instead of scanning the
+    keyspace: values are stored with the generation they were written in, and
+    a value from an older generation reads as a miss until it expires. The
+    version of a key is its own counter plus the generation; both only grow,
+    so the sum changes whenever either does.
+    """
+
+    # Stores the value with the current generation, only if the version of
+    # its key is still the one given (an empty version skips the check)
+    _SET_IF_VERSION = """
+        local generation = tonumber(redis.call('GET', KEYS[3]) or '0')
+        local version = tonumber(redis.call('GET', KEYS[2]) or '0')
+        if ARGV[3] ~= '' and generation + version ~= tonumber(ARGV[3]) then
+            return 0
+        end
+        redis.call('SET', KEYS[1], generation .. ':' .. ARGV[1], 'EX', ARGV[2])
+        return 1
+    """
+
+    def __init__(self, namespace: str, ttl: float, url: str = REDIS_URL):
+        super().__init__(namespace, ttl)
+        import redis  # pylint: disable=import-outside-toplevel
+
+        self._client = redis.Redis.from_url(url)
+        self._set_if_version = self._client.register_script(self._SET_IF_VERSION)
+
+    def _key(self, key) -> str:
+        return f"{self.namespace}:{key}"
+
+    def _version_key(self, key) -> str:
+        return f"{self.namespace}:version:{key}"
+
+    def _generation_key(self) -> str:
+        return f"{self.namespace}:generation"
+
+    def get(self, key):
+        raw, generation = self._client.mget(self._key(key), self._generation_key())
+        if raw is not None:
+            written_in, _, value = raw.partition(b":")
+            if written_in == (generation or b"0"):
+                self._count("hits")
+                return json.loads(value)
+        self._count("misses")
+        return None
+
+    def version(self, key) -> int:
+        version, generation = self._client.mget(self._version_key(key), self._generation_key())
+        return int(version or 0) + int(generation or 0)
+
+    def set(self, key, value, version: Optional[int] = None) -> None:
+        raw, ttl = json.dumps(value, default=str), max(1, int(self.ttl))
+        self._set_if_version(keys=[self._key(key), self._version_key(key), self._generation_key()],
+                             args=[raw, ttl, "" if version is None else version])
+
+    def delete(self, key) -> None:
+        pipeline = self._client.pipeline()
+        pipeline.incr(self._version_key(key))
+        pipeline.expire(self._version_key(key), VERSION_TTL)
+        pipeline.delete(self._key(key))
+        pipeline.execute()
+        self._count("invalidations")
+
+    def clear(self) -> None:
+        self._client.incr(self._generation_key())
+        self._count("invalidations")
+
+
+def create_cache(namespace: str, ttl: float, max_size: int) -> CacheBackend:
+    """
+    Create a cache on the configured backend and register it for monitoring.
+
+    Args:
+        namespace (str): The name of the cache, also used to prefix shared keys.
+        ttl (float): Seconds an entry stays valid.
+        max_size (int): The maximum number of entries of an in-process cache.
+
+    Returns:
+        CacheBackend: The new cache.
+
+    Raises:
+        ValueError: If CACHE_BACKEND names an unknown backend.
+    """
+    if CACHE_BACKEND == "local":
+        cache = LocalCache(namespace, ttl, max_size)
+    elif CACHE_BACKEND == "redis":
+        cache = RedisCache(namespace, ttl)
+    else:
+        raise ValueError(f"Unknown cache backend: {CACHE_BACKEND}")
+    _caches[namespace] = cache
+    return cache
+
+
+def cache_stats() -> dict:
+    """
+    Get the counters of every registered cache.
+
+    Returns:
+        dict: The statistics of each cache, keyed by namespace.
+    """
+    return {namespace: cache.stats() for namespace, cache in _caches.items()}
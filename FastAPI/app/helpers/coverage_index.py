@@ -0,0 +1,102 @@
+"""
+coverage_index.py
+
+This module provides an in-process sparse recipe x ingredient matrix used to
+rank recipes by how many of their ingredients a set of available ingredients
+covers. The matrix is kept both by row (the ingredients of each recipe) and by
+column (the recipes using each ingredient), so ranking only touches the
+recipes sharing at least one ingredient with the available set.
+"""
+
+import heapq
+import threading
+from collections import Counter
+from typing import Callable, Iterable, Optional
+
+
+class CoverageIndex:
+    """
+    Sparse recipe x ingredient matrix with per-recipe filterable attributes.
+
+    Each recipe carries a dict of attributes (e.g. `is_public`, `group_id`)
+    that rankings can filter on.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._recipes: dict[int, set[int]] = {}
+        self._postings: dict[int, set[int]] = {}
+        self._attributes: dict[int, dict] = {}
+
+    def __len__(self):
+        return len(self._recipes)
+
+    def _remove(self, recipe_id: int) -> None:
+        for ingredient_id in self._recipes.pop(recipe_id, ()):
+            postings = self._postings[ingredient_id]
+            postings.discard(recipe_id)
+            if not postings:
+                del self._postings[ingredient_id]
+        self._attributes.pop(recipe_id, None)
+
+    def set_recipe(self, recipe_id: int, ingredient_ids: Iterable[int], attributes: dict) -> None:
+        """
+        Add a recipe, replacing its previous ingredients and attributes.
+
+        Args:
+            recipe_id (int): The ID of the recipe.
+            ingredient_ids (Iterable[int]): The IDs of its ingredients.
+            attributes (dict): The filterable attributes of the recipe.
+        """
+        ingredient_ids = set(ingredient_ids)
+        with self._lock:
+            self._remove(recipe_id)
+            self._recipes[recipe_id] = ingredient_ids
+            self._attributes[recipe_id] = attributes
+            for ingredient_id in ingredient_ids:
+                self._postings.setdefault(ingredient_id, set()).add(recipe_id)
+
+    def remove_recipe(self, recipe_id: int) -> None:
+        """
+        Remove a recipe from the index.
+
+        Args:
+            recipe_id (int): The ID of the recipe.
+        """
+        with self._lock:
+            self._remove(recipe_id)
+
+    def rank(self, available: Iterable[int], accept: Optional[Callable[[dict], bool]] = None,
+             max_missing: Optional[int] = None,
+             limit: int = 20) -> list[tuple[int, int, int, list[int]]]:
+        """
+        Rank recipes by the share of their ingredients that are available.
+
+        Args:
+            available (Iterable[int]): The IDs of the available ingredients.
+            accept (Optional[Callable[[dict], bool]]): Only rank recipes whose attributes it
+                accepts.
+            max_missing (Optional[int]): Only rank recipes missing at most this many ingredients.
+            limit (int): The maximum number of recipes returned.
+
+        Returns:
+            list[tuple[int, int, int, list[int]]]: (recipe ID, matched count,
+            ingredient count, sorted missing ingredient IDs) tuples, best
+            coverage first, then fewest missing ingredients, then by ID.
+        """
+        available = set(available)
+        with self._lock:
+            matched: Counter = Counter()
+            for ingredient_id in available:
+                matched.update(self._postings.get(ingredient_id, ()))
+            candidates = []
+            for recipe_id, count in matched.items():
+                total = len(self._recipes[recipe_id])
+                if max_missing is not None and total - count > max_missing:
+                    continue
+                if accept is not None and not accept(self._attributes[recipe_id]):
+                    continue
+                candidates.append((-count / total, total - count, recipe_id, count, total))
+            best = heapq.nsmallest(limit, candidates)
+            return [(recipe_id, count, total, sorted(self._recipes[recipe_id] - available))
+                    for _, _, recipe_id, count, total in best]
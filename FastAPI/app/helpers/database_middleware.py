@@ -0,0 +1,32 @@
+"""
+database_middleware.py
+
+This module provides an ASGI middleware that scopes a pooled database connection
+to a single request.
+"""
+
+from config.database import begin_connection_scope, end_connection_scope
+
+
+class DatabaseConnectionMiddleware:
+    """
+    ASGI middleware giving every request its own database connection scope.
+
+    A connection is checked out of the pool lazily by the first query of the
+    request and returned once the response has been completely sent, so
+    streaming responses keep their connection until the last chunk.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] not in ("http", "websocket"):
+            await self.app(scope, receive, send)
+            return
+
+        token = begin_connection_scope()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            end_connection_scope(token)
@@ -0,0 +1,82 @@
+"""
+db_executor.py
+
+This module provides a bounded thread pool used to run synchronous Peewee work
+outside of the event loop.
+"""
+
+import asyncio
+import contextvars
+import functools
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dotenv import load_dotenv
+
+# Load environment variables from a .env file
+load_dotenv()
+
+# One worker per pooled connection: more threads would only queue on the pool.
+DB_THREAD_POOL_SIZE = int(
+    os.getenv("DB_THREAD_POOL_SIZE", os.getenv("MYSQL_POOL_MAX_CONNECTIONS", "20"))
+)
+
+_executor = ThreadPoolExecutor(max_workers=DB_THREAD_POOL_SIZE, thread_name_prefix="db")
+
+
+async def run_in_db_executor(func, *args, **kwargs):
+    """
+    Run a blocking function on the database thread pool.
+
+    The caller's context is copied into the worker thread so the function uses
+    the connection scope of the current request.
+
+    Args:
+        func (Callable): The blocking function to run.
+        *args: Positional arguments for the function.
+        **kwargs: Keyword arguments for the function.
+
+    Returns:
+        Any: The value returned by the function.
+    """
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    call = functools.partial(context.run, func, *args, **kwargs)
+    return await loop.run_in_executor(_executor, call)
+
+
+async def iterate_in_db_executor(iterator):
+    """
+    Consume a blocking iterator on the database thread pool.
+
+    When the consumer stops early, e.g. because the client disconnected, the
+    iterator is closed on the pool once its pending step has finished, so a
+    generator holding a cursor releases it before the connection is reused.
+
+    Args:
+        iterator (Iterator): The blocking iterator, e.g. rows of a query.
+
+    Yields:
+        Any: The items produced by the iterator.
+    """
+    sentinel = object()
+    step = None
+    try:
+        while True:
+            # Shielded so a cancelled consumer does not leave the step running unawaited
+            step = asyncio.ensure_future(run_in_db_executor(next, iterator, sentinel))
+            item = await asyncio.shield(step)
+            step = None
+            if item is sentinel:
+                return
+            yield item
+    finally:
+        if step is not None:
+            await asyncio.gather(step, return_exceptions=True)
+        close = getattr(iterator, "close", None)
+        if close is not None:
+            await run_in_db_executor(close)
+
+
+def shutdown_db_executor() -> None:
+    """Wait for running database work to finish and stop the thread pool."""
+    _executor.shutdown(wait=True)
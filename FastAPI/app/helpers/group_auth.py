@@ -0,0 +1,66 @@
+"""
+group_auth.py
+
+This module provides the FastAPI dependencies authorizing group-scoped requests.
+The caller is identified by the X-User-Id header, sent by the API client that
+authenticated with its API key, and their role in the group of the path is read
+from the role cache, so a permission check only queries the database on a miss.
+
+X-User-Id is not authenticated: it is an assertion by the API client, which is
+trusted to have authenticated the user itself. Any holder of a valid API key
+can act as any user, so keys must only be given to such trusted clients.
+"""
+
+from fastapi import Depends, Header, HTTPException, status
+from services.group_service import ROLE_LEVELS, GroupService, has_role
+from helpers.db_executor import run_in_db_executor
+
+
+async def get_current_user_id(
+        x_user_id: int = Header(..., description="The ID of the user making the request.")):
+    """
+    Get the ID of the user on whose behalf the API client calls.
+
+    The header is taken as asserted by the API client and is not verified.
+
+    Args:
+        x_user_id (int): The value of the X-User-Id header.
+
+    Returns:
+        int: The ID of the user.
+    """
+    return x_user_id
+
+
+def require_group_role(min_role: str = "viewer"):
+    """
+    Build a dependency allowing only members of the path's group with at least a role.
+
+    The route must have an `id_group` path parameter. The dependency returns
+    the caller's role, so routes can refine their checks.
+
+    Args:
+        min_role (str): The least privileged role allowed.
+
+    Returns:
+        Callable: The dependency.
+
+    Raises:
+        ValueError: If `min_role` is not a known role.
+    """
+    if min_role not in ROLE_LEVELS:
+        raise ValueError(f"Unknown role: {min_role}")
+
+    async def check_group_role(id_group: int, id_user: int = Depends(get_current_user_id)) -> str:
+        found, role = GroupService.get_cached_role(id_group, id_user)
+        if not found:
+            role = await run_in_db_executor(GroupService.get_member_role, id_group, id_user)
+        if role is None:
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN,
+                                detail="Not a member of this group")
+        if not has_role(role, min_role):
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN,
+                                detail=f"The {min_role} role is required in this group")
+        return role
+
+    return check_group_role
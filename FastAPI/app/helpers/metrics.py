@@ -0,0 +1,156 @@
+"""
+metrics.py
+
+This module collects the Prometheus metrics of the application: per-route
+request latency, status codes and in-flight requests, per-query timing and the
+number of queries each request runs, background job durations, plus the
+connection pool, cache, API key and notification stream statistics read at
+scrape time.
+"""
+
+import time
+from contextvars import ContextVar
+from prometheus_client import Counter, Gauge, Histogram, REGISTRY
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from config.database import add_query_listener, database
+from helpers.api_key_auth import api_key_registry
+from helpers.cache import cache_stats
+from helpers.notification_broker import notification_hub
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "Latency of HTTP requests.",
+    ["method", "route", "status"],
+)
+REQUESTS_IN_FLIGHT = Gauge(
+    "http_requests_in_flight",
+    "HTTP requests currently being served.",
+    ["method"],
+)
+QUERY_LATENCY = Histogram(
+    "db_query_duration_seconds",
+    "Latency of database queries.",
+    ["statement"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+QUERIES_PER_REQUEST = Histogram(
+    "db_queries_per_request",
+    "Database queries run while serving one HTTP request.",
+    ["route"],
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100),
+)
+QUERIES_OUTSIDE_REQUESTS = Counter(
+    "db_queries_outside_requests_total",
+    "Database queries run by background work.",
+)
+EXPIRY_SCAN_DURATION = Histogram(
+    "expiry_scan_duration_seconds",
+    "Duration of the pantry expiry scans.",
+    buckets=(0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0, 900.0),
+)
+EXPIRY_NOTIFICATIONS = Counter(
+    "expiry_notifications_created_total",
+    "Notifications created for expiring pantry items.",
+)
+
+# Mutable per-request query counter, shared with the database threads.
+_request_queries: ContextVar[dict | None] = ContextVar("request_queries", default=None)
+
+
+def _record_query(sql: str, duration: float) -> None:
+    """Record one query executed by the database."""
+    statement = sql.lstrip().split(" ", 1)[0].upper() or "UNKNOWN"
+    QUERY_LATENCY.labels(statement).observe(duration)
+    counter = _request_queries.get()
+    if counter is None:
+        QUERIES_OUTSIDE_REQUESTS.inc()
+    else:
+        counter["queries"] += 1
+
+
+add_query_listener(_record_query)
+
+
+def current_request_queries() -> int:
+    """
+    Get the number of queries run so far by the current request.
+
+    Returns:
+        int: The query count, or 0 outside of a request.
+    """
+    counter = _request_queries.get()
+    return counter["queries"] if counter is not None else 0
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording the latency, status and query count of every request."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        token = _request_queries.set({"queries": 0})
+        REQUESTS_IN_FLIGHT.labels(method).inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - start
+            REQUESTS_IN_FLIGHT.labels(method).dec()
+            # The router stores the matched route in the scope; using its path
+            # template keeps the label cardinality bounded.
+            route = scope.get("route")
+            route_path = getattr(route, "path", "unmatched")
+            REQUEST_LATENCY.labels(method, route_path, str(status_code)).observe(elapsed)
+            QUERIES_PER_REQUEST.labels(route_path).observe(_request_queries.get()["queries"])
+            _request_queries.reset(token)
+
+
+class RuntimeStatsCollector:
+    """Prometheus collector exposing the pool, cache, API key and notification stream statistics."""
+
+    def collect(self):
+        """Yield the current statistics as metric families."""
+        pool = database.pool_stats()
+        for name in ("max_connections", "in_use", "idle"):
+            yield GaugeMetricFamily(f"db_pool_{name}", f"Database pool connections: {name}.",
+                                    value=pool[name])
+        yield CounterMetricFamily("db_pool_checkouts", "Connections checked out of the pool.",
+                                  value=pool["checkouts"])
+        yield CounterMetricFamily("db_pool_wait_seconds",
+                                  "Time spent waiting for pooled connections.",
+                                  value=pool["wait_seconds_total"])
+
+        cache_events = CounterMetricFamily("cache_events", "Cache lookups and removals.",
+                                           labels=["cache", "event"])
+        for namespace, stats in cache_stats().items():
+            for event in ("hits", "misses", "evictions", "expirations", "invalidations"):
+                cache_events.add_metric([namespace, event], stats[event])
+        yield cache_events
+
+        api_key_requests = CounterMetricFamily("api_key_requests", "Requests per API key.",
+                                               labels=["key", "outcome"])
+        for name, usage in api_key_registry.usage().items():
+            api_key_requests.add_metric([name, "allowed"], usage["allowed"])
+            api_key_requests.add_metric([name, "throttled"], usage["throttled"])
+        yield api_key_requests
+
+        yield GaugeMetricFamily("notification_subscribers",
+                                "Open notification streams in this process.",
+                                value=notification_hub.subscriber_count())
+
+
+REGISTRY.register(RuntimeStatsCollector())
@@ -0,0 +1,199 @@
+"""
+notification_broker.py
+
+This module pushes new notifications to the clients listening for their group.
+A hub fans every notification out to the subscribers of this process; the
+broker carries notifications to the hub of every worker. The backend is chosen
+with the NOTIFICATION_BROKER environment variable: Redis publish/subscribe for
+several workers, or an in-process broker for single workers and local setups.
+"""
+
+import abc
+import asyncio
+import json
+import logging
+import os
+from typing import Optional
+from dotenv import load_dotenv
+
+# Load environment variables from a .env file
+load_dotenv()
+
+NOTIFICATION_BROKER = os.getenv("NOTIFICATION_BROKER", "local")
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+# Notifications buffered per subscriber before it is disconnected as too slow
+NOTIFICATION_QUEUE_SIZE = int(os.getenv("NOTIFICATION_QUEUE_SIZE", "100"))
+
+logger = logging.getLogger(__name__)
+
+
+class NotificationHub:
+    """
+    Fan-out of notifications to the subscribers of this process.
+
+    Subscribers are bounded queues read on the event loop. A subscriber that
+    falls behind is closed instead of buffering without limit; its client
+    reconnects and catches up from the notification history.
+    """
+
+    def __init__(self, queue_size: int):
+        self.queue_size = queue_size
+        self._subscribers: dict[int, set[asyncio.Queue]] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def subscribe(self, id_group: int) -> asyncio.Queue:
+        """
+        Start receiving the notifications of a group. Must run on the event loop.
+
+        Args:
+            id_group (int): The ID of the group.
+
+        Returns:
+            asyncio.Queue: The queue the notifications are put in; None is put
+            when the subscription is closed.
+        """
+        self._loop = asyncio.get_running_loop()
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers.setdefault(id_group, set()).add(queue)
+        return queue
+
+    def unsubscribe(self, id_group: int, queue: asyncio.Queue) -> None:
+        """
+        Stop receiving the notifications of a group. Must run on the event loop.
+
+        Args:
+            id_group (int): The ID of the group.
+            queue (asyncio.Queue): The queue returned by `subscribe`.
+        """
+        queues = self._subscribers.get(id_group)
+        if queues is not None:
+            queues.discard(queue)
+            if not queues:
+                del self._subscribers[id_group]
+
+    def dispatch(self, id_group: int, notification: dict) -> None:
+        """
+        Deliver a notification to the group's subscribers. Safe to call from any thread.
+
+        Args:
+            id_group (int): The ID of the group.
+            notification (dict): The JSON-serializable notification.
+        """
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        loop.call_soon_threadsafe(self._deliver, id_group, notification)
+
+    def _deliver(self, id_group: int, notification: dict) -> None:
+        for queue in list(self._subscribers.get(id_group, ())):
+            try:
+                queue.put_nowait(notification)
+            except asyncio.QueueFull:
+                self.unsubscribe(id_group, queue)
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(None)
+
+    def subscriber_count(self) -> int:
+        """
+        Count the subscribers of this process.
+
+        Returns:
+            int: The number of open subscriptions.
+        """
+        return sum(len(queues) for queues in self._subscribers.values())
+
+
+class NotificationBroker(abc.ABC):
+    """Interface shared by the notification brokers."""
+
+    def __init__(self, hub: NotificationHub):
+        self.hub = hub
+
+    @abc.abstractmethod
+    def publish(self, id_group: int, notification: dict) -> None:
+        """
+        Publish a notification to the subscribers of its group in every worker.
+
+        Args:
+            id_group (int): The ID of the group.
+            notification (dict): The JSON-serializable notification.
+        """
+
+    def start(self) -> None:
+        """Start receiving the notifications published by other workers."""
+
+    def stop(self) -> None:
+        """Stop receiving the notifications published by other workers."""
+
+
+class LocalBroker(NotificationBroker):
+    """Broker delivering notifications to the subscribers of this process only."""
+
+    def publish(self, id_group: int, notification: dict) -> None:
+        self.hub.dispatch(id_group, notification)
+
+
+class RedisBroker(NotificationBroker):
+    """
+    Broker sharing notifications between workers through Redis publish/subscribe.
+
+    Every worker listens to the channels of all groups on a background thread
+    and hands what it receives to its own hub.
+    """
+
+    CHANNEL_PREFIX = "notifications:"
+
+    def __init__(self, hub: NotificationHub, url: str = REDIS_URL):
+        super().__init__(hub)
+        import redis  # pylint: disable=import-outside-toplevel
+
+        self._client = redis.Redis.from_url(url)
+        self._listener = None
+
+    def publish(self, id_group: int, notification: dict) -> None:
+        self._client.publish(f"{self.CHANNEL_PREFIX}{id_group}",
+                             json.dumps(notification, default=str))
+
+    def _receive(self, message: dict) -> None:
+        try:
+            id_group = int(message["channel"].decode().removeprefix(self.CHANNEL_PREFIX))
+            notification = json.loads(message["data"])
+        except (ValueError, AttributeError):
+            logger.warning("Ignoring malformed notification message on %s.", message.get("channel"))
+            return
+        self.hub.dispatch(id_group, notification)
+
+    def start(self) -> None:
+        pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+        pubsub.psubscribe(**{f"{self.CHANNEL_PREFIX}*": self._receive})
+        self._listener = pubsub.run_in_thread(sleep_time=1.0, daemon=True)
+
+    def stop(self) -> None:
+        if self._listener is not None:
+            self._listener.stop()
+            self._listener = None
+
+
+def create_broker(hub: NotificationHub) -> NotificationBroker:
+    """
+    Create a broker on the configured backend.
+
+    Args:
+        hub (NotificationHub): The hub of this process.
+
+    Returns:
+        NotificationBroker: The new broker.
+
+    Raises:
+        ValueError: If NOTIFICATION_BROKER names an unknown backend.
+    """
+    if NOTIFICATION_BROKER == "local":
+        return LocalBroker(hub)
+    if NOTIFICATION_BROKER == "redis":
+        return RedisBroker(hub)
+    raise ValueError(f"Unknown notification broker: {NOTIFICATION_BROKER}")
+
+
+notification_hub = NotificationHub(NOTIFICATION_QUEUE_SIZE)
+notification_broker = create_broker(notification_hub)
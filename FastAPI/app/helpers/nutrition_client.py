@@ -0,0 +1,273 @@
+"""
+nutrition_client.py
+
+This module provides the asynchronous client of the external nutrition API.
+Lookups for the same API ID made while one is in flight share its result, the
+IDs asked for at about the same time are sent together in batches, and at most
+NUTRITION_API_CONCURRENCY batches are in flight at once. Answers, including
+"unknown ID", are kept in an SQLite file for NUTRITION_CACHE_TTL seconds so
+they survive restarts and are shared by the workers of a host.
+
+The API is expected to answer `GET {NUTRITION_API_URL}/foods?ids=a,b,c` with
+`{"foods": [{"id": "a", "calories": 52.0}, ...]}`, the calories being per unit
+of the ingredient; IDs it does not know are left out.
+"""
+
+import asyncio
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Iterable, Optional
+import httpx
+from dotenv import load_dotenv
+
+# Load environment variables from a .env file
+load_dotenv()
+
+NUTRITION_API_URL = os.getenv("NUTRITION_API_URL", "http://localhost:8081")
+NUTRITION_API_KEY = os.getenv("NUTRITION_API_KEY", "")
+# API IDs sent per request
+NUTRITION_API_BATCH_SIZE = int(os.getenv("NUTRITION_API_BATCH_SIZE", "50"))
+# Seconds lookups wait for others to join their batch
+NUTRITION_API_BATCH_DELAY = float(os.getenv("NUTRITION_API_BATCH_DELAY", "0.01"))
+# Requests in flight at once
+NUTRITION_API_CONCURRENCY = int(os.getenv("NUTRITION_API_CONCURRENCY", "4"))
+NUTRITION_API_TIMEOUT = float(os.getenv("NUTRITION_API_TIMEOUT", "10"))
+# Retries of a request that was throttled or failed on the server
+NUTRITION_API_RETRIES = int(os.getenv("NUTRITION_API_RETRIES", "2"))
+NUTRITION_CACHE_PATH = os.getenv("NUTRITION_CACHE_PATH", "nutrition_cache.sqlite3")
+NUTRITION_CACHE_TTL = float(os.getenv("NUTRITION_CACHE_TTL", "604800"))
+
+# SQLite limits the number of parameters of one statement
+_CACHE_QUERY_CHUNK = 500
+
+logger = logging.getLogger(__name__)
+
+
+class NutritionAPIError(Exception):
+    """Raised when the nutrition API cannot be reached or answers with an error."""
+
+
+class NutritionCache:
+    """Calories by API ID stored in an SQLite file, each entry expiring after a TTL."""
+
+    def __init__(self, path: str, ttl: float):
+        self.path = path
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._connection: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            connection = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("CREATE TABLE IF NOT EXISTS nutrition_cache ("
+                               "api_id TEXT PRIMARY KEY, calories REAL, fetched_at REAL NOT NULL)")
+            self._connection = connection
+        return self._connection
+
+    def get_many(self, api_ids: list[str]) -> dict[str, Optional[float]]:
+        """
+        Get the cached calories of API IDs.
+
+        Args:
+            api_ids (list[str]): The API IDs to look up.
+
+        Returns:
+            dict[str, Optional[float]]: The calories of the IDs found and not
+            expired; None for IDs the API did not know.
+        """
+        oldest = time.time() - self.ttl
+        found = {}
+        with self._lock:
+            connection = self._connect()
+            for start in range(0, len(api_ids), _CACHE_QUERY_CHUNK):
+                chunk = api_ids[start:start + _CACHE_QUERY_CHUNK]
+                placeholders = ",".join("?" * len(chunk))
+                rows = connection.execute(
+                    "SELECT api_id, calories FROM nutrition_cache "
+                    f"WHERE api_id IN ({placeholders}) AND fetched_at >= ?", (*chunk, oldest))
+                found.update(rows)
+        return found
+
+    def set_many(self, values: dict[str, Optional[float]]) -> None:
+        """
+        Store the calories of API IDs.
+
+        Args:
+            values (dict[str, Optional[float]]): The calories by API ID; None for unknown IDs.
+        """
+        now = time.time()
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                connection.execute("BEGIN")
+                connection.executemany("INSERT OR REPLACE INTO nutrition_cache "
+                                       "(api_id, calories, fetched_at) VALUES (?, ?, ?)",
+                                       [(api_id, calories, now)
+                                        for api_id, calories in values.items()])
+
+    def close(self) -> None:
+        """Close the cache file."""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+
+class NutritionClient:
+    """Batching, coalescing and caching client of the nutrition API."""
+
+    def __init__(self, base_url: str, api_key: str, cache: NutritionCache, batch_size: int,
+                 batch_delay: float, concurrency: int, timeout: float, retries: int):
+        self.base_url = base_url
+        self.api_key = api_key
+        self.cache = cache
+        self.batch_size = batch_size
+        self.batch_delay = batch_delay
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.retries = retries
+        self._client: Optional[httpx.AsyncClient] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._pending: dict[str, asyncio.Future] = {}
+        self._queue: list[str] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._batches: set[asyncio.Task] = set()
+
+    def _ensure_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            headers = {"X-Api-Key": self.api_key} if self.api_key else {}
+            self._client = httpx.AsyncClient(base_url=self.base_url, headers=headers,
+                                             timeout=self.timeout)
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        return self._client
+
+    async def lookup(self, api_ids: Iterable[str]) -> dict[str, Optional[float]]:
+        """
+        Get the calories of API IDs, from the cache or the API.
+
+        Args:
+            api_ids (Iterable[str]): The API IDs to look up.
+
+        Returns:
+            dict[str, Optional[float]]: The calories by API ID; None for IDs the API does not know.
+
+        Raises:
+            NutritionAPIError: If the API could not answer for IDs missing from the cache.
+        """
+        api_ids = list(dict.fromkeys(api_ids))
+        results = await asyncio.to_thread(self.cache.get_many,
+                                          [api_id for api_id in api_ids
+                                           if api_id not in self._pending])
+        waiting = {}
+        loop = asyncio.get_running_loop()
+        for api_id in api_ids:
+            if api_id in results:
+                continue
+            future = self._pending.get(api_id)
+            if future is None:
+                future = self._pending[api_id] = loop.create_future()
+                self._enqueue(api_id)
+            waiting[api_id] = future
+        if waiting:
+            # Shielded so a cancelled caller does not cancel the lookups others share
+            values = await asyncio.gather(*(asyncio.shield(future) for future in waiting.values()))
+            results.update(zip(waiting, values))
+        return results
+
+    def _enqueue(self, api_id: str) -> None:
+        """Add an API ID to the next batch, sending it once full or after the batch delay."""
+        self._queue.append(api_id)
+        if len(self._queue) >= self.batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = asyncio.get_running_loop().call_later(self.batch_delay,
+                                                                       self._flush)
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        while self._queue:
+            batch, self._queue = self._queue[:self.batch_size], self._queue[self.batch_size:]
+            task = asyncio.get_running_loop().create_task(self._fetch_batch(batch))
+            self._batches.add(task)
+            task.add_done_callback(self._batches.discard)
+
+    async def _fetch_batch(self, batch: list[str]) -> None:
+        """Fetch a batch, cache it and hand the results to every lookup waiting for them."""
+        values, error = None, None
+        try:
+            self._ensure_client()
+            async with self._semaphore:
+                values = await self._request(batch)
+            await asyncio.to_thread(self.cache.set_many, values)
+        except NutritionAPIError as exc:
+            error = exc
+        except sqlite3.Error:
+            logger.exception("Could not store nutrition results in the cache.")
+        finally:
+            for api_id in batch:
+                future = self._pending.pop(api_id)
+                if future.done():
+                    continue
+                if values is not None:
+                    future.set_result(values[api_id])
+                else:
+                    future.set_exception(error or NutritionAPIError("Nutrition lookup interrupted"))
+
+    async def _request(self, batch: list[str]) -> dict[str, Optional[float]]:
+        """Request the calories of a batch, retrying throttled and failed requests."""
+        client = self._ensure_client()
+        for attempt in range(self.retries + 1):
+            try:
+                response = await client.get("/foods", params={"ids": ",".join(batch)})
+            except httpx.HTTPError as exc:
+                if attempt == self.retries:
+                    raise NutritionAPIError(f"Nutrition API unreachable: {exc}") from exc
+                await asyncio.sleep(0.5 * 2 ** attempt)
+                continue
+            if ((response.status_code == 429 or response.status_code >= 500)
+                    and attempt < self.retries):
+                try:
+                    delay = float(response.headers.get("Retry-After", ""))
+                except ValueError:
+                    delay = 0.5 * 2 ** attempt
+                # The batch holds a concurrency slot while it waits, so the wait is capped
+                await asyncio.sleep(min(max(delay, 0.0), self.timeout))
+                continue
+            if response.is_error:
+                raise NutritionAPIError(f"Nutrition API answered {response.status_code}")
+            try:
+                foods = {str(food["id"]): float(food["calories"])
+                         for food in response.json()["foods"] if food.get("calories") is not None}
+            except (ValueError, KeyError, TypeError) as exc:
+                raise NutritionAPIError("Malformed nutrition API response") from exc
+            return {api_id: foods.get(api_id) for api_id in batch}
+        raise NutritionAPIError("Nutrition API retries exhausted")
+
+    async def aclose(self) -> None:
+        """Wait for the batches in flight, then close the HTTP client and the cache."""
+        self._flush()
+        if self._batches:
+            await asyncio.gather(*self._batches, return_exceptions=True)
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            self._semaphore = None
+        self.cache.close()
+
+
+nutrition_client = NutritionClient(
+    NUTRITION_API_URL,
+    NUTRITION_API_KEY,
+    NutritionCache(NUTRITION_CACHE_PATH, NUTRITION_CACHE_TTL),
+    batch_size=NUTRITION_API_BATCH_SIZE,
+    batch_delay=NUTRITION_API_BATCH_DELAY,
+    concurrency=NUTRITION_API_CONCURRENCY,
+    timeout=NUTRITION_API_TIMEOUT,
+    retries=NUTRITION_API_RETRIES,
+)
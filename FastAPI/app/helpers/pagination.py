@@ -0,0 +1,46 @@
+"""
+pagination.py
+
+This module provides the opaque cursors used by keyset-paginated endpoints.
+"""
+
+import base64
+import json
+
+
+def encode_cursor(*values) -> str:
+    """
+    Encode the sort key of the last row of a page as an opaque cursor.
+
+    Args:
+        *values: The JSON-serializable values of the sort key.
+
+    Returns:
+        str: The URL-safe cursor.
+    """
+    raw = json.dumps(values, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> list:
+    """
+    Decode a cursor produced by `encode_cursor`.
+
+    Args:
+        cursor (str): The cursor received from the client.
+        size (int): The number of values the sort key has.
+
+    Returns:
+        list: The values of the sort key.
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+    except (ValueError, TypeError) as exc:
+        raise ValueError("Invalid cursor") from exc
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError("Invalid cursor")
+    return values
@@ -0,0 +1,67 @@
+"""
+password_hashing.py
+
+This module provides the Argon2 hashing functions run by the password process
+pool. It is imported by the pool workers, so it must stay free of database and
+web imports.
+"""
+
+import hmac
+from functools import lru_cache
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError
+
+ARGON2_PREFIX = "$argon2"
+
+
+@lru_cache(maxsize=8)
+def _hasher(time_cost: int, memory_cost: int, parallelism: int) -> PasswordHasher:
+    """Return the Argon2 hasher for a set of cost parameters."""
+    return PasswordHasher(time_cost=time_cost, memory_cost=memory_cost, parallelism=parallelism)
+
+
+def hash_password(password: str, time_cost: int, memory_cost: int, parallelism: int) -> str:
+    """
+    Hash a password with Argon2id.
+
+    Args:
+        password (str): The plain-text password.
+        time_cost (int): The number of Argon2 iterations.
+        memory_cost (int): The memory used by Argon2, in KiB.
+        parallelism (int): The number of Argon2 lanes.
+
+    Returns:
+        str: The encoded hash, including its salt and cost parameters.
+    """
+    return _hasher(time_cost, memory_cost, parallelism).hash(password)
+
+
+def verify_password(password_hash: str, password: str, time_cost: int, memory_cost: int,
+                    parallelism: int) -> tuple[bool, bool]:
+    """
+    Verify a password against its stored hash.
+
+    Passwords stored before hashing was introduced are compared in constant
+    time and always flagged for rehashing.
+
+    Args:
+        password_hash (str): The stored hash (or legacy plain-text password).
+        password (str): The plain-text password to check.
+        time_cost (int): The current number of Argon2 iterations.
+        memory_cost (int): The current Argon2 memory, in KiB.
+        parallelism (int): The current number of Argon2 lanes.
+
+    Returns:
+        tuple[bool, bool]: Whether the password matches, and whether the stored
+        hash should be replaced because the cost parameters changed.
+    """
+    if not password_hash.startswith(ARGON2_PREFIX):
+        matches = hmac.compare_digest(password_hash.encode(), password.encode())
+        return matches, matches
+
+    hasher = _hasher(time_cost, memory_cost, parallelism)
+    try:
+        hasher.verify(password_hash, password)
+    except (VerificationError, InvalidHashError):
+        return False, False
+    return True, hasher.check_needs_rehash(password_hash)
@@ -0,0 +1,33 @@
+"""
+periodic.py
+
+This module provides the loop behind the application's background jobs: a
+coroutine function run at startup and then again every interval until the
+task is cancelled at shutdown.
+"""
+
+import asyncio
+import logging
+from typing import Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+
+async def run_periodically(fn: Callable[[], Awaitable], interval: float, name: str) -> None:
+    """
+    Await `fn()` now and then every `interval` seconds, until cancelled.
+
+    A failed run is logged and retried at the next interval: any error, e.g.
+    an exhausted pool, must not end the loop.
+
+    Args:
+        fn (Callable[[], Awaitable]): The job to run.
+        interval (float): Seconds between the end of a run and the next one.
+        name (str): The name of the job in the logs.
+    """
+    while True:
+        try:
+            await fn()
+        except Exception:  # pylint: disable=broad-exception-caught
+            logger.exception("%s failed; retrying in %s seconds.", name, interval)
+        await asyncio.sleep(interval)
@@ -0,0 +1,130 @@
+"""
+search_index.py
+
+This module provides an in-process inverted index with BM25 ranking. It backs
+full-text recipe search on databases without a FULLTEXT index (SQLite setups).
+"""
+
+import math
+import re
+import threading
+from collections import Counter
+
+_TOKEN_RE = re.compile(r"\w{2,}", re.UNICODE)
+
+# BM25 parameters
+_K1 = 1.2
+_B = 0.75
+
+
+def tokenize(text: str) -> list[str]:
+    """
+    Split text into lower-case word tokens of at least two characters.
+
+    Args:
+        text (str): The text to split.
+
+    Returns:
+        list[str]: The tokens, in order of appearance.
+    """
+    return _TOKEN_RE.findall(text.lower()) if text else []
+
+
+class InvertedIndex:
+    """
+    Inverted index of documents with filterable attributes, ranked with BM25.
+
+    Each document carries a dict of attributes (e.g. `is_public`, `group_id`)
+    that searches can filter on.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._postings: dict[str, dict[int, int]] = {}
+        self._lengths: dict[int, int] = {}
+        self._attributes: dict[int, dict] = {}
+        self._doc_tokens: dict[int, tuple[str, ...]] = {}
+        self._total_length = 0
+
+    def __len__(self):
+        return len(self._lengths)
+
+    def _remove(self, doc_id: int) -> None:
+        length = self._lengths.pop(doc_id, None)
+        if length is None:
+            return
+        self._total_length -= length
+        self._attributes.pop(doc_id, None)
+        for token in self._doc_tokens.pop(doc_id, ()):
+            postings = self._postings[token]
+            del postings[doc_id]
+            if not postings:
+                del self._postings[token]
+
+    def upsert(self, doc_id: int, text: str, attributes: dict) -> None:
+        """
+        Add a document, replacing its previous version.
+
+        Args:
+            doc_id (int): The ID of the document.
+            text (str): The text to index.
+            attributes (dict): The filterable attributes of the document.
+        """
+        counts = Counter(tokenize(text))
+        with self._lock:
+            self._remove(doc_id)
+            for token, count in counts.items():
+                self._postings.setdefault(token, {})[doc_id] = count
+            length = sum(counts.values())
+            self._lengths[doc_id] = length
+            self._total_length += length
+            self._attributes[doc_id] = attributes
+            self._doc_tokens[doc_id] = tuple(counts)
+
+    def remove(self, doc_id: int) -> None:
+        """
+        Remove a document from the index.
+
+        Args:
+            doc_id (int): The ID of the document.
+        """
+        with self._lock:
+            self._remove(doc_id)
+
+    def search(self, query: str, filters: dict) -> list[tuple[float, int]]:
+        """
+        Rank the documents matching any token of the query.
+
+        Args:
+            query (str): The search text.
+            filters (dict): Attribute values the documents must have; None values are ignored.
+
+        Returns:
+            list[tuple[float, int]]: (score, document ID) pairs, best first and
+            by ascending ID among equal scores.
+        """
+        tokens = set(tokenize(query))
+        filters = {key: value for key, value in filters.items() if value is not None}
+        with self._lock:
+            total_docs = len(self._lengths)
+            if not total_docs:
+                return []
+            average_length = self._total_length / total_docs
+            scores: dict[int, float] = {}
+            for token in tokens:
+                postings = self._postings.get(token)
+                if not postings:
+                    continue
+                idf = math.log(1 + (total_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+                for doc_id, frequency in postings.items():
+                    norm = _K1 * (1 - _B + _B * self._lengths[doc_id] / average_length)
+                    weight = idf * frequency * (_K1 + 1) / (frequency + norm)
+                    scores[doc_id] = scores.get(doc_id, 0.0) + weight
+            if filters:
+                scores = {
+                    doc_id: score for doc_id, score in scores.items()
+                    if all(self._attributes[doc_id].get(key) == value
+                           for key, value in filters.items())
+                }
+        return sorted(((score, doc_id) for doc_id, score in scores.items()),
+                      key=lambda item: (-item[0], item[1]))
@@ -0,0 +1,39 @@
+"""
+serialization.py
+
+This module provides the fast path for large JSON responses. Routes opting in
+fetch plain rows with `.dicts()` and return them in a `PrecompiledJSONResponse`,
+which encodes the whole payload with a TypeAdapter built once for a TypedDict
+mirror of the response model. No Peewee or Pydantic object is created per row
+and the encoding runs in pydantic-core, while the route keeps its
+`response_model` for the OpenAPI schema.
+"""
+
+from typing import Any, Optional
+from pydantic import TypeAdapter
+from starlette.background import BackgroundTask
+from starlette.responses import Response
+
+
+class PrecompiledJSONResponse(Response):
+    """JSON response encoded by a precompiled TypeAdapter, skipping response model validation."""
+
+    media_type = "application/json"
+
+    def __init__(self, content: Any, adapter: TypeAdapter, status_code: int = 200,
+                 headers: Optional[dict] = None, background: Optional[BackgroundTask] = None):
+        """
+        Encode a payload with a TypeAdapter.
+
+        Args:
+            content (Any): The rows to encode, trusted to match the adapter's type.
+            adapter (TypeAdapter): The adapter of the payload's type, built once per route.
+            status_code (int): The HTTP status code.
+            headers (Optional[dict]): Extra response headers.
+            background (Optional[BackgroundTask]): A task run after the response is sent.
+        """
+        self.adapter = adapter
+        super().__init__(content, status_code, headers, background=background)
+
+    def render(self, content: Any) -> bytes:
+        return self.adapter.dump_json(content)
@@ -0,0 +1,144 @@
+"""
+trigram_index.py
+
+This module provides an in-process inverted index of character trigrams for
+typo-tolerant name matching. Names are scored against the query by the
+Jaccard similarity of their trigram sets. Candidates are only gathered from the
+rarest trigrams of the query: a name sharing none of them cannot reach the
+threshold, so common trigrams never have their long postings scanned.
+"""
+
+import heapq
+import math
+import threading
+from functools import lru_cache
+from typing import Iterable
+from helpers.autocomplete_index import normalize
+
+
+def trigrams(text: str) -> frozenset[str]:
+    """
+    Get the trigrams of a text, each word padded like PostgreSQL's pg_trgm.
+
+    Args:
+        text (str): The text, as returned by `normalize`.
+
+    Returns:
+        frozenset[str]: The distinct trigrams.
+    """
+    grams = set()
+    for word in text.split():
+        grams.update(_word_trigrams(word))
+    return frozenset(grams)
+
+
+@lru_cache(maxsize=65536)
+def _word_trigrams(word: str) -> tuple[str, ...]:
+    """Return the trigrams of one word; names share most of their words, so they are cached."""
+    padded = f"  {word} "
+    return tuple(padded[index:index + 3] for index in range(len(padded) - 2))
+
+
+class TrigramIndex:
+    """Names matched by trigram similarity, most similar first."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._postings: dict[str, set[int]] = {}
+        self._grams: dict[int, frozenset[str]] = {}
+        self._names: dict[int, str] = {}
+
+    def __len__(self):
+        return len(self._names)
+
+    def load(self, names: Iterable[tuple[int, str]]) -> None:
+        """
+        Replace the whole content of the index.
+
+        Args:
+            names (Iterable[tuple[int, str]]): (ID, name) pairs.
+        """
+        postings: dict[str, set[int]] = {}
+        grams = {}
+        entries = {}
+        for doc_id, name in names:
+            entries[doc_id] = name
+            grams[doc_id] = trigrams(normalize(name))
+            for gram in grams[doc_id]:
+                postings.setdefault(gram, set()).add(doc_id)
+        with self._lock:
+            self._postings, self._grams, self._names = postings, grams, entries
+
+    def _remove(self, doc_id: int) -> None:
+        self._names.pop(doc_id, None)
+        for gram in self._grams.pop(doc_id, ()):
+            postings = self._postings[gram]
+            postings.discard(doc_id)
+            if not postings:
+                del self._postings[gram]
+
+    def upsert(self, doc_id: int, name: str) -> None:
+        """
+        Add a name, replacing the previous name of the ID.
+
+        Args:
+            doc_id (int): The ID of the name.
+            name (str): The name.
+        """
+        grams = trigrams(normalize(name))
+        with self._lock:
+            self._remove(doc_id)
+            self._names[doc_id] = name
+            self._grams[doc_id] = grams
+            for gram in grams:
+                self._postings.setdefault(gram, set()).add(doc_id)
+
+    def remove(self, doc_id: int) -> None:
+        """
+        Remove a name from the index.
+
+        Args:
+            doc_id (int): The ID of the name.
+        """
+        with self._lock:
+            self._remove(doc_id)
+
+    def search(self, query: str, threshold: float, limit: int) -> list[tuple[int, str, float]]:
+        """
+        Find the names whose similarity to a query reaches a threshold.
+
+        Args:
+            query (str): The name to match.
+            threshold (float): The minimum similarity, greater than 0 and at most 1.
+            limit (int): The maximum number of matches.
+
+        Returns:
+            list[tuple[int, str, float]]: (ID, name, similarity) triples, most
+            similar first and by ascending ID among equal similarities.
+        """
+        grams = trigrams(normalize(query))
+        if not grams:
+            return []
+        with self._lock:
+            # A name of similarity >= threshold shares at least ceil(threshold * |grams|)
+            # trigrams with the query, so it contains one of the rarest ones left over.
+            required = max(1, math.ceil(threshold * len(grams) - 1e-9))
+            rarest = sorted(grams, key=lambda gram: len(self._postings.get(gram, ())))
+            candidates = set()
+            for gram in rarest[:len(grams) - required + 1]:
+                candidates.update(self._postings.get(gram, ()))
+
+            # Names much shorter or longer than the query cannot be similar enough
+            min_size = threshold * len(grams) - 1e-9
+            max_size = len(grams) / threshold + 1e-9
+            matches = []
+            for doc_id in candidates:
+                doc_grams = self._grams[doc_id]
+                if not min_size <= len(doc_grams) <= max_size:
+                    continue
+                shared = len(grams & doc_grams)
+                similarity = shared / (len(grams) + len(doc_grams) - shared)
+                if similarity >= threshold:
+                    matches.append((similarity, doc_id))
+            best = heapq.nsmallest(limit, matches, key=lambda match: (-match[0], match[1]))
+            return [(doc_id, self._names[doc_id], similarity) for similarity, doc_id in best]
@@ -0,0 +1,70 @@
+"""
+ttl_index.py
+
+This module provides a holder for in-memory indexes built from the database
+on first use and rebuilt once older than a TTL, so they pick up rows written
+by other workers or other applications. While one thread rebuilds an expired
+index, the others keep using the current one; the new index replaces it when
+complete.
+"""
+
+import threading
+import time
+from typing import Callable, Generic, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class TTLIndex(Generic[T]):
+    """
+    In-memory index rebuilt by a build function once older than `ttl` seconds.
+
+    Attributes:
+        ttl (float): Seconds an index is served before it is rebuilt.
+    """
+
+    def __init__(self, build: Callable[[], T], ttl: float):
+        self._build = build
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._index: Optional[T] = None
+        self._built_at: Optional[float] = None
+
+    @property
+    def current(self) -> Optional[T]:
+        """The index as last built, or None until the first build."""
+        return self._index
+
+    def get(self) -> T:
+        """
+        Get the index, building it on first use and rebuilding it once expired.
+
+        Only the first build blocks; an expired index is rebuilt by one thread
+        while the others keep getting the current one.
+
+        Returns:
+            T: The index.
+        """
+        built_at = self._built_at
+        if built_at is not None and time.monotonic() - built_at < self.ttl:
+            return self._index
+        # Released in the finally below; a context manager cannot skip a busy lock
+        if not self._lock.acquire(blocking=built_at is None):  # pylint: disable=consider-using-with
+            return self._index
+        try:
+            if self._built_at is built_at:
+                index = self._build()
+                self._index, self._built_at = index, time.monotonic()
+        finally:
+            self._lock.release()
+        return self._index
+
+    def invalidate(self) -> None:
+        """
+        Drop the index after a write, so the next `get` rebuilds it.
+
+        Waits for a rebuild in progress, which may have read the data before
+        the write.
+        """
+        with self._lock:
+            self._built_at = None
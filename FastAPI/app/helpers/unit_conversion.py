@@ -0,0 +1,137 @@
+"""
+unit_conversion.py
+
+This module provides an in-memory graph of unit conversion factors. Units are
+nodes and every factor is an edge in both directions; the factors between all
+pairs of connected units are precomputed along the paths with the fewest
+conversions, so a lookup is a dict access. Ingredient-specific factors (the
+density linking a volume to a mass) extend the general graph for that
+ingredient only.
+"""
+
+import threading
+from collections import deque
+from typing import Iterable, Optional
+import numpy as np
+
+# Ingredient ID used for general conversions in the vectorized lookups.
+NO_INGREDIENT = 0
+# Unit ID used for quantities without a unit in the vectorized lookups.
+NO_UNIT = 0
+
+
+def _closure(edges: dict[int, dict[int, float]]) -> dict[int, dict[int, float]]:
+    """Compute the factor from every unit to every unit reachable from it, breadth first."""
+    closure = {}
+    for source in edges:
+        factors = {source: 1.0}
+        queue = deque([source])
+        while queue:
+            unit = queue.popleft()
+            for target, factor in edges[unit].items():
+                if target not in factors:
+                    factors[target] = factors[unit] * factor
+                    queue.append(target)
+        closure[source] = factors
+    return closure
+
+
+class ConversionGraph:
+    """
+    Conversion factors between units, general and per ingredient.
+
+    A factor converts a quantity in `from_unit` to `to_unit` by multiplication.
+    """
+
+    def __init__(self, rows: Iterable[dict]):
+        """
+        Build the graph from conversion rows.
+
+        Args:
+            rows (Iterable[dict]): Rows with `from_unit`, `to_unit`, `factor`
+                and `ingredient` (None for a general conversion).
+        """
+        self._edges: dict[int, dict[int, float]] = {}
+        self._ingredient_edges: dict[int, list[tuple[int, int, float]]] = {}
+        for row in rows:
+            factor = float(row["factor"])
+            if factor <= 0:
+                continue
+            if row["ingredient"] is None:
+                self._add_edge(self._edges, row["from_unit"], row["to_unit"], factor)
+            else:
+                self._ingredient_edges.setdefault(row["ingredient"], []).append(
+                    (row["from_unit"], row["to_unit"], factor))
+        self._closures = {NO_INGREDIENT: _closure(self._edges)}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _add_edge(edges: dict, from_unit: int, to_unit: int, factor: float) -> None:
+        edges.setdefault(from_unit, {})[to_unit] = factor
+        edges.setdefault(to_unit, {})[from_unit] = 1 / factor
+
+    def _closure_for(self, ingredient: int) -> dict[int, dict[int, float]]:
+        """Return the precomputed factors of an ingredient, computing them on first use."""
+        closure = self._closures.get(ingredient)
+        if closure is not None:
+            return closure
+        if ingredient not in self._ingredient_edges:
+            return self._closures[NO_INGREDIENT]
+        with self._lock:
+            closure = self._closures.get(ingredient)
+            if closure is None:
+                edges = {unit: dict(targets) for unit, targets in self._edges.items()}
+                for from_unit, to_unit, factor in self._ingredient_edges[ingredient]:
+                    self._add_edge(edges, from_unit, to_unit, factor)
+                closure = self._closures[ingredient] = _closure(edges)
+        return closure
+
+    def factor(self, from_unit: int, to_unit: int,
+               ingredient: Optional[int] = None) -> Optional[float]:
+        """
+        Get the factor converting a quantity between two units.
+
+        Args:
+            from_unit (int): The ID of the unit of the quantity.
+            to_unit (int): The ID of the unit to convert to.
+            ingredient (Optional[int]): The ID of the ingredient, to use its own factors.
+
+        Returns:
+            Optional[float]: The factor, or None if the units are not connected.
+        """
+        if from_unit == to_unit:
+            return 1.0
+        return self._closure_for(ingredient or NO_INGREDIENT).get(from_unit, {}).get(to_unit)
+
+    def convert(self, quantities, from_units, to_units, ingredients=None) -> np.ndarray:
+        """
+        Convert arrays of quantities in one vectorized operation.
+
+        Each distinct (from unit, to unit, ingredient) combination is looked up
+        once; the quantities are then multiplied by their factors as a whole.
+
+        Args:
+            quantities (ArrayLike): The quantities to convert.
+            from_units (ArrayLike): The unit ID of each quantity.
+            to_units (ArrayLike): The unit ID to convert each quantity to.
+            ingredients (Optional[ArrayLike]): The ingredient ID of each quantity; 0 for none.
+
+        Returns:
+            np.ndarray: The converted quantities, NaN where the units are not connected.
+        """
+        quantities, from_units, to_units, ingredients = np.broadcast_arrays(
+            np.asarray(quantities, dtype=np.float64),
+            np.asarray(from_units, dtype=np.int64),
+            np.asarray(to_units, dtype=np.int64),
+            np.asarray(NO_INGREDIENT if ingredients is None else ingredients, dtype=np.int64),
+        )
+        if not quantities.size:
+            return quantities.copy()
+        keys = np.stack([from_units.ravel(), to_units.ravel(), ingredients.ravel()], axis=1)
+        combinations, inverse = np.unique(keys, axis=0, return_inverse=True)
+        factors = np.array([
+            np.nan if (factor := self.factor(int(from_unit), int(to_unit), int(ingredient))) is None
+            else factor
+            for from_unit, to_unit, ingredient in combinations
+        ])
+        return quantities * factors[inverse.reshape(-1)].reshape(quantities.shape)
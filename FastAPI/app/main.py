@@ -1,29 +1,66 @@
 """Main module for Receipt Master."""
-from contextlib import asynccontextmanager  # Standard library import first
+import asyncio  # Standard library import first
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Depends  # Third-party imports second
 from starlette.responses import RedirectResponse
 from config.database import database as connection  # First-party imports last
 from routes.user_route import user_router
-from helpers.api_key_auth import get_api_key
+from routes.recipe_route import recipe_router
+from routes.menu_route import menu_router
+from routes.ingredient_route import ingredient_router
+from routes.pantry_route import pantry_router
+from routes.unit_route import unit_router
+from routes.shopping_list_route import shopping_list_router
+from routes.notification_route import notification_router
+from routes.group_route import group_router
+from routes.monitoring_route import monitoring_router
+from routes.metrics_route import metrics_router
+from helpers.api_key_auth import get_api_key, refresh_api_keys_periodically
+from helpers.database_middleware import DatabaseConnectionMiddleware
+from helpers.metrics import MetricsMiddleware
+from helpers.db_executor import shutdown_db_executor
+from helpers.notification_broker import notification_broker
+from helpers.nutrition_client import nutrition_client
+from services.password_service import PasswordService
+from services.ingredient_service import refresh_name_indexes_periodically
+from services.notification_service import EXPIRY_SCAN_INTERVAL, scan_expiring_items_periodically
 
 
 @asynccontextmanager
 async def lifespan(_app: FastAPI):
     """
-    Lifespan function to handle the database connection.
+    Lifespan function to handle the database connection pool.
+
+    Connections are checked out per request by `DatabaseConnectionMiddleware`,
+    so the pool only needs to be drained when the application stops. The API
+    key index and the ingredient name indexes are refreshed and the
+    pantries are scanned for expiring items in the background while the
+    application runs, and the notification broker relays the notifications
+    published by other workers.
 
     Args:
         _app (FastAPI): The FastAPI application instance (currently unused).
     """
-    # Connect to the database if the connection is closed
-    if connection.is_closed():
-        connection.connect()
+    notification_broker.start()
+    background_tasks = [
+        asyncio.create_task(refresh_api_keys_periodically()),
+        asyncio.create_task(refresh_name_indexes_periodically()),
+    ]
+    if EXPIRY_SCAN_INTERVAL > 0:
+        background_tasks.append(asyncio.create_task(scan_expiring_items_periodically()))
     try:
         yield  # The application runs here
     finally:
-        # Close the connection when the application stops
-        if not connection.is_closed():
-            connection.close()
+        for task in background_tasks:
+            task.cancel()
+        # A task that failed must not keep the resources below from being released
+        await asyncio.gather(*background_tasks, return_exceptions=True)
+        notification_broker.stop()
+        await nutrition_client.aclose()
+        # Let in-flight queries finish, then close every pooled connection
+        shutdown_db_executor()
+        PasswordService.shutdown()
+        connection.close_all()
 
 
 app = FastAPI(
@@ -35,8 +72,12 @@ app = FastAPI(
         "email": "juanpa.995@gmail.com"
     },
     description="Receipt Master es una API de recetas",
+    lifespan=lifespan,
 )
 
+app.add_middleware(DatabaseConnectionMiddleware)
+app.add_middleware(MetricsMiddleware)
+
 
 @app.get("/")
 def read_root():
@@ -52,3 +93,69 @@ app.include_router(
     tags=["users"],
     dependencies=[Depends(get_api_key)],
 )
+
+app.include_router(
+    recipe_router,
+    prefix="/recipes",
+    tags=["recipes"],
+    dependencies=[Depends(get_api_key)],
+)
+
+app.include_router(
+    menu_router,
+    prefix="/menus",
+    tags=["menus"],
+    dependencies=[Depends(get_api_key)],
+)
+
+app.include_router(
+    ingredient_router,
+    prefix="/ingredients",
+    tags=["ingredients"],
+    dependencies=[Depends(get_api_key)],
+)
+
+app.include_router(
+    pantry_router,
+    prefix="/pantries",
+    tags=["pantries"],
+    dependencies=[Depends(get_api_key)],
+)
+
+app.include_router(
+    unit_router,
+    prefix="/units",
+    tags=["units"],
+    dependencies=[Depends(get_api_key)],
+)
+
+app.include_router(
+    shopping_list_router,
+    prefix="/shopping-lists",
+    tags=["shopping lists"],
+    dependencies=[Depends(get_api_key)],
+)
+
+app.include_router(
+    group_router,
+    prefix="/groups",
+    tags=["groups"],
+    dependencies=[Depends(get_api_key)],
+)
+
+app.include_router(
+    notification_router,
+    prefix="/notifications",
+    tags=["notifications"],
+    dependencies=[Depends(get_api_key)],
+)
+
+app.include_router(
+    monitoring_router,
+    prefix="/monitoring",
+    tags=["monitoring"],
+    dependencies=[Depends(get_api_key)],
+)
+
+# Scraped by Prometheus, so it is served without the API key dependency.
+app.include_router(metrics_router, tags=["monitoring"])
@@ -0,0 +1,38 @@
+"""Create ApiKey table
+
+Revision ID: 04c2b535613b
+Revises: fca870757c1d
+Create Date: 2026-10-18 10:02:17.554120
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '04c2b535613b'
+down_revision: Union[str, None] = 'fca870757c1d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'ApiKey',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('name', sa.String(length=255), nullable=False),
+        sa.Column('key_hash', sa.String(length=64), nullable=False),
+        sa.Column('rate_limit', sa.Float(), nullable=False),
+        sa.Column('burst', sa.Integer(), nullable=False),
+        sa.Column('is_active', sa.Boolean(), nullable=False),
+        sa.Column('creation_date', sa.Date(), nullable=False),
+        sa.Column('update_date', sa.Date(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('key_hash'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('ApiKey')
@@ -0,0 +1,40 @@
+"""Make general UnitConversion factors unique per unit pair
+
+Revision ID: 3f7d2c9e8a14
+Revises: d4a8b61c0e95
+Create Date: 2026-10-18 20:13:27.418362
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f7d2c9e8a14'
+down_revision: Union[str, None] = 'd4a8b61c0e95'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Keep the latest general factor of each pair before the index forbids duplicates
+    op.execute(
+        "DELETE older FROM UnitConversion AS older "
+        "JOIN UnitConversion AS newer ON newer.from_unit_id = older.from_unit_id "
+        "AND newer.to_unit_id = older.to_unit_id AND newer.id > older.id "
+        "WHERE older.ingredient_id IS NULL AND newer.ingredient_id IS NULL"
+    )
+    # The new index is created before the old one is dropped, since the
+    # from_unit_id foreign key needs an index starting with that column
+    op.create_index('uq_unit_conversion_pair_ingredient', 'UnitConversion',
+                    ['from_unit_id', 'to_unit_id', sa.text('(COALESCE(ingredient_id, 0))')],
+                    unique=True)
+    op.drop_index('uq_unit_conversion_units_ingredient', table_name='UnitConversion')
+
+
+def downgrade() -> None:
+    op.create_index('uq_unit_conversion_units_ingredient', 'UnitConversion',
+                    ['from_unit_id', 'to_unit_id', 'ingredient_id'], unique=True)
+    op.drop_index('uq_unit_conversion_pair_ingredient', table_name='UnitConversion')
@@ -0,0 +1,32 @@
+"""Add composite indexes for faceted recipe browsing
+
+Revision ID: 7c41d2e9a8f0
+Revises: e538a3bf5893
+Create Date: 2026-10-18 12:05:31.118240
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c41d2e9a8f0'
+down_revision: Union[str, None] = 'e538a3bf5893'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_recipe_difficulty_cooking_time', 'Recipe', ['difficulty', 'cooking_time'])
+    op.create_index('ix_recipe_cooking_time', 'Recipe', ['cooking_time'])
+    op.create_index('ix_recipe_total_calories', 'Recipe', ['total_calories'])
+    op.create_index('ix_recipe_category_bridge_category_recipe', 'RecipeCategoryBridge',
+                    ['category_id', 'recipe_id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_recipe_category_bridge_category_recipe', table_name='RecipeCategoryBridge')
+    op.drop_index('ix_recipe_total_calories', table_name='Recipe')
+    op.drop_index('ix_recipe_cooking_time', table_name='Recipe')
+    op.drop_index('ix_recipe_difficulty_cooking_time', table_name='Recipe')
@@ -0,0 +1,42 @@
+"""Create UnitConversion table
+
+Revision ID: b93e0f6a1d27
+Revises: 7c41d2e9a8f0
+Create Date: 2026-10-18 12:41:07.552913
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b93e0f6a1d27'
+down_revision: Union[str, None] = '7c41d2e9a8f0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'UnitConversion',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('from_unit_id', sa.Integer(), nullable=False),
+        sa.Column('to_unit_id', sa.Integer(), nullable=False),
+        sa.Column('factor', sa.Float(), nullable=False),
+        sa.Column('ingredient_id', sa.Integer(), nullable=True),
+        sa.Column('creation_date', sa.Date(), nullable=False),
+        sa.Column('update_date', sa.Date(), nullable=False),
+        sa.ForeignKeyConstraint(['from_unit_id'], ['Unit.unit_id']),
+        sa.ForeignKeyConstraint(['to_unit_id'], ['Unit.unit_id']),
+        sa.ForeignKeyConstraint(['ingredient_id'], ['Ingredient.ingredient_id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('uq_unit_conversion_units_ingredient', 'UnitConversion',
+                    ['from_unit_id', 'to_unit_id', 'ingredient_id'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index('uq_unit_conversion_units_ingredient', table_name='UnitConversion')
+    op.drop_table('UnitConversion')
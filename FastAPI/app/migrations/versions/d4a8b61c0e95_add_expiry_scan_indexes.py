@@ -0,0 +1,31 @@
+"""Add PantryItem expiry index and Notification dedupe key
+
+Revision ID: d4a8b61c0e95
+Revises: b93e0f6a1d27
+Create Date: 2026-10-18 13:22:46.301775
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4a8b61c0e95'
+down_revision: Union[str, None] = 'b93e0f6a1d27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_pantry_item_expiry_date', 'PantryItem',
+                    ['expiry_date', 'pantry_id', 'ingredient_id'])
+    op.add_column('Notification', sa.Column('dedupe_key', sa.String(length=255), nullable=True))
+    op.create_unique_constraint('uq_notification_dedupe_key', 'Notification', ['dedupe_key'])
+
+
+def downgrade() -> None:
+    op.drop_constraint('uq_notification_dedupe_key', 'Notification', type_='unique')
+    op.drop_column('Notification', 'dedupe_key')
+    op.drop_index('ix_pantry_item_expiry_date', table_name='PantryItem')
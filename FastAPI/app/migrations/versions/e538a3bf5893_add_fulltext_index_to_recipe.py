@@ -0,0 +1,28 @@
+"""Add FULLTEXT index to Recipe title, description and instructions
+
+Revision ID: e538a3bf5893
+Revises: 04c2b535613b
+Create Date: 2026-10-18 11:20:53.904417
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e538a3bf5893'
+down_revision: Union[str, None] = '04c2b535613b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ft_recipe_text', 'Recipe', ['title', 'description', 'instructions'],
+        mysql_prefix='FULLTEXT'
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ft_recipe_text', table_name='Recipe')
@@ -0,0 +1,27 @@
+"""Add unique indexes to User username and email
+
+Revision ID: fca870757c1d
+Revises:
+Create Date: 2026-10-18 09:12:41.318402
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'fca870757c1d'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('uq_user_username', 'User', ['username'], unique=True)
+    op.create_index('uq_user_email', 'User', ['email'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index('uq_user_email', table_name='User')
+    op.drop_index('uq_user_username', table_name='User')
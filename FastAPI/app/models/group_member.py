@@ -2,6 +2,7 @@
 Pydantic models for the GroupMember entity.
 """
 
+from typing import Literal
 from pydantic import BaseModel
 
 
@@ -17,4 +18,13 @@ class GroupMember(BaseModel):
     group_id: int
     user_id: int
     role: str
-    
\ No newline at end of file
+
+
+class GroupMemberRole(BaseModel):
+    """
+    Pydantic model representing the role given to a group member.
+
+    Attributes:
+        role (str): The role of the user within the group: viewer, member, admin or owner.
+    """
+    role: Literal["viewer", "member", "admin", "owner"]
@@ -2,7 +2,8 @@
 Pydantic models for the Ingredient entity.
 """
 
-from pydantic import BaseModel
+from typing import Optional
+from pydantic import BaseModel, Field
 
 
 class Ingredient(BaseModel):
@@ -23,4 +24,108 @@ class Ingredient(BaseModel):
     state_id: int
     calorie_unit_id: int
     calories_per_unit: float
-    
\ No newline at end of file
+
+
+class IngredientCreate(BaseModel):
+    """
+    Pydantic model representing a new ingredient.
+
+    Attributes:
+        name (str): The name of the ingredient.
+        calories_per_unit (Optional[float]): The number of calories per unit of the ingredient.
+    """
+    name: str = Field(..., min_length=1, max_length=255)
+    calories_per_unit: Optional[float] = Field(None, ge=0)
+
+
+class IngredientSummary(BaseModel):
+    """
+    Pydantic model representing a created ingredient.
+
+    Attributes:
+        ingredient_id (int): The unique identifier for the ingredient.
+        name (str): The name of the ingredient.
+        calories_per_unit (Optional[float]): The number of calories per unit of the ingredient.
+    """
+    ingredient_id: int
+    name: str
+    calories_per_unit: Optional[float] = None
+
+
+class IngredientSuggestion(BaseModel):
+    """
+    Pydantic model representing an autocomplete suggestion.
+
+    Attributes:
+        ingredient_id (int): The unique identifier for the ingredient.
+        name (str): The name of the ingredient.
+        recipe_count (int): The number of recipes using the ingredient.
+    """
+    ingredient_id: int
+    name: str
+    recipe_count: int
+
+
+class IngredientMatch(BaseModel):
+    """
+    Pydantic model representing an ingredient whose name is similar to the one searched for.
+
+    Attributes:
+        ingredient_id (int): The unique identifier for the ingredient.
+        name (str): The name of the ingredient.
+        similarity (float): The trigram similarity of the names, between 0 and 1.
+    """
+    ingredient_id: int
+    name: str
+    similarity: float
+
+
+class IngredientCalories(BaseModel):
+    """
+    Pydantic model representing a correction of the calories of an ingredient.
+
+    Attributes:
+        calories_per_unit (float): The number of calories per unit of the ingredient.
+    """
+    calories_per_unit: float = Field(..., ge=0)
+
+
+class NutritionSyncRequest(BaseModel):
+    """
+    Pydantic model representing a request to fill ingredient calories from the nutrition API.
+
+    Attributes:
+        ingredient_ids (Optional[list[int]]): The ingredients to fill; every linked ingredient
+            if None.
+        only_missing (bool): Only fill ingredients that have no calories yet.
+    """
+    ingredient_ids: Optional[list[int]] = Field(None, max_length=10000)
+    only_missing: bool = True
+
+
+class NutritionSyncResult(BaseModel):
+    """
+    Pydantic model representing the outcome of filling calories from the nutrition API.
+
+    Attributes:
+        ingredients_updated (int): The number of ingredients whose calories were set.
+        unresolved (list[int]): The linked ingredients the API had no calories for.
+        recipes_updated (int): The number of recipes whose totals were recomputed.
+        menus_updated (int): The number of menus whose totals were recomputed.
+    """
+    ingredients_updated: int
+    unresolved: list[int]
+    recipes_updated: int
+    menus_updated: int
+
+
+class CalorieRecomputeResult(BaseModel):
+    """
+    Pydantic model representing the totals recomputed after a calorie correction.
+
+    Attributes:
+        recipes_updated (int): The number of recipes whose totals were recomputed.
+        menus_updated (int): The number of menus whose totals were recomputed.
+    """
+    recipes_updated: int
+    menus_updated: int
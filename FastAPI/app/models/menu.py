@@ -24,4 +24,15 @@ class Menu(BaseModel):
     total_calories: float
     start_date: datetime
     end_date: datetime
-    
\ No newline at end of file
+
+
+class MenuCalories(BaseModel):
+    """
+    Pydantic model representing the calorie total of a menu.
+
+    Attributes:
+        menu_id (int): The ID of the menu.
+        total_calories (float): The total calories of the menu.
+    """
+    menu_id: int
+    total_calories: float
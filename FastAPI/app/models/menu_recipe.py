@@ -3,6 +3,7 @@ Pydantic models for the MenuRecipe entity.
 """
 
 from datetime import datetime  # Using datetime for date
+from typing import Optional
 from pydantic import BaseModel
 
 
@@ -18,4 +19,13 @@ class MenuRecipe(BaseModel):
     menu_id: int
     recipe_id: int
     date: datetime  # Using datetime for timestamp
-    
\ No newline at end of file
+
+
+class MenuRecipeSchedule(BaseModel):
+    """
+    Pydantic model representing when a recipe of a menu is planned.
+
+    Attributes:
+        date (Optional[datetime]): The date and time the recipe is planned for.
+    """
+    date: Optional[datetime] = None
@@ -3,6 +3,7 @@ Pydantic models for the Notification entity.
 """
 
 from datetime import datetime  # Correct import for datetime field
+from typing import Optional
 from pydantic import BaseModel
 
 
@@ -20,4 +21,16 @@ class Notification(BaseModel):
     group_id: int
     message: str
     date: datetime  # Specify `datetime` for a timestamp
-    
\ No newline at end of file
+
+
+class NotificationPage(BaseModel):
+    """
+    Pydantic model representing one page of a group's notification history.
+
+    Attributes:
+        items (list[Notification]): The notifications of the page, oldest first.
+        next_cursor (Optional[int]): The `after_id` to request the next page with,
+            or None when this is the last page.
+    """
+    items: list[Notification]
+    next_cursor: Optional[int] = None
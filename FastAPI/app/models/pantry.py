@@ -2,6 +2,7 @@
 Pydantic models for the Pantry entity.
 """
 
+from typing import Optional
 from pydantic import BaseModel
 
 
@@ -15,4 +16,81 @@ class Pantry(BaseModel):
     """
     pantry_id: int
     group_id: int
-    
\ No newline at end of file
+
+
+class MissingIngredient(BaseModel):
+    """
+    Pydantic model representing an ingredient of a recipe missing from the pantry.
+
+    Attributes:
+        ingredient_id (int): The ID of the ingredient.
+        name (str): The name of the ingredient.
+    """
+    ingredient_id: int
+    name: str
+
+
+class RecipeSuggestion(BaseModel):
+    """
+    Pydantic model representing a recipe ranked by how much of it the pantry covers.
+
+    Attributes:
+        recipe_id (int): The ID of the recipe.
+        title (str): The title of the recipe.
+        matched_ingredients (int): The number of its ingredients in the pantry.
+        total_ingredients (int): The number of its ingredients.
+        coverage (float): The share of its ingredients in the pantry, from 0 to 1.
+        missing_ingredients (list[MissingIngredient]): The ingredients not in the pantry.
+    """
+    recipe_id: int
+    title: str
+    matched_ingredients: int
+    total_ingredients: int
+    coverage: float
+    missing_ingredients: list[MissingIngredient]
+
+
+class PantryDeduction(BaseModel):
+    """
+    Pydantic model representing a quantity taken from a pantry item.
+
+    Attributes:
+        pantry_id (int): The ID of the pantry.
+        ingredient_id (int): The ID of the ingredient.
+        quantity (float): The quantity taken, in the unit of the pantry item.
+        unit_id (Optional[int]): The unit of the pantry item.
+    """
+    pantry_id: int
+    ingredient_id: int
+    quantity: float
+    unit_id: Optional[int]
+
+
+class IngredientShortfall(BaseModel):
+    """
+    Pydantic model representing a quantity of an ingredient the pantry lacked.
+
+    Attributes:
+        ingredient_id (int): The ID of the ingredient.
+        quantity (float): The missing quantity, in the unit of the recipe.
+        unit_id (Optional[int]): The unit of the recipe's ingredient line.
+    """
+    ingredient_id: int
+    quantity: float
+    unit_id: Optional[int]
+
+
+class CookResult(BaseModel):
+    """
+    Pydantic model representing the pantry changes made by cooking a recipe.
+
+    Attributes:
+        recipe_id (int): The ID of the recipe cooked.
+        group_id (int): The ID of the group that cooked it.
+        deductions (list[PantryDeduction]): The quantities taken from each pantry item.
+        shortfalls (list[IngredientShortfall]): The quantities the pantries lacked.
+    """
+    recipe_id: int
+    group_id: int
+    deductions: list[PantryDeduction]
+    shortfalls: list[IngredientShortfall]
@@ -2,6 +2,7 @@
 Pydantic models for the Recipe entity.
 """
 
+from typing import Optional
 from pydantic import BaseModel
 
 
@@ -31,4 +32,235 @@ class Recipe(BaseModel):
     total_calories: float
     group_id: int
     time_unit_id: int
-    
\ No newline at end of file
+
+
+class RecipeSearchResult(BaseModel):
+    """
+    Pydantic model representing a recipe matching a full-text search.
+
+    Attributes:
+        recipe_id (int): The unique identifier for the recipe.
+        title (str): The title of the recipe.
+        description (Optional[str]): A brief description of the recipe.
+        is_public (bool): A flag indicating whether the recipe is public.
+        group_id (Optional[int]): The ID of the group the recipe belongs to.
+        score (float): The relevance of the recipe for the search.
+    """
+    recipe_id: int
+    title: str
+    description: Optional[str]
+    is_public: bool
+    group_id: Optional[int]
+    score: float
+
+
+class RecipeSearchPage(BaseModel):
+    """
+    Pydantic model representing one page of search results.
+
+    Attributes:
+        items (list[RecipeSearchResult]): The results, most relevant first.
+        next_cursor (Optional[str]): The cursor of the next page, or None on the last page.
+    """
+    items: list[RecipeSearchResult]
+    next_cursor: Optional[str]
+
+
+class RecipeIngredientDetail(BaseModel):
+    """
+    Pydantic model representing an ingredient line of a recipe.
+
+    Attributes:
+        ingredient_id (int): The ID of the ingredient.
+        name (str): The name of the ingredient.
+        quantity (float): The quantity of the ingredient used.
+        calories_per_unit (Optional[float]): The calories per unit of the ingredient.
+        unit_id (Optional[int]): The ID of the unit of the quantity.
+        unit_name (Optional[str]): The name of the unit.
+        unit_abbreviation (Optional[str]): The abbreviation of the unit.
+    """
+    ingredient_id: int
+    name: str
+    quantity: float
+    calories_per_unit: Optional[float]
+    unit_id: Optional[int]
+    unit_name: Optional[str]
+    unit_abbreviation: Optional[str]
+
+
+class RecipeCategorySummary(BaseModel):
+    """
+    Pydantic model representing a category a recipe belongs to.
+
+    Attributes:
+        category_id (int): The ID of the category.
+        name (str): The name of the category.
+    """
+    category_id: int
+    name: str
+
+
+class RecipeDetail(BaseModel):
+    """
+    Pydantic model representing a recipe with its ingredients and categories.
+
+    Attributes:
+        recipe_id (int): The unique identifier for the recipe.
+        title (str): The title of the recipe.
+        description (Optional[str]): A brief description of the recipe.
+        instructions (Optional[str]): The step-by-step instructions for the recipe.
+        cooking_time (Optional[int]): The time it takes to cook the recipe.
+        difficulty (Optional[str]): The difficulty level of the recipe.
+        is_public (bool): A flag indicating whether the recipe is public.
+        total_calories (Optional[float]): The total number of calories in the recipe.
+        group_id (Optional[int]): The ID of the group the recipe belongs to.
+        ingredients (list[RecipeIngredientDetail]): The ingredients of the recipe.
+        categories (list[RecipeCategorySummary]): The categories of the recipe.
+    """
+    recipe_id: int
+    title: str
+    description: Optional[str]
+    instructions: Optional[str]
+    cooking_time: Optional[int]
+    difficulty: Optional[str]
+    is_public: bool
+    total_calories: Optional[float]
+    group_id: Optional[int]
+    ingredients: list[RecipeIngredientDetail]
+    categories: list[RecipeCategorySummary]
+
+
+class RecipeCalories(BaseModel):
+    """
+    Pydantic model representing the calorie total of a recipe.
+
+    Attributes:
+        recipe_id (int): The ID of the recipe.
+        total_calories (float): The total number of calories in the recipe.
+    """
+    recipe_id: int
+    total_calories: float
+
+
+class RecipeFilters(BaseModel):
+    """
+    Pydantic model representing the filters of a recipe listing.
+
+    Ranges include their minimum and exclude their maximum, like the facet buckets.
+
+    Attributes:
+        category_id (Optional[int]): Only list recipes in this category.
+        difficulty (Optional[str]): Only list recipes with this difficulty.
+        min_cooking_time (Optional[int]): The minimum cooking time.
+        max_cooking_time (Optional[int]): The cooking time recipes must be below.
+        min_calories (Optional[float]): The minimum total calories.
+        max_calories (Optional[float]): The total calories recipes must be below.
+        is_public (Optional[bool]): Only list recipes with this visibility.
+        group_id (Optional[int]): Only list recipes of this group.
+    """
+    category_id: Optional[int] = None
+    difficulty: Optional[str] = None
+    min_cooking_time: Optional[int] = None
+    max_cooking_time: Optional[int] = None
+    min_calories: Optional[float] = None
+    max_calories: Optional[float] = None
+    is_public: Optional[bool] = None
+    group_id: Optional[int] = None
+
+
+class RecipeSummary(BaseModel):
+    """
+    Pydantic model representing a recipe in a listing.
+
+    Attributes:
+        recipe_id (int): The unique identifier for the recipe.
+        title (str): The title of the recipe.
+        description (Optional[str]): A brief description of the recipe.
+        cooking_time (Optional[int]): The time it takes to cook the recipe.
+        difficulty (Optional[str]): The difficulty level of the recipe.
+        total_calories (Optional[float]): The total number of calories in the recipe.
+        is_public (bool): A flag indicating whether the recipe is public.
+        group_id (Optional[int]): The ID of the group the recipe belongs to.
+    """
+    recipe_id: int
+    title: str
+    description: Optional[str]
+    cooking_time: Optional[int]
+    difficulty: Optional[str]
+    total_calories: Optional[float]
+    is_public: bool
+    group_id: Optional[int]
+
+
+class CategoryFacet(BaseModel):
+    """
+    Pydantic model representing the number of matching recipes in a category.
+
+    Attributes:
+        category_id (int): The ID of the category.
+        name (str): The name of the category.
+        count (int): The number of matching recipes in the category.
+    """
+    category_id: int
+    name: str
+    count: int
+
+
+class ValueFacet(BaseModel):
+    """
+    Pydantic model representing the number of matching recipes with a value.
+
+    Attributes:
+        value (str): The value.
+        count (int): The number of matching recipes with the value.
+    """
+    value: str
+    count: int
+
+
+class RangeFacet(BaseModel):
+    """
+    Pydantic model representing the number of matching recipes in a range.
+
+    Attributes:
+        min (float): The lower bound of the range, included.
+        max (Optional[float]): The upper bound of the range, excluded; None if unbounded.
+        count (int): The number of matching recipes in the range.
+    """
+    min: float
+    max: Optional[float]
+    count: int
+
+
+class RecipeFacets(BaseModel):
+    """
+    Pydantic model representing the facet counts of a recipe listing.
+
+    The counts of each dimension apply every filter except the one on that
+    dimension, so they show how many recipes choosing another value would list.
+
+    Attributes:
+        categories (list[CategoryFacet]): The counts per category.
+        difficulty (list[ValueFacet]): The counts per difficulty.
+        cooking_time (list[RangeFacet]): The counts per cooking time range.
+        total_calories (list[RangeFacet]): The counts per calorie range.
+    """
+    categories: list[CategoryFacet]
+    difficulty: list[ValueFacet]
+    cooking_time: list[RangeFacet]
+    total_calories: list[RangeFacet]
+
+
+class RecipePage(BaseModel):
+    """
+    Pydantic model representing one page of a recipe listing.
+
+    Attributes:
+        items (list[RecipeSummary]): The recipes of the page, ordered by ID.
+        next_cursor (Optional[int]): The `after_id` to request the next page with,
+            or None when this is the last page.
+        facets (RecipeFacets): The facet counts of the whole listing.
+    """
+    items: list[RecipeSummary]
+    next_cursor: Optional[int]
+    facets: RecipeFacets
@@ -2,7 +2,8 @@
 Pydantic models for the RecipeIngredient entity.
 """
 
-from pydantic import BaseModel
+from typing import Optional
+from pydantic import BaseModel, Field
 
 
 class RecipeIngredient(BaseModel):
@@ -19,4 +20,15 @@ class RecipeIngredient(BaseModel):
     ingredient_id: int
     quantity: float
     unit_id: int
-    
\ No newline at end of file
+
+
+class RecipeIngredientQuantity(BaseModel):
+    """
+    Pydantic model representing the quantity of an ingredient line to set.
+
+    Attributes:
+        quantity (float): The quantity of the ingredient used.
+        unit_id (Optional[int]): The ID of the unit used to measure the quantity.
+    """
+    quantity: float = Field(..., gt=0)
+    unit_id: Optional[int] = None
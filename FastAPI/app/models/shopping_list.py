@@ -3,6 +3,7 @@ Pydantic models for the ShoppingList entity.
 """
 
 from datetime import datetime  # Use datetime.datetime or datetime.date depending on usage
+from typing import Optional
 from pydantic import BaseModel
 
 
@@ -20,4 +21,36 @@ class ShoppingList(BaseModel):
     group_id: int
     created_date: datetime
     is_purchased: bool
-    
\ No newline at end of file
+
+
+class ShoppingListLine(BaseModel):
+    """
+    Pydantic model representing a quantity of an ingredient on a shopping list.
+
+    Attributes:
+        ingredient_id (int): The ID of the ingredient.
+        quantity (float): The quantity to buy.
+        unit_id (Optional[int]): The unit of the quantity.
+    """
+    ingredient_id: int
+    quantity: float
+    unit_id: Optional[int]
+
+
+class MenuShoppingList(BaseModel):
+    """
+    Pydantic model representing a shopping list generated from a menu.
+
+    Attributes:
+        list_id (int): The unique identifier for the shopping list.
+        group_id (Optional[int]): The ID of the group the shopping list is associated with.
+        menu_id (int): The ID of the menu the list was generated from.
+        items (list[ShoppingListLine]): What to buy, one line per ingredient.
+        unconvertible (list[ShoppingListLine]): Needed quantities left off the list
+            because their unit cannot be converted to the unit of their ingredient's line.
+    """
+    list_id: int
+    group_id: Optional[int]
+    menu_id: int
+    items: list[ShoppingListLine]
+    unconvertible: list[ShoppingListLine]
@@ -2,7 +2,8 @@
 Pydantic models for the Unit entity.
 """
 
-from pydantic import BaseModel
+from typing import Optional
+from pydantic import BaseModel, Field
 
 
 class Unit(BaseModel):
@@ -17,4 +18,57 @@ class Unit(BaseModel):
     unit_id: int
     name: str
     abbreviation: str
-    
\ No newline at end of file
+
+
+class UnitConversionFactor(BaseModel):
+    """
+    Pydantic model representing the factor converting a quantity between two units.
+
+    Attributes:
+        from_unit_id (int): The ID of the unit converted from.
+        to_unit_id (int): The ID of the unit converted to.
+        factor (float): The number of `to` units in one `from` unit.
+        ingredient_id (Optional[int]): The ingredient the factor applies to, e.g. a
+            density linking a volume to a mass; None for a general conversion.
+    """
+    from_unit_id: int
+    to_unit_id: int
+    factor: float = Field(..., gt=0)
+    ingredient_id: Optional[int] = None
+
+
+class QuantityConversion(BaseModel):
+    """
+    Pydantic model representing a quantity to convert to another unit.
+
+    Attributes:
+        quantity (float): The quantity to convert.
+        from_unit_id (int): The ID of the unit of the quantity.
+        to_unit_id (int): The ID of the unit to convert to.
+        ingredient_id (Optional[int]): The ingredient measured, to use its own factors.
+    """
+    quantity: float
+    from_unit_id: int
+    to_unit_id: int
+    ingredient_id: Optional[int] = None
+
+
+class UnitConversionBatch(BaseModel):
+    """
+    Pydantic model representing a batch of quantities to convert.
+
+    Attributes:
+        items (list[QuantityConversion]): The quantities to convert.
+    """
+    items: list[QuantityConversion] = Field(..., max_length=10000)
+
+
+class UnitConversionResult(BaseModel):
+    """
+    Pydantic model representing converted quantities.
+
+    Attributes:
+        quantities (list[Optional[float]]): The converted quantities, in the order
+            of the request; None where the units are not connected.
+    """
+    quantities: list[Optional[float]]
@@ -1,5 +1,6 @@
 from typing import Optional
 from pydantic import BaseModel, EmailStr, Field
+from typing_extensions import TypedDict
 
 class User(BaseModel):
     """
@@ -13,3 +14,88 @@ class User(BaseModel):
     profile_picture: Optional[str]
     creation_date: str
     update_date: str
+
+
+class UserPublic(BaseModel):
+    """
+    Pydantic model representing a user as returned to clients, without the password hash.
+    """
+    id: int
+    username: str
+    email: str
+    phone_number: str
+    profile_picture: Optional[str]
+    creation_date: str
+    update_date: str
+
+
+class UserLogin(BaseModel):
+    """
+    Pydantic model representing the credentials submitted to log in.
+
+    Attributes:
+        username (str): The username of the user.
+        password (str): The plain-text password.
+    """
+    username: str
+    password: str
+
+
+class UserPage(BaseModel):
+    """
+    Pydantic model representing one page of users.
+
+    Attributes:
+        items (list[UserPublic]): The users of the page, ordered by ID.
+        next_cursor (Optional[int]): The `after_id` to request the next page with,
+            or None when this is the last page.
+    """
+    items: list[UserPublic]
+    next_cursor: Optional[int]
+
+
+class UserRow(TypedDict):
+    """
+    A user row as returned by `.dicts()`, serialized like `UserPublic` by the fast response path.
+    """
+    id: int
+    username: str
+    email: str
+    phone_number: str
+    profile_picture: Optional[str]
+    creation_date: str
+    update_date: str
+
+
+class UserPageRows(TypedDict):
+    """
+    One page of user rows, serialized like `UserPage` by the fast response path.
+    """
+    items: list[UserRow]
+    next_cursor: Optional[int]
+
+
+class BulkUserFailure(BaseModel):
+    """
+    Pydantic model representing a row of a bulk user creation that was rejected.
+
+    Attributes:
+        index (int): The position of the row in the request, starting at 0.
+        username (Optional[str]): The username of the row, when it could be read.
+        error (str): Why the row was rejected.
+    """
+    index: int
+    username: Optional[str]
+    error: str
+
+
+class BulkUserResult(BaseModel):
+    """
+    Pydantic model representing the outcome of a bulk user creation.
+
+    Attributes:
+        created (int): The number of users created.
+        failed (list[BulkUserFailure]): The rows that were rejected.
+    """
+    created: int
+    failed: list[BulkUserFailure]
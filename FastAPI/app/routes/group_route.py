@@ -0,0 +1,88 @@
+"""
+group_route.py
+This module defines the routes for group membership management in the FastAPI application.
+"""
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from models.group_member import GroupMember, GroupMemberRole
+from services.group_service import GroupService, has_role
+from helpers.db_executor import run_in_db_executor
+from helpers.group_auth import get_current_user_id, require_group_role
+
+group_router = APIRouter()
+
+
+@group_router.get("/group/{id_group}/members", response_model=list[GroupMember])
+async def get_group_members(id_group: int, _role: str = Depends(require_group_role("viewer"))):
+    """
+    List the members of a group. Requires being a member.
+
+    Args:
+        id_group (int): The unique ID of the group.
+
+    Returns:
+        list[GroupMember]: The members with their role.
+    """
+    return await run_in_db_executor(GroupService.get_members, id_group)
+
+
+@group_router.put("/group/{id_group}/members/{id_user}", response_model=GroupMember)
+async def set_group_member(
+    id_group: int,
+    id_user: int,
+    member: GroupMemberRole,
+    role: str = Depends(require_group_role("admin")),
+):
+    """
+    Add a user to a group or change their role. Requires the admin role; only owners manage owners.
+
+    Args:
+        id_group (int): The unique ID of the group.
+        id_user (int): The unique ID of the user.
+        member (GroupMemberRole): The role to give the user.
+
+    Returns:
+        GroupMember: The membership.
+
+    Raises:
+        HTTPException: If an admin manages an owner (403), or the group or user is not found (404).
+    """
+    if role != "owner":
+        current = await run_in_db_executor(GroupService.get_member_role, id_group, id_user)
+        if "owner" in (member.role, current):
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN,
+                                detail="Only owners can manage owners")
+    try:
+        return await run_in_db_executor(GroupService.set_member, id_group, id_user, member.role)
+    except ValueError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
+
+
+@group_router.delete("/group/{id_group}/members/{id_user}", status_code=status.HTTP_200_OK)
+async def remove_group_member(
+    id_group: int,
+    id_user: int,
+    role: str = Depends(require_group_role("viewer")),
+    id_caller: int = Depends(get_current_user_id),
+):
+    """
+    Remove a user from a group. Members can leave; removing others requires the admin role.
+
+    Args:
+        id_group (int): The unique ID of the group.
+        id_user (int): The unique ID of the user.
+
+    Raises:
+        HTTPException: If the caller may not remove the user (403), or the user is not a
+            member (404).
+    """
+    if id_user != id_caller:
+        current = await run_in_db_executor(GroupService.get_member_role, id_group, id_user)
+        if not has_role(role, "admin") or (current == "owner" and role != "owner"):
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN,
+                                detail="Not allowed to remove this member")
+    try:
+        await run_in_db_executor(GroupService.remove_member, id_group, id_user)
+    except ValueError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
+    return {"message": f"User with ID {id_user} was removed from group {id_group}."}
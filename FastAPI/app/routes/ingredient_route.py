@@ -0,0 +1,142 @@
+"""
+ingredient_route.py
+This module defines the routes for ingredient management in the FastAPI application.
+"""
+
+from fastapi import APIRouter, HTTPException, Query
+from models.ingredient import (
+    CalorieRecomputeResult,
+    IngredientCalories,
+    IngredientCreate,
+    IngredientMatch,
+    IngredientSuggestion,
+    IngredientSummary,
+    NutritionSyncRequest,
+    NutritionSyncResult,
+)
+from services.calorie_service import CalorieService
+from services.nutrition_service import NutritionService
+from services.ingredient_service import (
+    INGREDIENT_MATCH_THRESHOLD,
+    MAX_SUGGESTIONS,
+    IngredientService,
+    SimilarIngredientsError,
+)
+from helpers.db_executor import run_in_db_executor
+from helpers.nutrition_client import NutritionAPIError
+
+ingredient_router = APIRouter()
+
+DEFAULT_SUGGESTIONS = 10
+
+
+@ingredient_router.get("/suggest", response_model=list[IngredientSuggestion])
+async def suggest_ingredients(
+    q: str = Query(..., min_length=1, max_length=255, description="The text typed so far."),
+    limit: int = Query(DEFAULT_SUGGESTIONS, ge=1, le=MAX_SUGGESTIONS),
+):
+    """
+    Suggest ingredients with a word starting with the typed text, most used first.
+
+    Answered from memory, so it is cheap enough to call on every keystroke.
+
+    Args:
+        q (str): The text typed so far.
+        limit (int): The maximum number of suggestions.
+
+    Returns:
+        list[IngredientSuggestion]: The suggested ingredients.
+    """
+    return IngredientService.suggest_ingredients(q, limit)
+
+
+@ingredient_router.get("/match", response_model=list[IngredientMatch])
+async def match_ingredients(
+    q: str = Query(..., min_length=1, max_length=255, description="The possibly misspelled name."),
+    threshold: float = Query(INGREDIENT_MATCH_THRESHOLD, gt=0, le=1,
+                             description="The minimum similarity."),
+    limit: int = Query(DEFAULT_SUGGESTIONS, ge=1, le=MAX_SUGGESTIONS),
+):
+    """
+    Find the ingredients whose name is similar to the given one, tolerating typos.
+
+    Args:
+        q (str): The name to match.
+        threshold (float): The minimum trigram similarity, between 0 and 1.
+        limit (int): The maximum number of matches.
+
+    Returns:
+        list[IngredientMatch]: The matching ingredients, most similar first.
+    """
+    return IngredientService.match_ingredients(q, threshold, limit)
+
+
+@ingredient_router.post("/ingredient", response_model=IngredientSummary, status_code=201)
+async def create_ingredient(
+    ingredient: IngredientCreate,
+    allow_similar: bool = Query(
+        False, description="Create the ingredient even if similar ones exist."),
+):
+    """
+    Create a new ingredient, unless ingredients with a similar name already exist.
+
+    Args:
+        ingredient (IngredientCreate): The name and calories of the ingredient.
+        allow_similar (bool): Create the ingredient even if similar ones exist.
+
+    Returns:
+        IngredientSummary: The created ingredient.
+
+    Raises:
+        HTTPException: If ingredients with a similar name exist (409); the detail lists them.
+    """
+    try:
+        return await run_in_db_executor(IngredientService.create_ingredient, ingredient.name,
+                                        ingredient.calories_per_unit, allow_similar)
+    except SimilarIngredientsError as exc:
+        raise HTTPException(status_code=409,
+                            detail={"message": str(exc), "matches": exc.matches}) from exc
+
+
+@ingredient_router.put("/ingredient/{id_ingredient}/calories",
+                       response_model=CalorieRecomputeResult)
+async def set_ingredient_calories(id_ingredient: int, correction: IngredientCalories):
+    """
+    Correct the calories of an ingredient and recompute the recipes and menus using it.
+
+    Args:
+        id_ingredient (int): The unique ID of the ingredient.
+        correction (IngredientCalories): The corrected calories per unit.
+
+    Returns:
+        CalorieRecomputeResult: The number of recipes and menus recomputed.
+
+    Raises:
+        HTTPException: If the ingredient is not found (404).
+    """
+    try:
+        return await run_in_db_executor(CalorieService.set_ingredient_calories, id_ingredient,
+                                        correction.calories_per_unit)
+    except ValueError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
+
+
+@ingredient_router.post("/calories/sync", response_model=NutritionSyncResult)
+async def sync_ingredient_calories(request: NutritionSyncRequest):
+    """
+    Fill ingredient calories from the external nutrition API and recompute the recipes and
+    menus using them.
+
+    Args:
+        request (NutritionSyncRequest): The ingredients to fill.
+
+    Returns:
+        NutritionSyncResult: The number of ingredients, recipes and menus updated.
+
+    Raises:
+        HTTPException: If the nutrition API cannot answer (502).
+    """
+    try:
+        return await NutritionService.sync_calories(request.ingredient_ids, request.only_missing)
+    except NutritionAPIError as exc:
+        raise HTTPException(status_code=502, detail=str(exc)) from exc
@@ -0,0 +1,58 @@
+"""
+menu_route.py
+This module defines the routes for menu management in the FastAPI application.
+"""
+
+from fastapi import APIRouter, HTTPException
+from models.menu import MenuCalories
+from models.menu_recipe import MenuRecipeSchedule
+from services.calorie_service import CalorieService
+from helpers.db_executor import run_in_db_executor
+
+menu_router = APIRouter()
+
+
+@menu_router.put("/menu/{id_menu}/recipes/{id_recipe}", response_model=MenuCalories)
+async def set_menu_recipe(id_menu: int, id_recipe: int, schedule: MenuRecipeSchedule):
+    """
+    Add a recipe to a menu or change when it is planned, updating the menu calorie total.
+
+    Args:
+        id_menu (int): The unique ID of the menu.
+        id_recipe (int): The unique ID of the recipe.
+        schedule (MenuRecipeSchedule): When the recipe is planned.
+
+    Returns:
+        MenuCalories: The new calorie total of the menu.
+
+    Raises:
+        HTTPException: If the menu or the recipe is not found (404).
+    """
+    try:
+        total = await run_in_db_executor(CalorieService.set_menu_recipe, id_menu, id_recipe,
+                                         schedule.date)
+    except ValueError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
+    return {"menu_id": id_menu, "total_calories": total}
+
+
+@menu_router.delete("/menu/{id_menu}/recipes/{id_recipe}", response_model=MenuCalories)
+async def remove_menu_recipe(id_menu: int, id_recipe: int):
+    """
+    Remove a recipe from a menu, updating the menu calorie total.
+
+    Args:
+        id_menu (int): The unique ID of the menu.
+        id_recipe (int): The unique ID of the recipe.
+
+    Returns:
+        MenuCalories: The new calorie total of the menu.
+
+    Raises:
+        HTTPException: If the menu does not contain the recipe (404).
+    """
+    try:
+        total = await run_in_db_executor(CalorieService.remove_menu_recipe, id_menu, id_recipe)
+    except ValueError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
+    return {"menu_id": id_menu, "total_calories": total}
@@ -0,0 +1,21 @@
+"""
+metrics_route.py
+This module defines the Prometheus scrape endpoint of the FastAPI application.
+"""
+
+from fastapi import APIRouter
+from fastapi.responses import Response
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+
+metrics_router = APIRouter()
+
+
+@metrics_router.get("/metrics", include_in_schema=False)
+async def get_metrics():
+    """
+    Expose the application metrics in the Prometheus text format.
+
+    Returns:
+        Response: The metrics of the latest scrape.
+    """
+    return Response(content=generate_latest(), media_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,44 @@
+"""
+monitoring_route.py
+This module defines the routes exposing runtime statistics of the FastAPI application.
+"""
+
+from fastapi import APIRouter
+from config.database import database
+from helpers.api_key_auth import api_key_registry
+from helpers.cache import cache_stats
+
+monitoring_router = APIRouter()
+
+
+@monitoring_router.get("/database-pool")
+async def get_database_pool_stats():
+    """
+    Retrieve statistics of the database connection pool.
+
+    Returns:
+        dict: Connections in use and idle, the pool limits and checkout wait times.
+    """
+    return database.pool_stats()
+
+
+@monitoring_router.get("/caches")
+async def get_cache_stats():
+    """
+    Retrieve the counters of the application caches.
+
+    Returns:
+        dict: Hits, misses, evictions and invalidations of each cache.
+    """
+    return cache_stats()
+
+
+@monitoring_router.get("/api-keys")
+async def get_api_key_usage():
+    """
+    Retrieve the usage counters of the API keys.
+
+    Returns:
+        dict: Allowed and throttled requests and the limits of each key.
+    """
+    return api_key_registry.usage()
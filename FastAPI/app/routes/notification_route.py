@@ -0,0 +1,135 @@
+"""
+notification_route.py
+This module defines the routes for group notifications in the FastAPI application.
+"""
+
+import asyncio
+import json
+import os
+from collections import deque
+from typing import Optional
+from dotenv import load_dotenv
+from fastapi import APIRouter, Header, Query
+from fastapi.responses import StreamingResponse
+from config.database import database
+from models.notification import NotificationPage
+from services.notification_service import NotificationService
+from helpers.db_executor import run_in_db_executor
+from helpers.notification_broker import notification_hub
+
+# Load environment variables
+load_dotenv()
+
+# Seconds between two keep-alive comments on an idle stream
+NOTIFICATION_HEARTBEAT_INTERVAL = float(os.getenv("NOTIFICATION_HEARTBEAT_INTERVAL", "15"))
+# IDs a stream remembers having sent, to drop the live copies of caught-up notifications
+NOTIFICATION_SEEN_IDS = int(os.getenv("NOTIFICATION_SEEN_IDS", "1000"))
+
+notification_router = APIRouter()
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+@notification_router.get("/group/{id_group}", response_model=NotificationPage)
+async def get_group_notifications(
+    id_group: int,
+    after_id: Optional[int] = Query(
+        None, description="Return notifications with an ID greater than this cursor."),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+):
+    """
+    Retrieve one page of a group's notifications, oldest first.
+
+    Args:
+        id_group (int): The unique ID of the group.
+        after_id (Optional[int]): The `next_cursor` of the previous page, or the
+            ID of the last notification received.
+        limit (int): The maximum number of notifications to return.
+
+    Returns:
+        NotificationPage: The notifications of the page and the cursor of the next one.
+    """
+    items, next_cursor = await run_in_db_executor(NotificationService.get_group_notifications,
+                                                  id_group, after_id, limit)
+    return {"items": items, "next_cursor": next_cursor}
+
+
+def _get_missed_notifications(id_group: int, after_id: int) -> tuple[list[dict], Optional[int]]:
+    """
+    Get a page of missed notifications without keeping a connection.
+
+    A stream stays open for as long as its client listens, so its connection
+    is given back to the pool after each query instead of at the end of the request.
+    """
+    with database.connection_context():
+        return NotificationService.get_group_notifications(id_group, after_id, MAX_PAGE_SIZE)
+
+
+def _event(notification: dict) -> str:
+    """Format a notification as a server-sent event."""
+    return (f"id: {notification['notification_id']}\nevent: notification\n"
+            f"data: {json.dumps(notification)}\n\n")
+
+
+@notification_router.get("/group/{id_group}/stream")
+async def stream_group_notifications(
+    id_group: int,
+    last_event_id: Optional[int] = Header(
+        None, description="The ID of the last notification received."),
+):
+    """
+    Push a group's new notifications as server-sent events.
+
+    Notifications are delivered as they are created instead of being polled
+    for. A client reconnecting with the `Last-Event-ID` header first receives
+    what it missed; a client that falls too far behind is disconnected and
+    catches up the same way when it reconnects.
+
+    Args:
+        id_group (int): The unique ID of the group.
+        last_event_id (Optional[int]): The ID of the last notification received.
+
+    Returns:
+        StreamingResponse: The `text/event-stream` of notifications.
+    """
+    async def events():
+        # Subscribe before catching up so nothing created in between is lost
+        queue = notification_hub.subscribe(id_group)
+        # IDs are not committed in order when several workers create notifications,
+        # so live ones are deduplicated by ID rather than compared with the last sent.
+        seen, seen_order = set(), deque()
+
+        def first_sight(id_notification: int) -> bool:
+            if id_notification in seen:
+                return False
+            seen.add(id_notification)
+            seen_order.append(id_notification)
+            if len(seen_order) > NOTIFICATION_SEEN_IDS:
+                seen.discard(seen_order.popleft())
+            return True
+
+        try:
+            after_id = last_event_id
+            while after_id is not None:
+                missed, after_id = await run_in_db_executor(_get_missed_notifications, id_group,
+                                                            after_id)
+                for notification in missed:
+                    if first_sight(notification["notification_id"]):
+                        yield _event(notification)
+            while True:
+                try:
+                    notification = await asyncio.wait_for(queue.get(),
+                                                          NOTIFICATION_HEARTBEAT_INTERVAL)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                if notification is None:
+                    return
+                if first_sight(notification["notification_id"]):
+                    yield _event(notification)
+        finally:
+            notification_hub.unsubscribe(id_group, queue)
+
+    return StreamingResponse(events(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
@@ -0,0 +1,57 @@
+"""
+pantry_route.py
+This module defines the routes for pantry management in the FastAPI application.
+"""
+
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Query
+from models.pantry import CookResult, RecipeSuggestion
+from services.pantry_service import PantryService
+from helpers.db_executor import run_in_db_executor
+
+pantry_router = APIRouter()
+
+DEFAULT_SUGGESTIONS = 20
+MAX_SUGGESTIONS = 100
+
+
+@pantry_router.get("/group/{id_group}/suggestions", response_model=list[RecipeSuggestion])
+async def suggest_recipes(
+    id_group: int,
+    max_missing: Optional[int] = Query(None, ge=0,
+                                       description="Maximum number of missing ingredients."),
+    limit: int = Query(DEFAULT_SUGGESTIONS, ge=1, le=MAX_SUGGESTIONS),
+):
+    """
+    Suggest the recipes a group can cook from its pantry, best covered first.
+
+    Args:
+        id_group (int): The unique ID of the group.
+        max_missing (Optional[int]): Only suggest recipes missing at most this many ingredients.
+        limit (int): The maximum number of suggestions.
+
+    Returns:
+        list[RecipeSuggestion]: The recipes with their coverage and missing ingredients.
+    """
+    return await run_in_db_executor(PantryService.suggest_recipes, id_group, max_missing, limit)
+
+
+@pantry_router.post("/group/{id_group}/cook/{id_recipe}", response_model=CookResult)
+async def cook_recipe(id_group: int, id_recipe: int):
+    """
+    Deduct the ingredients of a cooked recipe from the group's pantries, earliest expiry first.
+
+    Args:
+        id_group (int): The unique ID of the group.
+        id_recipe (int): The unique ID of the recipe.
+
+    Returns:
+        CookResult: The quantities deducted and the quantities that were missing.
+
+    Raises:
+        HTTPException: If the recipe is not found (404).
+    """
+    try:
+        return await run_in_db_executor(PantryService.cook_recipe, id_group, id_recipe)
+    except ValueError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
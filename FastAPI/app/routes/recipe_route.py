@@ -0,0 +1,147 @@
+"""
+recipe_route.py
+This module defines the routes for recipe management in the FastAPI application.
+"""
+
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from models.recipe import RecipeCalories, RecipeDetail, RecipeFilters, RecipePage, RecipeSearchPage
+from models.recipie_ingredient import RecipeIngredientQuantity
+from services.calorie_service import CalorieService
+from services.recipe_service import RecipeService
+from helpers.db_executor import run_in_db_executor
+from helpers.pagination import decode_cursor, encode_cursor
+
+recipe_router = APIRouter()
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+@recipe_router.get("/recipes", response_model=RecipePage)
+async def get_recipes(
+    filters: RecipeFilters = Depends(),
+    after_id: Optional[int] = Query(
+        None, description="Return recipes with an ID greater than this cursor."),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+):
+    """
+    Retrieve one page of recipes matching the filters, with the facet counts of the listing.
+
+    Args:
+        filters (RecipeFilters): Category, difficulty, cooking time, calorie and visibility filters.
+        after_id (Optional[int]): The `next_cursor` of the previous page.
+        limit (int): The maximum number of recipes to return.
+
+    Returns:
+        RecipePage: The recipes of the page, the cursor of the next one and the facet counts.
+    """
+    recipes, next_cursor = await run_in_db_executor(RecipeService.get_recipes_page, filters,
+                                                    after_id, limit)
+    facets = await run_in_db_executor(RecipeService.get_facets, filters)
+    return {"items": recipes, "next_cursor": next_cursor, "facets": facets}
+
+
+@recipe_router.get("/search", response_model=RecipeSearchPage)
+async def search_recipes(
+    q: str = Query(..., min_length=1, max_length=255, description="Words to search for."),
+    is_public: Optional[bool] = Query(None),
+    group_id: Optional[int] = Query(None),
+    cursor: Optional[str] = Query(None, description="The next_cursor of the previous page."),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+):
+    """
+    Search recipes by title, description and instructions, most relevant first.
+
+    Args:
+        q (str): The words to search for.
+        is_public (Optional[bool]): Only return recipes with this visibility.
+        group_id (Optional[int]): Only return recipes of this group.
+        cursor (Optional[str]): The `next_cursor` of the previous page.
+        limit (int): The maximum number of results.
+
+    Returns:
+        RecipeSearchPage: The matching recipes and the cursor of the next page.
+
+    Raises:
+        HTTPException: If the cursor is malformed (400).
+    """
+    after = None
+    if cursor is not None:
+        try:
+            rank, id_recipe = decode_cursor(cursor, 2)
+            after = (int(rank), int(id_recipe))
+        except (ValueError, TypeError) as exc:
+            raise HTTPException(status_code=400, detail="Invalid cursor.") from exc
+
+    items, next_key = await run_in_db_executor(RecipeService.search_recipes, q, is_public,
+                                               group_id, after, limit)
+    return {"items": items, "next_cursor": encode_cursor(*next_key) if next_key else None}
+
+
+@recipe_router.get("/recipe/{id_recipe}", response_model=RecipeDetail)
+async def get_recipe_detail(id_recipe: int):
+    """
+    Retrieve a recipe with its ingredients, their units and its categories.
+
+    Args:
+        id_recipe (int): The unique ID of the recipe.
+
+    Returns:
+        RecipeDetail: The recipe and its related data.
+
+    Raises:
+        HTTPException: If the recipe is not found (404).
+    """
+    try:
+        return await run_in_db_executor(RecipeService.get_recipe_detail, id_recipe)
+    except ValueError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
+
+
+@recipe_router.put("/recipe/{id_recipe}/ingredients/{id_ingredient}", response_model=RecipeCalories)
+async def set_recipe_ingredient(id_recipe: int, id_ingredient: int, line: RecipeIngredientQuantity):
+    """
+    Add an ingredient to a recipe or change its quantity, updating the calorie totals.
+
+    Args:
+        id_recipe (int): The unique ID of the recipe.
+        id_ingredient (int): The unique ID of the ingredient.
+        line (RecipeIngredientQuantity): The quantity and unit of the ingredient.
+
+    Returns:
+        RecipeCalories: The new calorie total of the recipe.
+
+    Raises:
+        HTTPException: If the recipe or the ingredient is not found (404).
+    """
+    try:
+        total = await run_in_db_executor(CalorieService.set_recipe_ingredient, id_recipe,
+                                         id_ingredient, line.quantity, line.unit_id)
+    except ValueError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
+    return {"recipe_id": id_recipe, "total_calories": total}
+
+
+@recipe_router.delete("/recipe/{id_recipe}/ingredients/{id_ingredient}",
+                      response_model=RecipeCalories)
+async def remove_recipe_ingredient(id_recipe: int, id_ingredient: int):
+    """
+    Remove an ingredient from a recipe, updating the calorie totals.
+
+    Args:
+        id_recipe (int): The unique ID of the recipe.
+        id_ingredient (int): The unique ID of the ingredient.
+
+    Returns:
+        RecipeCalories: The new calorie total of the recipe.
+
+    Raises:
+        HTTPException: If the recipe does not use the ingredient (404).
+    """
+    try:
+        total = await run_in_db_executor(CalorieService.remove_recipe_ingredient, id_recipe,
+                                         id_ingredient)
+    except ValueError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
+    return {"recipe_id": id_recipe, "total_calories": total}
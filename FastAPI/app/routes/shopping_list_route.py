@@ -0,0 +1,32 @@
+"""
+shopping_list_route.py
+This module defines the routes for shopping list management in the FastAPI application.
+"""
+
+from fastapi import APIRouter, HTTPException, status
+from models.shopping_list import MenuShoppingList
+from services.shopping_list_service import ShoppingListService
+from helpers.db_executor import run_in_db_executor
+
+shopping_list_router = APIRouter()
+
+
+@shopping_list_router.post("/menu/{id_menu}", response_model=MenuShoppingList,
+                           status_code=status.HTTP_201_CREATED)
+async def create_shopping_list_from_menu(id_menu: int):
+    """
+    Create the shopping list of a menu: what its recipes need beyond the group's pantry.
+
+    Args:
+        id_menu (int): The unique ID of the menu.
+
+    Returns:
+        MenuShoppingList: The new shopping list and its items.
+
+    Raises:
+        HTTPException: If the menu is not found (404).
+    """
+    try:
+        return await run_in_db_executor(ShoppingListService.create_from_menu, id_menu)
+    except ValueError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
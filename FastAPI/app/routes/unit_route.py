@@ -0,0 +1,56 @@
+"""
+unit_route.py
+This module defines the routes for unit conversion in the FastAPI application.
+"""
+
+import math
+from fastapi import APIRouter, HTTPException
+from models.unit import UnitConversionBatch, UnitConversionFactor, UnitConversionResult
+from services.unit_service import UnitService
+from helpers.db_executor import run_in_db_executor
+
+unit_router = APIRouter()
+
+
+@unit_router.put("/conversion", response_model=UnitConversionFactor)
+async def set_conversion(conversion: UnitConversionFactor):
+    """
+    Store the factor converting one unit to another, optionally for one ingredient.
+
+    Args:
+        conversion (UnitConversionFactor): The units, factor and ingredient.
+
+    Returns:
+        UnitConversionFactor: The stored conversion.
+
+    Raises:
+        HTTPException: If a unit or the ingredient does not exist, or both units are the same (400).
+    """
+    try:
+        await run_in_db_executor(UnitService.set_conversion, conversion.from_unit_id,
+                                 conversion.to_unit_id, conversion.factor, conversion.ingredient_id)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    return conversion
+
+
+@unit_router.post("/convert", response_model=UnitConversionResult)
+async def convert_quantities(batch: UnitConversionBatch):
+    """
+    Convert a batch of quantities to other units in one call.
+
+    Args:
+        batch (UnitConversionBatch): The quantities with their units and ingredients.
+
+    Returns:
+        UnitConversionResult: The converted quantities; None where the units are not connected.
+    """
+    items = batch.items
+    converted = await run_in_db_executor(
+        UnitService.convert,
+        [item.quantity for item in items],
+        [item.from_unit_id for item in items],
+        [item.to_unit_id for item in items],
+        [item.ingredient_id for item in items],
+    )
+    return {"quantities": [None if math.isnan(value) else value for value in converted.tolist()]}
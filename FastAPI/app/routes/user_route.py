@@ -3,14 +3,31 @@ user_route.py
 This module defines the routes for user management in the FastAPI application.
 """
 
-from fastapi import APIRouter, Body, HTTPException, status
-from models.user import User  # This should be the Pydantic model representing your input/output data
-from services.user_service import UserService
+import json
+from typing import Optional
+from fastapi import APIRouter, Body, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter, ValidationError
+from models.user import (BulkUserResult, User, UserLogin, UserPage, UserPageRows,
+                         UserPublic)
+from services.user_service import UserAlreadyExistsError, UserService
+from services.password_service import PasswordService
+from helpers.db_executor import iterate_in_db_executor, run_in_db_executor
+from helpers.serialization import PrecompiledJSONResponse
 
 user_router = APIRouter()
 
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+EXPORT_BATCH_SIZE = 500
+BULK_CHUNK_SIZE = 1000
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
 
-@user_router.post("/user", status_code=status.HTTP_201_CREATED)
+# Encodes user pages straight from `.dicts()` rows
+USER_PAGE_ADAPTER = TypeAdapter(UserPageRows)
+
+
+@user_router.post("/user", response_model=UserPublic, status_code=status.HTTP_201_CREATED)
 async def create_user(user: User = Body(...)):
     """
     Create a new user.
@@ -19,28 +36,172 @@ async def create_user(user: User = Body(...)):
         user (User): The user details from the request body.
 
     Returns:
-        User: The newly created user.
+        UserPublic: The newly created user.
 
     Raises:
         HTTPException: If a user with the same details already exists (400).
     """
+    user.password = await PasswordService.hash_password(user.password)
     try:
-        return UserService.create_user(user)
+        return await run_in_db_executor(UserService.create_user, user)
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
-    
-@user_router.get("/users", response_model=list[User])
-async def get_all_users():
+
+
+async def _iter_bulk_payload(request: Request):
+    """
+    Read the rows of a bulk request, either a JSON list or an NDJSON stream.
+
+    NDJSON bodies are parsed line by line as they are received, so the request
+    is never held in memory as a whole.
+
+    Yields:
+        tuple[int, Any]: The position of the row and its decoded JSON value, or
+        the `ValueError` raised while decoding it.
+    """
+    if request.headers.get("content-type", "").startswith(NDJSON_MEDIA_TYPE):
+        index = 0
+        buffer = b""
+        async for chunk in request.stream():
+            buffer += chunk
+            *lines, buffer = buffer.split(b"\n")
+            for line in lines:
+                if line.strip():
+                    try:
+                        yield index, json.loads(line)
+                    except ValueError as exc:
+                        yield index, exc
+                    index += 1
+        if buffer.strip():
+            try:
+                yield index, json.loads(buffer)
+            except ValueError as exc:
+                yield index, exc
+        return
+
+    try:
+        payload = await request.json()
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail="Request body is not valid JSON.") from exc
+    if not isinstance(payload, list):
+        raise HTTPException(status_code=400, detail="Request body must be a list of users.")
+    for index, row in enumerate(payload):
+        yield index, row
+
+
+async def _create_chunk(chunk: list[tuple[int, User]]) -> tuple[int, list[dict]]:
+    """Drop the duplicates of a chunk of users, then hash and insert the rest."""
+    pending, failures = await run_in_db_executor(UserService.filter_new_users, chunk)
+    if not pending:
+        return 0, failures
+    hashes = await PasswordService.hash_passwords([user.password for _, user in pending])
+    for (_, user), password_hash in zip(pending, hashes):
+        user.password = password_hash
+    created, insert_failures = await run_in_db_executor(UserService.create_users_chunk, pending)
+    return created, failures + insert_failures
+
+
+def _validation_message(exc: ValidationError) -> str:
+    """Flatten a Pydantic validation error into a single line."""
+    return "; ".join(
+        f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" for error in exc.errors()
+    )
+
+
+@user_router.post("/bulk", response_model=BulkUserResult)
+async def create_users_bulk(request: Request):
+    """
+    Create many users at once from a JSON list or an NDJSON stream.
+
+    Rows are validated as they are read and inserted in chunks of
+    `BULK_CHUNK_SIZE`, each in its own transaction. Invalid or duplicate rows
+    are reported without aborting the rest of the batch.
+
+    Args:
+        request (Request): The request whose body holds the users.
+
+    Returns:
+        BulkUserResult: The number of users created and the rejected rows.
+
+    Raises:
+        HTTPException: If a JSON body is malformed or not a list (400).
+    """
+    created = 0
+    failed = []
+    chunk = []
+    async for index, payload in _iter_bulk_payload(request):
+        if isinstance(payload, ValueError):
+            failed.append({"index": index, "username": None, "error": f"Invalid JSON: {payload}"})
+            continue
+        try:
+            chunk.append((index, User.model_validate(payload)))
+        except ValidationError as exc:
+            username = payload.get("username") if isinstance(payload, dict) else None
+            failed.append({"index": index,
+                           "username": username if isinstance(username, str) else None,
+                           "error": _validation_message(exc)})
+        if len(chunk) >= BULK_CHUNK_SIZE:
+            chunk_created, chunk_failed = await _create_chunk(chunk)
+            created += chunk_created
+            failed.extend(chunk_failed)
+            chunk = []
+    if chunk:
+        chunk_created, chunk_failed = await _create_chunk(chunk)
+        created += chunk_created
+        failed.extend(chunk_failed)
+    failed.sort(key=lambda failure: failure["index"])
+    return {"created": created, "failed": failed}
+
+
+@user_router.get("/users", response_model=UserPage)
+async def get_all_users(
+    after_id: Optional[int] = Query(
+        None, description="Return users with an ID greater than this cursor."),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+):
+    """
+    Retrieve one page of users, ordered by ID.
+
+    Args:
+        after_id (Optional[int]): The `next_cursor` of the previous page.
+        limit (int): The maximum number of users to return.
+
+    Returns:
+        UserPage: The users of the page and the cursor of the next one, encoded
+        from the rows by a precompiled adapter.
+    """
+    users, next_cursor = await run_in_db_executor(UserService.get_users_page, after_id, limit)
+    return PrecompiledJSONResponse({"items": users, "next_cursor": next_cursor}, USER_PAGE_ADAPTER)
+
+
+def _to_ndjson(rows):
+    """Group user rows into newline-delimited JSON chunks."""
+    batch = []
+    for row in rows:
+        batch.append(json.dumps(row, default=str))
+        if len(batch) >= EXPORT_BATCH_SIZE:
+            yield "\n".join(batch) + "\n"
+            batch = []
+    if batch:
+        yield "\n".join(batch) + "\n"
+
+
+@user_router.get("/users/export")
+async def export_users():
     """
-    Retrieve all users and return them as Pydantic models.
+    Stream every user, without their password hash, as newline-delimited JSON.
+
+    Rows are read through a server-side cursor and written as they arrive, so
+    memory use does not grow with the number of users.
 
     Returns:
-        list[User]: A list of all registered users.
+        StreamingResponse: One JSON user object per line.
     """
-    return UserService.get_all_users()
+    chunks = iterate_in_db_executor(_to_ndjson(UserService.iter_users()))
+    return StreamingResponse(chunks, media_type="application/x-ndjson")
 
 
-@user_router.get("/user/{id_user}", response_model=User)
+@user_router.get("/user/{id_user}", response_model=UserPublic)
 async def get_user_by_id(id_user: int):
     """
     Retrieve a user by their ID.
@@ -49,13 +210,13 @@ async def get_user_by_id(id_user: int):
         id_user (int): The unique ID of the user.
 
     Returns:
-        User: The user object with the specified ID.
+        UserPublic: The user object with the specified ID.
 
     Raises:
         HTTPException: If the user is not found (404).
     """
     try:
-        return UserService.get_user_by_id(id_user)
+        return await run_in_db_executor(UserService.get_user_by_id, id_user)
     except ValueError as exc:
         raise HTTPException(status_code=404, detail=str(exc)) from exc
 
@@ -73,12 +234,12 @@ async def delete_user(id_user: int):
     """
     try:
         # Try to delete the user
-        UserService.delete_user(id_user)
+        await run_in_db_executor(UserService.delete_user, id_user)
         return {"message": f"User with ID {id_user} was successfully deleted."}
     except ValueError as exc:
         raise HTTPException(status_code=404, detail=f"User with ID {id_user} not found.") from exc
 
-@user_router.put("/user/{id_user}", response_model=User)
+@user_router.put("/user/{id_user}", response_model=UserPublic)
 async def update_user(id_user: int, user: User = Body(...)):
     """
     Update the details of an existing user.
@@ -88,13 +249,49 @@ async def update_user(id_user: int, user: User = Body(...)):
         user (User): The updated user data.
 
     Returns:
-        User: The updated user object.
+        UserPublic: The updated user object.
 
     Raises:
+        HTTPException: If the username or email is already taken (400).
         HTTPException: If the user is not found (404).
     """
+    user.password = await PasswordService.hash_password(user.password)
     try:
-        return UserService.update_user(id_user, user)
+        return await run_in_db_executor(UserService.update_user, id_user, user)
+    except UserAlreadyExistsError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
     except ValueError as exc:
         raise HTTPException(status_code=404, detail=str(exc)) from exc
-    
\ No newline at end of file
+
+
+@user_router.post("/login", response_model=UserPublic)
+async def login(credentials: UserLogin = Body(...)):
+    """
+    Verify a username and password.
+
+    Verification runs on the password process pool. When the stored hash was
+    made with outdated cost parameters, it is transparently replaced.
+
+    Args:
+        credentials (UserLogin): The username and password to check.
+
+    Returns:
+        UserPublic: The authenticated user.
+
+    Raises:
+        HTTPException: If the username or password is wrong (401).
+    """
+    try:
+        user = await run_in_db_executor(UserService.get_user_by_username, credentials.username)
+    except ValueError as exc:
+        await PasswordService.verify_unknown_user(credentials.password)
+        raise HTTPException(status_code=401, detail="Invalid username or password.") from exc
+
+    matches, needs_rehash = await PasswordService.verify_password(user.password,
+                                                                  credentials.password)
+    if not matches:
+        raise HTTPException(status_code=401, detail="Invalid username or password.")
+    if needs_rehash:
+        user.password = await PasswordService.hash_password(credentials.password)
+        await run_in_db_executor(UserService.update_password_hash, user.id, user.password)
+    return user
@@ -0,0 +1,431 @@
+"""
+Module for calorie service class and methods keeping the stored recipe and
+menu calorie totals in sync with their ingredients.
+
+A recipe total is the sum of `quantity * calories_per_unit` over its
+ingredient lines, and a menu total is the sum of its recipe totals. Single
+changes apply the difference they make with one UPDATE per affected table;
+corrections that touch many rows recompute the totals with set-based UPDATEs
+over ranges of IDs.
+"""
+
+import datetime
+from decimal import Decimal
+from typing import Iterable, Optional
+from peewee import Case, DoesNotExist, fn
+from config.database import (
+    IngredientModel,
+    MenuModel,
+    MenuRecipeModel,
+    RecipeIngredientModel,
+    RecipeModel,
+    database,
+    lock_for_update,
+    write_transaction,
+)
+from services.ingredient_service import IngredientService
+from services.pantry_service import PantryService
+from services.recipe_service import RecipeService
+
+# IDs covered by each batch UPDATE of a recompute
+RECOMPUTE_CHUNK_SIZE = 1000
+
+
+def _calories(value) -> Decimal:
+    """Return a stored calorie or quantity value as a Decimal, treating NULL as zero."""
+    return Decimal(str(value)) if value is not None else Decimal(0)
+
+
+def _recipe_total_subquery():
+    """Return the correlated subquery computing the total of the recipe being updated."""
+    return (RecipeIngredientModel
+            .select(fn.COALESCE(fn.SUM(RecipeIngredientModel.quantity
+                                       * IngredientModel.calories_per_unit), 0))
+            .join(IngredientModel, on=(RecipeIngredientModel.ingredient == IngredientModel.id))
+            .where(RecipeIngredientModel.recipe == RecipeModel.id))
+
+
+def _menu_total_subquery():
+    """Return the correlated subquery computing the total of the menu being updated."""
+    return (MenuRecipeModel
+            .select(fn.COALESCE(fn.SUM(RecipeModel.total_calories), 0))
+            .join(RecipeModel, on=(MenuRecipeModel.recipe == RecipeModel.id))
+            .where(MenuRecipeModel.menu == MenuModel.id))
+
+
+def _id_chunks(ids: list[int], chunk_size: int) -> Iterable[list[int]]:
+    """Split a list of IDs into chunks of at most `chunk_size`."""
+    for start in range(0, len(ids), chunk_size):
+        yield ids[start:start + chunk_size]
+
+
+class CalorieService:
+    """
+    Service class keeping the recipe and menu calorie totals up to date.
+
+    Methods:
+        set_recipe_ingredient(id_recipe: int, id_ingredient: int, ...): Add or change an
+            ingredient line.
+        remove_recipe_ingredient(id_recipe: int, id_ingredient: int): Remove an ingredient line.
+        set_menu_recipe(id_menu: int, id_recipe: int, date): Add a recipe to a menu.
+        remove_menu_recipe(id_menu: int, id_recipe: int): Remove a recipe from a menu.
+        set_ingredient_calories(id_ingredient: int, calories_per_unit: float): Correct an
+            ingredient.
+        set_ingredients_calories(calories: dict[int, float]): Correct many ingredients at once.
+        recompute_recipes(ids: Optional[list]): Recompute recipe totals from their ingredients.
+        recompute_menus(ids: Optional[list]): Recompute menu totals from their recipes.
+
+    Raises:
+        ValueError: If a recipe, menu, ingredient or line does not exist.
+    """
+
+    @staticmethod
+    def _apply_recipe_delta(id_recipe: int, delta: Decimal) -> None:
+        """Add a calorie difference to a recipe and to every menu containing it."""
+        if not delta:
+            return
+        (RecipeModel
+         .update(total_calories=fn.COALESCE(RecipeModel.total_calories, 0) + delta)
+         .where(RecipeModel.id == id_recipe)
+         .execute())
+        menus = (MenuRecipeModel
+                 .select(MenuRecipeModel.menu)
+                 .where(MenuRecipeModel.recipe == id_recipe))
+        (MenuModel
+         .update(total_calories=fn.COALESCE(MenuModel.total_calories, 0) + delta)
+         .where(MenuModel.id.in_(menus))
+         .execute())
+
+    @staticmethod
+    def _lock_recipe(id_recipe: int) -> Decimal:
+        """
+        Lock a recipe row so concurrent changes of its total are serialized.
+
+        Recipes are always locked before the menus containing them, so
+        transactions touching both cannot deadlock.
+
+        Returns:
+            Decimal: The total of the recipe, read under the lock.
+        """
+        try:
+            query = (RecipeModel
+                     .select(RecipeModel.total_calories)
+                     .where(RecipeModel.id == id_recipe))
+            return _calories(lock_for_update(query).tuples().get()[0])
+        except DoesNotExist as exc:
+            raise ValueError("Recipe does not exist") from exc
+
+    @staticmethod
+    def _recipe_total(id_recipe: int) -> float:
+        """Return the stored total of a recipe."""
+        total = (RecipeModel
+                 .select(RecipeModel.total_calories)
+                 .where(RecipeModel.id == id_recipe)
+                 .scalar())
+        return float(total or 0)
+
+    @staticmethod
+    def _menu_total(id_menu: int) -> float:
+        """Return the stored total of a menu."""
+        total = MenuModel.select(MenuModel.total_calories).where(MenuModel.id == id_menu).scalar()
+        return float(total or 0)
+
+    @staticmethod
+    def set_recipe_ingredient(id_recipe: int, id_ingredient: int, quantity: float,
+                              id_unit: Optional[int]) -> float:
+        """
+        Add an ingredient line to a recipe, or change its quantity and unit.
+
+        Args:
+            id_recipe (int): The ID of the recipe.
+            id_ingredient (int): The ID of the ingredient.
+            quantity (float): The quantity of the ingredient.
+            id_unit (Optional[int]): The ID of the unit of the quantity.
+
+        Returns:
+            float: The new calorie total of the recipe.
+
+        Raises:
+            ValueError: If the recipe or the ingredient does not exist.
+        """
+        today = datetime.date.today()
+        new_quantity = _calories(quantity)
+        with write_transaction():
+            CalorieService._lock_recipe(id_recipe)
+            calories_per_unit = (IngredientModel
+                                 .select(IngredientModel.calories_per_unit)
+                                 .where(IngredientModel.id == id_ingredient)
+                                 .tuples()
+                                 .first())
+            if calories_per_unit is None:
+                raise ValueError("Ingredient does not exist")
+            old_quantity = (RecipeIngredientModel
+                            .select(RecipeIngredientModel.quantity)
+                            .where((RecipeIngredientModel.recipe == id_recipe)
+                                   & (RecipeIngredientModel.ingredient == id_ingredient))
+                            .scalar())
+            if old_quantity is None:
+                RecipeIngredientModel.insert(recipe=id_recipe, ingredient=id_ingredient,
+                                             quantity=new_quantity, unit=id_unit,
+                                             creation_date=today, update_date=today).execute()
+            else:
+                (RecipeIngredientModel
+                 .update(quantity=new_quantity, unit=id_unit, update_date=today)
+                 .where((RecipeIngredientModel.recipe == id_recipe)
+                        & (RecipeIngredientModel.ingredient == id_ingredient))
+                 .execute())
+            delta = (new_quantity - _calories(old_quantity)) * _calories(calories_per_unit[0])
+            CalorieService._apply_recipe_delta(id_recipe, delta)
+            total = CalorieService._recipe_total(id_recipe)
+        RecipeService.invalidate_facets()
+        PantryService.refresh_recipe(id_recipe)
+        if old_quantity is None:
+            IngredientService.record_usage(id_ingredient, 1)
+        return total
+
+    @staticmethod
+    def remove_recipe_ingredient(id_recipe: int, id_ingredient: int) -> float:
+        """
+        Remove an ingredient line from a recipe.
+
+        Args:
+            id_recipe (int): The ID of the recipe.
+            id_ingredient (int): The ID of the ingredient.
+
+        Returns:
+            float: The new calorie total of the recipe.
+
+        Raises:
+            ValueError: If the recipe does not exist or does not use the ingredient.
+        """
+        with write_transaction():
+            CalorieService._lock_recipe(id_recipe)
+            line = (RecipeIngredientModel
+                    .select(RecipeIngredientModel.quantity, IngredientModel.calories_per_unit)
+                    .join(IngredientModel,
+                          on=(RecipeIngredientModel.ingredient == IngredientModel.id))
+                    .where((RecipeIngredientModel.recipe == id_recipe)
+                           & (RecipeIngredientModel.ingredient == id_ingredient))
+                    .tuples()
+                    .first())
+            if line is None:
+                raise ValueError("Recipe ingredient does not exist")
+            (RecipeIngredientModel
+             .delete()
+             .where((RecipeIngredientModel.recipe == id_recipe)
+                    & (RecipeIngredientModel.ingredient == id_ingredient))
+             .execute())
+            CalorieService._apply_recipe_delta(id_recipe, -_calories(line[0]) * _calories(line[1]))
+            total = CalorieService._recipe_total(id_recipe)
+        RecipeService.invalidate_facets()
+        PantryService.refresh_recipe(id_recipe)
+        IngredientService.record_usage(id_ingredient, -1)
+        return total
+
+    @staticmethod
+    def set_menu_recipe(id_menu: int, id_recipe: int, date: Optional[datetime.datetime]) -> float:
+        """
+        Add a recipe to a menu, or change the date it is planned for.
+
+        The recipe is locked before the menu, as `set_recipe_ingredient` does,
+        so a concurrent change of its ingredients either commits first and is
+        read here, or waits and then also updates this menu.
+
+        Args:
+            id_menu (int): The ID of the menu.
+            id_recipe (int): The ID of the recipe.
+            date (Optional[datetime]): When the recipe is planned.
+
+        Returns:
+            float: The new calorie total of the menu.
+
+        Raises:
+            ValueError: If the menu or the recipe does not exist.
+        """
+        now = datetime.datetime.now()
+        with write_transaction():
+            recipe_total = CalorieService._lock_recipe(id_recipe)
+            try:
+                lock_for_update(MenuModel.select(MenuModel.id).where(MenuModel.id == id_menu)).get()
+            except DoesNotExist as exc:
+                raise ValueError("Menu does not exist") from exc
+            updated = (MenuRecipeModel
+                       .update(date=date, update_date=now)
+                       .where((MenuRecipeModel.menu == id_menu)
+                              & (MenuRecipeModel.recipe == id_recipe))
+                       .execute())
+            if not updated:
+                MenuRecipeModel.insert(menu=id_menu, recipe=id_recipe, date=date,
+                                       creation_date=now, update_date=now).execute()
+                (MenuModel
+                 .update(total_calories=fn.COALESCE(MenuModel.total_calories, 0) + recipe_total)
+                 .where(MenuModel.id == id_menu)
+                 .execute())
+            return CalorieService._menu_total(id_menu)
+
+    @staticmethod
+    def remove_menu_recipe(id_menu: int, id_recipe: int) -> float:
+        """
+        Remove a recipe from a menu.
+
+        The recipe is locked before the menu, as in `set_menu_recipe`.
+
+        Args:
+            id_menu (int): The ID of the menu.
+            id_recipe (int): The ID of the recipe.
+
+        Returns:
+            float: The new calorie total of the menu.
+
+        Raises:
+            ValueError: If the recipe does not exist or the menu does not contain it.
+        """
+        with write_transaction():
+            recipe_total = CalorieService._lock_recipe(id_recipe)
+            lock_for_update(MenuModel.select(MenuModel.id).where(MenuModel.id == id_menu)).first()
+            deleted = (MenuRecipeModel
+                       .delete()
+                       .where((MenuRecipeModel.menu == id_menu)
+                              & (MenuRecipeModel.recipe == id_recipe))
+                       .execute())
+            if not deleted:
+                raise ValueError("Menu recipe does not exist")
+            (MenuModel
+             .update(total_calories=fn.COALESCE(MenuModel.total_calories, 0) - recipe_total)
+             .where(MenuModel.id == id_menu)
+             .execute())
+            return CalorieService._menu_total(id_menu)
+
+    @staticmethod
+    def set_ingredient_calories(id_ingredient: int, calories_per_unit: float) -> dict:
+        """
+        Correct the calories of an ingredient and recompute every recipe and menu using it.
+
+        Args:
+            id_ingredient (int): The ID of the ingredient.
+            calories_per_unit (float): The corrected calories per unit.
+
+        Returns:
+            dict: The number of recipes and menus whose totals were recomputed.
+
+        Raises:
+            ValueError: If the ingredient does not exist.
+        """
+        with database.atomic():
+            updated = (IngredientModel
+                       .update(calories_per_unit=_calories(calories_per_unit),
+                               update_date=datetime.date.today())
+                       .where(IngredientModel.id == id_ingredient)
+                       .execute())
+            if not updated:
+                raise ValueError("Ingredient does not exist")
+        return CalorieService._recompute_ingredient_users([id_ingredient])
+
+    @staticmethod
+    def set_ingredients_calories(calories: dict[int, float],
+                                 chunk_size: int = RECOMPUTE_CHUNK_SIZE) -> dict:
+        """
+        Correct the calories of many ingredients, then recompute the recipes and menus using
+        them once.
+
+        Each chunk of ingredients is updated by one `CASE` UPDATE; unknown
+        ingredient IDs are ignored.
+
+        Args:
+            calories (dict[int, float]): The corrected calories per unit, by ingredient ID.
+            chunk_size (int): The number of ingredients covered by each UPDATE.
+
+        Returns:
+            dict: The number of recipes and menus whose totals were recomputed.
+        """
+        ids = sorted(calories)
+        today = datetime.date.today()
+        with database.atomic():
+            for chunk in _id_chunks(ids, chunk_size):
+                values = Case(IngredientModel.id,
+                              [(id_ingredient, _calories(calories[id_ingredient]))
+                               for id_ingredient in chunk])
+                (IngredientModel
+                 .update(calories_per_unit=values, update_date=today)
+                 .where(IngredientModel.id.in_(chunk))
+                 .execute())
+        return CalorieService._recompute_ingredient_users(ids)
+
+    @staticmethod
+    def _recompute_ingredient_users(ingredient_ids: list[int]) -> dict:
+        """Recompute the totals of the recipes using the ingredients, then of their menus."""
+        if not ingredient_ids:
+            return {"recipes_updated": 0, "menus_updated": 0}
+        recipe_ids = [row[0] for row in (RecipeIngredientModel
+                                         .select(RecipeIngredientModel.recipe)
+                                         .distinct()
+                                         .where(RecipeIngredientModel.ingredient
+                                                .in_(ingredient_ids))
+                                         .tuples())]
+        menu_ids = [row[0] for row in (MenuRecipeModel
+                                       .select(MenuRecipeModel.menu)
+                                       .distinct()
+                                       .where(MenuRecipeModel.recipe.in_(recipe_ids))
+                                       .tuples())] if recipe_ids else []
+        return {
+            "recipes_updated": CalorieService.recompute_recipes(recipe_ids),
+            "menus_updated": CalorieService.recompute_menus(menu_ids),
+        }
+
+    @staticmethod
+    def recompute_recipes(ids: Optional[list[int]] = None,
+                          chunk_size: int = RECOMPUTE_CHUNK_SIZE) -> int:
+        """
+        Recompute recipe totals from their ingredient lines with set-based UPDATEs.
+
+        Each chunk of IDs is updated by one statement in its own transaction,
+        so a recompute of the whole catalog never holds locks for long.
+
+        Args:
+            ids (Optional[list[int]]): The recipes to recompute; all recipes if None.
+            chunk_size (int): The number of IDs covered by each UPDATE.
+
+        Returns:
+            int: The number of recipes updated.
+        """
+        updated = CalorieService._recompute(RecipeModel, _recipe_total_subquery, ids, chunk_size)
+        RecipeService.invalidate_facets()
+        return updated
+
+    @staticmethod
+    def recompute_menus(ids: Optional[list[int]] = None,
+                        chunk_size: int = RECOMPUTE_CHUNK_SIZE) -> int:
+        """
+        Recompute menu totals from the stored totals of their recipes.
+
+        Args:
+            ids (Optional[list[int]]): The menus to recompute; all menus if None.
+            chunk_size (int): The number of IDs covered by each UPDATE.
+
+        Returns:
+            int: The number of menus updated.
+        """
+        return CalorieService._recompute(MenuModel, _menu_total_subquery, ids, chunk_size)
+
+    @staticmethod
+    def _recompute(model, total_subquery, ids: Optional[list[int]], chunk_size: int) -> int:
+        """Set the totals of `model` rows from `total_subquery`, one chunk of IDs at a time."""
+        updated = 0
+        if ids is None:
+            bounds = model.select(fn.MIN(model.id), fn.MAX(model.id)).tuples().first()
+            if bounds is None or bounds[0] is None:
+                return 0
+            for start in range(bounds[0], bounds[1] + 1, chunk_size):
+                with database.atomic():
+                    updated += (model
+                                .update(total_calories=total_subquery())
+                                .where(model.id.between(start, start + chunk_size - 1))
+                                .execute())
+            return updated
+        for chunk in _id_chunks(sorted(set(ids)), chunk_size):
+            with database.atomic():
+                updated += (model
+                            .update(total_calories=total_subquery())
+                            .where(model.id.in_(chunk))
+                            .execute())
+        return updated
@@ -0,0 +1,177 @@
+"""
+Module for group service class and methods for group membership management.
+"""
+
+import datetime
+import os
+from typing import Optional
+from dotenv import load_dotenv
+from config.database import GroupMemberModel, GroupModel, UserModel, database
+from helpers.cache import create_cache
+
+# Load environment variables
+load_dotenv()
+
+# Roles a member can have, from the least to the most privileged
+ROLE_LEVELS = {"viewer": 0, "member": 1, "admin": 2, "owner": 3}
+
+# Read-through cache of member roles, keyed by "group:user"; "" marks a non-member
+role_cache = create_cache(
+    "group_role",
+    ttl=float(os.getenv("GROUP_ROLE_CACHE_TTL", "60")),
+    max_size=int(os.getenv("GROUP_ROLE_CACHE_MAX_SIZE", "100000")),
+)
+
+
+def _role_key(id_group: int, id_user: int) -> str:
+    """Return the cache key of a user's role in a group."""
+    return f"{id_group}:{id_user}"
+
+
+def has_role(role: Optional[str], min_role: str) -> bool:
+    """
+    Check whether a role grants at least the privileges of another.
+
+    Args:
+        role (Optional[str]): The role held, or None for a non-member.
+        min_role (str): The least privileged role allowed.
+
+    Returns:
+        bool: True if the role is at least as privileged as `min_role`.
+    """
+    return role in ROLE_LEVELS and ROLE_LEVELS[role] >= ROLE_LEVELS[min_role]
+
+
+class GroupService:
+    """
+    Service class for handling group membership operations.
+
+    Methods:
+        get_cached_role(id_group: int, id_user: int): Get a member's role from the cache only.
+        get_member_role(id_group: int, id_user: int): Get a member's role, reading through the
+            cache.
+        get_members(id_group: int): List the members of a group.
+        set_member(id_group: int, id_user: int, role: str): Add a member or change their role.
+        remove_member(id_group: int, id_user: int): Remove a member from a group.
+
+    Raises:
+        ValueError: If the group, user or membership does not exist.
+    """
+
+    @staticmethod
+    def get_cached_role(id_group: int, id_user: int) -> tuple[bool, Optional[str]]:
+        """
+        Get a user's role in a group without querying the database.
+
+        Args:
+            id_group (int): The ID of the group.
+            id_user (int): The ID of the user.
+
+        Returns:
+            tuple[bool, Optional[str]]: Whether the role was cached, and the
+            role, or None if the user is not a member.
+        """
+        cached = role_cache.get(_role_key(id_group, id_user))
+        if cached is None:
+            return False, None
+        return True, cached or None
+
+    @staticmethod
+    def get_member_role(id_group: int, id_user: int) -> Optional[str]:
+        """
+        Get a user's role in a group, from the cache or the database.
+
+        Non-members are cached too, so repeated denied requests do not query
+        the database either. The role is only cached if no write invalidated
+        it while it was read, so a removed or demoted member cannot have the
+        old role put back.
+
+        Args:
+            id_group (int): The ID of the group.
+            id_user (int): The ID of the user.
+
+        Returns:
+            Optional[str]: The role, or None if the user is not a member.
+        """
+        found, role = GroupService.get_cached_role(id_group, id_user)
+        if found:
+            return role
+        key = _role_key(id_group, id_user)
+        version = role_cache.version(key)
+        role = (GroupMemberModel
+                .select(GroupMemberModel.role)
+                .where((GroupMemberModel.group == id_group) & (GroupMemberModel.user == id_user))
+                .scalar())
+        role_cache.set(key, role or "", version=version)
+        return role
+
+    @staticmethod
+    def get_members(id_group: int) -> list[dict]:
+        """
+        List the members of a group.
+
+        Args:
+            id_group (int): The ID of the group.
+
+        Returns:
+            list[dict]: The members with their role, by user ID.
+        """
+        query = (GroupMemberModel
+                 .select(GroupMemberModel.group.alias("group_id"),
+                         GroupMemberModel.user.alias("user_id"), GroupMemberModel.role)
+                 .where(GroupMemberModel.group == id_group)
+                 .order_by(GroupMemberModel.user))
+        return list(query.dicts())
+
+    @staticmethod
+    def set_member(id_group: int, id_user: int, role: str) -> dict:
+        """
+        Add a user to a group, or change their role, and drop their cached role.
+
+        Args:
+            id_group (int): The ID of the group.
+            id_user (int): The ID of the user.
+            role (str): The role to give the user.
+
+        Returns:
+            dict: The membership.
+
+        Raises:
+            ValueError: If the group or the user does not exist.
+        """
+        today = datetime.date.today()
+        with database.atomic():
+            if not GroupModel.select().where(GroupModel.id == id_group).exists():
+                raise ValueError("Group does not exist")
+            if not UserModel.select().where(UserModel.id == id_user).exists():
+                raise ValueError("User does not exist")
+            updated = (GroupMemberModel
+                       .update(role=role, update_date=today)
+                       .where((GroupMemberModel.group == id_group)
+                              & (GroupMemberModel.user == id_user))
+                       .execute())
+            if not updated:
+                GroupMemberModel.insert(group=id_group, user=id_user, role=role,
+                                        creation_date=today, update_date=today).execute()
+        role_cache.delete(_role_key(id_group, id_user))
+        return {"group_id": id_group, "user_id": id_user, "role": role}
+
+    @staticmethod
+    def remove_member(id_group: int, id_user: int) -> None:
+        """
+        Remove a user from a group and drop their cached role.
+
+        Args:
+            id_group (int): The ID of the group.
+            id_user (int): The ID of the user.
+
+        Raises:
+            ValueError: If the user is not a member of the group.
+        """
+        deleted = (GroupMemberModel
+                   .delete()
+                   .where((GroupMemberModel.group == id_group) & (GroupMemberModel.user == id_user))
+                   .execute())
+        role_cache.delete(_role_key(id_group, id_user))
+        if not deleted:
+            raise ValueError("Group member does not exist")
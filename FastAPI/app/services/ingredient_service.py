@@ -0,0 +1,161 @@
+"""
+Module for ingredient service class and methods for ingredient management.
+"""
+
+import datetime
+import os
+from typing import Optional
+from dotenv import load_dotenv
+from peewee import fn
+from config.database import IngredientModel, RecipeIngredientModel, database
+from helpers.autocomplete_index import AutocompleteIndex
+from helpers.trigram_index import TrigramIndex
+from helpers.db_executor import run_in_db_executor
+from helpers.periodic import run_periodically
+
+# Load environment variables
+load_dotenv()
+
+# The most suggestions one lookup returns
+MAX_SUGGESTIONS = 20
+# Prefixes whose suggestions are kept ready
+AUTOCOMPLETE_MEMO_SIZE = int(os.getenv("AUTOCOMPLETE_MEMO_SIZE", "10000"))
+# Minimum trigram similarity of a name to match an ingredient
+INGREDIENT_MATCH_THRESHOLD = float(os.getenv("INGREDIENT_MATCH_THRESHOLD", "0.55"))
+# Seconds between two rebuilds of the name indexes, to pick up writes made by other workers
+INGREDIENT_INDEX_REFRESH_INTERVAL = float(os.getenv("INGREDIENT_INDEX_REFRESH_INTERVAL", "300"))
+
+# Ingredient names by word prefix, weighted by the number of recipes using them.
+_autocomplete_index = AutocompleteIndex(MAX_SUGGESTIONS, AUTOCOMPLETE_MEMO_SIZE)
+# Ingredient names by trigram, to match misspelled names.
+_trigram_index = TrigramIndex()
+
+
+class SimilarIngredientsError(ValueError):
+    """Raised when an ingredient is created with a name close to existing ones."""
+
+    def __init__(self, matches: list[dict]):
+        super().__init__("Similar ingredients already exist")
+        self.matches = matches
+
+
+class IngredientService:
+    """
+    Service class for handling ingredient-related operations.
+
+    Methods:
+        create_ingredient(name: str, calories_per_unit: Optional[float], allow_similar: bool):
+            Create an ingredient.
+        suggest_ingredients(prefix: str, limit: int): Suggest ingredient names for a prefix.
+        match_ingredients(name: str, threshold: float, limit: int): Find ingredients with
+            similar names.
+        load_name_indexes(): Rebuild the name indexes from the database.
+        record_usage(id_ingredient: int, delta: int): Update the popularity of an ingredient.
+    """
+
+    @staticmethod
+    def create_ingredient(name: str, calories_per_unit: Optional[float],
+                          allow_similar: bool = False) -> dict:
+        """
+        Create an ingredient and make it available to the suggestions.
+
+        Unless told otherwise, the ingredient is not created when existing
+        ingredients have a similar name, so misspellings do not add duplicates.
+
+        Args:
+            name (str): The name of the ingredient.
+            calories_per_unit (Optional[float]): The calories per unit of the ingredient.
+            allow_similar (bool): Create the ingredient even if similar ones exist.
+
+        Returns:
+            dict: The new ingredient.
+
+        Raises:
+            SimilarIngredientsError: If ingredients with a similar name exist.
+        """
+        today = datetime.date.today()
+        name = name.strip()
+        if not allow_similar:
+            matches = IngredientService.match_ingredients(name, INGREDIENT_MATCH_THRESHOLD,
+                                                          MAX_SUGGESTIONS)
+            if matches:
+                raise SimilarIngredientsError(matches)
+        id_ingredient = IngredientModel.insert(name=name, calories_per_unit=calories_per_unit,
+                                               creation_date=today, update_date=today).execute()
+        _autocomplete_index.upsert(id_ingredient, name)
+        _trigram_index.upsert(id_ingredient, name)
+        return {"ingredient_id": id_ingredient, "name": name,
+                "calories_per_unit": calories_per_unit}
+
+    @staticmethod
+    def suggest_ingredients(prefix: str, limit: int) -> list[dict]:
+        """
+        Suggest the ingredients with a word starting with a prefix, most used first.
+
+        Served from memory without querying the database.
+
+        Args:
+            prefix (str): The text typed so far.
+            limit (int): The maximum number of suggestions.
+
+        Returns:
+            list[dict]: The suggested ingredients with the number of recipes using them.
+        """
+        return [{"ingredient_id": id_ingredient, "name": name, "recipe_count": recipe_count}
+                for id_ingredient, name, recipe_count in _autocomplete_index.suggest(prefix, limit)]
+
+    @staticmethod
+    def match_ingredients(name: str, threshold: float, limit: int) -> list[dict]:
+        """
+        Find the ingredients whose name is similar to a possibly misspelled one.
+
+        Served from memory without querying the database.
+
+        Args:
+            name (str): The name to match.
+            threshold (float): The minimum trigram similarity, between 0 and 1.
+            limit (int): The maximum number of matches.
+
+        Returns:
+            list[dict]: The matching ingredients with their similarity, most similar first.
+        """
+        return [{"ingredient_id": id_ingredient, "name": match, "similarity": round(similarity, 4)}
+                for id_ingredient, match, similarity
+                in _trigram_index.search(name, threshold, limit)]
+
+    @staticmethod
+    def load_name_indexes() -> int:
+        """
+        Rebuild the autocomplete and trigram indexes from the ingredient names and recipe
+        usage counts.
+
+        Returns:
+            int: The number of ingredients indexed.
+        """
+        with database.connection_context():
+            usage = dict(RecipeIngredientModel
+                         .select(RecipeIngredientModel.ingredient,
+                                 fn.COUNT(RecipeIngredientModel.recipe))
+                         .group_by(RecipeIngredientModel.ingredient)
+                         .tuples())
+            names = list(IngredientModel.select(IngredientModel.id, IngredientModel.name).tuples())
+        _autocomplete_index.load(names, usage)
+        _trigram_index.load(names)
+        return len(names)
+
+    @staticmethod
+    def record_usage(id_ingredient: int, delta: int) -> None:
+        """
+        Update the popularity of an ingredient after recipes started or stopped using it.
+
+        Args:
+            id_ingredient (int): The ID of the ingredient.
+            delta (int): The change in the number of recipes using it.
+        """
+        _autocomplete_index.add_weight(id_ingredient, delta)
+
+
+async def refresh_name_indexes_periodically() -> None:
+    """Rebuild the ingredient name indexes at startup, then every refresh interval."""
+    await run_periodically(lambda: run_in_db_executor(IngredientService.load_name_indexes),
+                           INGREDIENT_INDEX_REFRESH_INTERVAL, "Ingredient name index refresh")
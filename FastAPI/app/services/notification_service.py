@@ -0,0 +1,209 @@
+"""
+Module for notification service class and methods, including the background
+scan that notifies groups of pantry items about to expire.
+"""
+
+import datetime
+import logging
+import os
+import time
+from typing import Optional
+from dotenv import load_dotenv
+from peewee import Tuple
+from config.database import (IngredientModel, NotificationModel, PantryItemModel, PantryModel,
+                             database)
+from helpers.db_executor import run_in_db_executor
+from helpers.metrics import EXPIRY_NOTIFICATIONS, EXPIRY_SCAN_DURATION
+from helpers.notification_broker import notification_broker
+from helpers.periodic import run_periodically
+
+# Load environment variables
+load_dotenv()
+
+# Seconds between two scans; 0 disables the scanner
+EXPIRY_SCAN_INTERVAL = float(os.getenv("EXPIRY_SCAN_INTERVAL", "3600"))
+# Items expiring within this many days are notified
+EXPIRY_SCAN_DAYS_AHEAD = int(os.getenv("EXPIRY_SCAN_DAYS_AHEAD", "3"))
+# Pantry items read and notifications inserted per statement
+EXPIRY_SCAN_CHUNK_SIZE = int(os.getenv("EXPIRY_SCAN_CHUNK_SIZE", "1000"))
+
+logger = logging.getLogger(__name__)
+
+
+def _notification_dict(id_notification: int, id_group: int, message: str,
+                       date: datetime.date) -> dict:
+    """Return a notification as pushed to clients and listed in the history."""
+    return {"notification_id": id_notification, "group_id": id_group, "message": message,
+            "date": date.isoformat()}
+
+
+def _expiry_dedupe_key(id_pantry: int, id_ingredient: int, expiry_date: datetime.date) -> str:
+    """Return the key identifying the expiry notification of a pantry item."""
+    return f"expiry:{id_pantry}:{id_ingredient}:{expiry_date.isoformat()}"
+
+
+class NotificationService:
+    """
+    Service class for handling notification-related operations.
+
+    Methods:
+        get_group_notifications(id_group: int, after_id: Optional[int], limit: int): Get one
+            page of the history.
+        notify_expiring_chunk(until: date, after: Optional[tuple], chunk_size: int): Notify one
+            chunk of items.
+        scan_expiring_items(days_ahead: int, chunk_size: int): Notify every item about to expire.
+    """
+
+    @staticmethod
+    def get_group_notifications(id_group: int, after_id: Optional[int],
+                                limit: int) -> tuple[list[dict], Optional[int]]:
+        """
+        Get one page of a group's notifications, oldest first, using the last seen ID as cursor.
+
+        Clients pass the ID of the last notification they received to catch up
+        on what was sent while they were disconnected.
+
+        Args:
+            id_group (int): The ID of the group.
+            after_id (Optional[int]): Only notifications with a greater ID are returned.
+            limit (int): The maximum number of notifications in the page.
+
+        Returns:
+            tuple[list[dict], Optional[int]]: The notifications of the page and the
+            cursor of the next page, or None when there are no more notifications.
+        """
+        query = (NotificationModel
+                 .select(NotificationModel.id, NotificationModel.group, NotificationModel.message,
+                         NotificationModel.date)
+                 .where(NotificationModel.group == id_group)
+                 .order_by(NotificationModel.id)
+                 .limit(limit + 1))
+        if after_id is not None:
+            query = query.where(NotificationModel.id > after_id)
+        notifications = [_notification_dict(*row) for row in query.tuples()]
+        if len(notifications) > limit:
+            return notifications[:limit], notifications[limit - 1]["notification_id"]
+        return notifications, None
+
+    @staticmethod
+    def notify_expiring_chunk(until: datetime.date, after: Optional[tuple],
+                              chunk_size: int) -> tuple[int, Optional[tuple]]:
+        """
+        Create the notifications of one chunk of pantry items expiring by `until`.
+
+        Items are read in (expiry date, pantry, ingredient) order, which the
+        expiry index serves directly. Notifications already sent are skipped
+        by the unique `dedupe_key`, so scans can overlap or be repeated. The
+        new notifications are published to the group feeds once committed.
+
+        Args:
+            until (date): The last expiry date notified.
+            after (Optional[tuple]): The (expiry date, pantry ID, ingredient ID) of
+                the last item of the previous chunk.
+            chunk_size (int): The maximum number of items read.
+
+        Returns:
+            tuple[int, Optional[tuple]]: The number of notifications created and
+            the key to continue from, or None when the scan is complete.
+        """
+        today = datetime.date.today()
+        item_key = Tuple(PantryItemModel.expiry_date, PantryItemModel.pantry,
+                         PantryItemModel.ingredient)
+        with database.connection_context():
+            query = (PantryItemModel
+                     .select(PantryItemModel.expiry_date, PantryItemModel.pantry,
+                             PantryItemModel.ingredient, PantryModel.group, IngredientModel.name)
+                     .join(PantryModel, on=(PantryItemModel.pantry == PantryModel.id))
+                     .switch(PantryItemModel)
+                     .join(IngredientModel, on=(PantryItemModel.ingredient == IngredientModel.id))
+                     .where(PantryItemModel.expiry_date.between(today, until)
+                            & (PantryItemModel.quantity > 0))
+                     .order_by(PantryItemModel.expiry_date, PantryItemModel.pantry,
+                               PantryItemModel.ingredient)
+                     .limit(chunk_size))
+            if after is not None:
+                query = query.where(item_key > Tuple(*after))
+            items = list(query.tuples())
+            if not items:
+                return 0, None
+
+            rows = {}
+            for expiry_date, id_pantry, id_ingredient, id_group, name in items:
+                key = _expiry_dedupe_key(id_pantry, id_ingredient, expiry_date)
+                rows[key] = {
+                    "group": id_group,
+                    "message": f"{name} in your pantry expires on {expiry_date.isoformat()}.",
+                    "date": today,
+                    "dedupe_key": key,
+                    "creation_date": today,
+                    "update_date": today,
+                }
+            sent = {row[0] for row in (NotificationModel
+                                       .select(NotificationModel.dedupe_key)
+                                       .where(NotificationModel.dedupe_key.in_(list(rows)))
+                                       .tuples())}
+            keys = [key for key in rows if key not in sent]
+            created = 0
+            new_notifications = []
+            if keys:
+                with database.atomic():
+                    created = (NotificationModel
+                               .insert_many([rows[key] for key in keys])
+                               .on_conflict_ignore()
+                               .as_rowcount()
+                               .execute())
+                if created:
+                    new_notifications = [_notification_dict(*row) for row in (
+                        NotificationModel
+                        .select(NotificationModel.id, NotificationModel.group,
+                                NotificationModel.message, NotificationModel.date)
+                        .where(NotificationModel.dedupe_key.in_(keys))
+                        .tuples())]
+        for notification in new_notifications:
+            notification_broker.publish(notification["group_id"], notification)
+        last = items[-1]
+        next_key = (last[0], last[1], last[2]) if len(items) == chunk_size else None
+        return created, next_key
+
+    @staticmethod
+    async def scan_expiring_items(days_ahead: int = EXPIRY_SCAN_DAYS_AHEAD,
+                                  chunk_size: int = EXPIRY_SCAN_CHUNK_SIZE) -> int:
+        """
+        Notify the groups of every pantry item expiring within `days_ahead` days.
+
+        Each chunk runs as its own job on the database thread pool, so a long
+        scan never holds a thread or a connection for more than one chunk and
+        requests are served in between.
+
+        Args:
+            days_ahead (int): How many days ahead to look.
+            chunk_size (int): The number of items handled per chunk.
+
+        Returns:
+            int: The number of notifications created.
+        """
+        until = datetime.date.today() + datetime.timedelta(days=days_ahead)
+        created_total = 0
+        after = None
+        start = time.perf_counter()
+        try:
+            while True:
+                created, after = await run_in_db_executor(NotificationService.notify_expiring_chunk,
+                                                          until, after, chunk_size)
+                created_total += created
+                EXPIRY_NOTIFICATIONS.inc(created)
+                if after is None:
+                    return created_total
+        finally:
+            EXPIRY_SCAN_DURATION.observe(time.perf_counter() - start)
+
+
+async def _scan_expiring_items_once() -> None:
+    """Run the pantry expiry scan once and log how many notifications it created."""
+    created = await NotificationService.scan_expiring_items()
+    logger.info("Expiry scan created %d notifications.", created)
+
+
+async def scan_expiring_items_periodically() -> None:
+    """Run the pantry expiry scan every EXPIRY_SCAN_INTERVAL seconds."""
+    await run_periodically(_scan_expiring_items_once, EXPIRY_SCAN_INTERVAL, "Pantry expiry scan")
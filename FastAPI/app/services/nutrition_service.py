@@ -0,0 +1,89 @@
+"""
+Module for nutrition service class and methods filling ingredient calories
+from the external nutrition API.
+"""
+
+from typing import Optional
+from config.database import IngredientAPIModel, IngredientModel
+from helpers.db_executor import run_in_db_executor
+from helpers.nutrition_client import nutrition_client
+from services.calorie_service import CalorieService
+
+
+class NutritionService:
+    """
+    Service class for handling nutrition API-related operations.
+
+    Methods:
+        get_api_links(ingredient_ids: Optional[list[int]], only_missing: bool): Get the API IDs
+            of ingredients.
+        sync_calories(ingredient_ids: Optional[list[int]], only_missing: bool): Fill calories
+            from the API.
+
+    Raises:
+        NutritionAPIError: If the nutrition API cannot answer.
+    """
+
+    @staticmethod
+    def get_api_links(ingredient_ids: Optional[list[int]],
+                      only_missing: bool) -> dict[int, list[str]]:
+        """
+        Get the external API IDs linked to ingredients.
+
+        Args:
+            ingredient_ids (Optional[list[int]]): The ingredients; all linked ingredients if None.
+            only_missing (bool): Only return ingredients without calories.
+
+        Returns:
+            dict[int, list[str]]: The API IDs of each linked ingredient.
+        """
+        query = (IngredientAPIModel
+                 .select(IngredientAPIModel.ingredient, IngredientAPIModel.api_id)
+                 .join(IngredientModel, on=(IngredientAPIModel.ingredient == IngredientModel.id))
+                 .order_by(IngredientAPIModel.ingredient, IngredientAPIModel.api_id))
+        if ingredient_ids is not None:
+            query = query.where(IngredientAPIModel.ingredient.in_(ingredient_ids))
+        if only_missing:
+            query = query.where(IngredientModel.calories_per_unit.is_null())
+        links: dict[int, list[str]] = {}
+        for id_ingredient, api_id in query.tuples():
+            links.setdefault(id_ingredient, []).append(api_id)
+        return links
+
+    @staticmethod
+    async def sync_calories(ingredient_ids: Optional[list[int]], only_missing: bool = True) -> dict:
+        """
+        Fill the calories of ingredients from the nutrition API, then recompute the totals
+        using them.
+
+        All API IDs are looked up at once, so the client answers from its cache
+        and sends the rest in a few batched requests. An ingredient takes the
+        calories of the first of its API IDs the API knows.
+
+        Args:
+            ingredient_ids (Optional[list[int]]): The ingredients; all linked ingredients if None.
+            only_missing (bool): Only fill ingredients without calories.
+
+        Returns:
+            dict: The number of ingredients, recipes and menus updated, and the
+            ingredients the API had no calories for.
+
+        Raises:
+            NutritionAPIError: If the nutrition API cannot answer.
+        """
+        links = await run_in_db_executor(NutritionService.get_api_links, ingredient_ids,
+                                         only_missing)
+        found = await nutrition_client.lookup(api_id for api_ids in links.values()
+                                              for api_id in api_ids)
+        calories = {}
+        for id_ingredient, api_ids in links.items():
+            value = next((found[api_id] for api_id in api_ids
+                          if found.get(api_id) is not None), None)
+            if value is not None:
+                calories[id_ingredient] = value
+        totals = await run_in_db_executor(CalorieService.set_ingredients_calories, calories)
+        return {
+            "ingredients_updated": len(calories),
+            "unresolved": sorted(set(links) - set(calories)),
+            **totals,
+        }
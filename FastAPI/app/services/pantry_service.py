@@ -0,0 +1,253 @@
+"""
+Module for pantry service class and methods for pantry management.
+"""
+
+import datetime
+import math
+import operator
+import os
+from functools import reduce
+from typing import Optional
+from dotenv import load_dotenv
+from peewee import Case
+from config.database import (
+    IngredientModel,
+    PantryItemModel,
+    PantryModel,
+    RecipeIngredientModel,
+    RecipeModel,
+    lock_for_update,
+    write_transaction,
+)
+from helpers.coverage_index import CoverageIndex
+from helpers.ttl_index import TTLIndex
+from helpers.unit_conversion import NO_UNIT
+from services.unit_service import UnitService
+
+# Load environment variables
+load_dotenv()
+
+# Seconds the coverage index is served before it is rebuilt, to pick up
+# recipes changed by other workers
+COVERAGE_INDEX_TTL = float(os.getenv("COVERAGE_INDEX_TTL", "300"))
+
+
+def _build_coverage_index() -> CoverageIndex:
+    """Build the recipe coverage index from the recipes and their ingredient lines."""
+    index = CoverageIndex()
+    ingredients: dict[int, list[int]] = {}
+    lines = RecipeIngredientModel.select(RecipeIngredientModel.recipe,
+                                         RecipeIngredientModel.ingredient)
+    for id_recipe, id_ingredient in lines.tuples().iterator():
+        ingredients.setdefault(id_recipe, []).append(id_ingredient)
+    recipes = RecipeModel.select(RecipeModel.id, RecipeModel.is_public, RecipeModel.group)
+    for id_recipe, is_public, id_group in recipes.tuples().iterator():
+        if id_recipe in ingredients:
+            index.set_recipe(id_recipe, ingredients[id_recipe],
+                             {"is_public": bool(is_public), "group_id": id_group})
+    return index
+
+
+# Recipe x ingredient matrix used to rank recipes by pantry coverage.
+_coverage_index: TTLIndex[CoverageIndex] = TTLIndex(_build_coverage_index, COVERAGE_INDEX_TTL)
+
+
+class PantryService:
+    """
+    Service class for handling pantry-related operations.
+
+    Methods:
+        get_available_ingredients(id_group: int): Get the IDs of the usable pantry ingredients
+            of a group.
+        suggest_recipes(id_group: int, ...): Rank recipes by how much of them the pantry covers.
+        cook_recipe(id_group: int, id_recipe: int): Deduct the ingredients of a recipe from the
+            pantry.
+        refresh_recipe(id_recipe: int): Reload a recipe into the coverage index.
+    """
+
+    @staticmethod
+    def get_available_ingredients(id_group: int) -> set[int]:
+        """
+        Get the ingredients a group has in stock and not expired.
+
+        Args:
+            id_group (int): The ID of the group.
+
+        Returns:
+            set[int]: The IDs of the available ingredients.
+        """
+        today = datetime.date.today()
+        query = (PantryItemModel
+                 .select(PantryItemModel.ingredient)
+                 .distinct()
+                 .join(PantryModel, on=(PantryItemModel.pantry == PantryModel.id))
+                 .where((PantryModel.group == id_group)
+                        & (PantryItemModel.quantity > 0)
+                        & (PantryItemModel.expiry_date.is_null()
+                           | (PantryItemModel.expiry_date >= today))))
+        return {row[0] for row in query.tuples()}
+
+    @staticmethod
+    def suggest_recipes(id_group: int, max_missing: Optional[int], limit: int) -> list[dict]:
+        """
+        Rank the recipes visible to a group by how many of their ingredients its pantry covers.
+
+        Recipes are visible to a group when they are public or belong to it.
+
+        Args:
+            id_group (int): The ID of the group.
+            max_missing (Optional[int]): Only suggest recipes missing at most this many ingredients.
+            limit (int): The maximum number of suggestions.
+
+        Returns:
+            list[dict]: The suggestions with their coverage and missing ingredients, best first.
+        """
+        available = PantryService.get_available_ingredients(id_group)
+        if not available:
+            return []
+        ranked = _coverage_index.get().rank(
+            available,
+            accept=lambda attributes: attributes["is_public"] or attributes["group_id"] == id_group,
+            max_missing=max_missing,
+            limit=limit,
+        )
+        if not ranked:
+            return []
+
+        titles = dict(RecipeModel
+                      .select(RecipeModel.id, RecipeModel.title)
+                      .where(RecipeModel.id.in_([row[0] for row in ranked]))
+                      .tuples())
+        missing_ids = {id_ingredient for row in ranked for id_ingredient in row[3]}
+        names = dict(IngredientModel
+                     .select(IngredientModel.id, IngredientModel.name)
+                     .where(IngredientModel.id.in_(list(missing_ids)))
+                     .tuples()) if missing_ids else {}
+        return [
+            {
+                "recipe_id": id_recipe,
+                "title": titles.get(id_recipe, ""),
+                "matched_ingredients": matched,
+                "total_ingredients": total,
+                "coverage": matched / total,
+                "missing_ingredients": [{"ingredient_id": id_ingredient,
+                                         "name": names.get(id_ingredient, "")}
+                                        for id_ingredient in missing],
+            }
+            for id_recipe, matched, total, missing in ranked
+        ]
+
+    @staticmethod
+    def cook_recipe(id_group: int, id_recipe: int) -> dict:
+        """
+        Deduct the ingredients of a recipe from a group's pantries, earliest expiry first.
+
+        The pantry rows are locked while the deductions are computed, then all
+        of them are applied by a single `quantity = quantity - CASE ...` UPDATE,
+        so concurrent cooks never lose an update and the statement count does
+        not depend on the number of ingredients. Expired items are not used.
+
+        Args:
+            id_group (int): The ID of the group cooking.
+            id_recipe (int): The ID of the recipe cooked.
+
+        Returns:
+            dict: The quantities deducted per pantry item and the quantities
+            missing per ingredient, in the recipe's units.
+
+        Raises:
+            ValueError: If the recipe does not exist.
+        """
+        lines = list(RecipeIngredientModel
+                     .select(RecipeIngredientModel.ingredient, RecipeIngredientModel.quantity,
+                             RecipeIngredientModel.unit)
+                     .where(RecipeIngredientModel.recipe == id_recipe)
+                     .tuples())
+        if not lines and not RecipeModel.select().where(RecipeModel.id == id_recipe).exists():
+            raise ValueError("Recipe does not exist")
+        needed = {id_ingredient: (float(quantity), id_unit)
+                  for id_ingredient, quantity, id_unit in lines}
+
+        today = datetime.date.today()
+        with write_transaction():
+            items = list(lock_for_update(
+                PantryItemModel
+                .select(PantryItemModel.pantry, PantryItemModel.ingredient,
+                        PantryItemModel.quantity, PantryItemModel.unit)
+                .join(PantryModel, on=(PantryItemModel.pantry == PantryModel.id))
+                .where((PantryModel.group == id_group)
+                       & PantryItemModel.ingredient.in_(list(needed))
+                       & (PantryItemModel.quantity > 0)
+                       & (PantryItemModel.expiry_date.is_null()
+                          | (PantryItemModel.expiry_date >= today)))
+                # Earliest expiry first; items without an expiry date last
+                .order_by(PantryItemModel.expiry_date.is_null(), PantryItemModel.expiry_date,
+                          PantryItemModel.pantry))
+                .tuples()) if needed else []
+
+            # How many recipe units one unit of each pantry item is worth.
+            factors = UnitService.convert(
+                1.0,
+                [id_unit or NO_UNIT for _, _, _, id_unit in items],
+                [needed[id_ingredient][1] or NO_UNIT for _, id_ingredient, _, _ in items],
+                [id_ingredient for _, id_ingredient, _, _ in items],
+            ).tolist() if items else []
+
+            remaining = {id_ingredient: quantity for id_ingredient, (quantity, _) in needed.items()}
+            deductions = []
+            for (id_pantry, id_ingredient, quantity, id_unit), factor in zip(items, factors):
+                if math.isnan(factor) or remaining[id_ingredient] <= 0:
+                    continue
+                taken = round(min(float(quantity), remaining[id_ingredient] / factor), 2)
+                if taken <= 0:
+                    continue
+                remaining[id_ingredient] -= taken * factor
+                deductions.append({"pantry_id": id_pantry, "ingredient_id": id_ingredient,
+                                   "quantity": taken, "unit_id": id_unit})
+
+            if deductions:
+                matches = [(PantryItemModel.pantry == row["pantry_id"])
+                           & (PantryItemModel.ingredient == row["ingredient_id"])
+                           for row in deductions]
+                amounts = Case(None, [(match, row["quantity"])
+                                      for match, row in zip(matches, deductions)], 0)
+                (PantryItemModel
+                 .update(quantity=PantryItemModel.quantity - amounts, update_date=today)
+                 .where(reduce(operator.or_, matches))
+                 .execute())
+
+        shortfalls = [{"ingredient_id": id_ingredient, "quantity": round(quantity, 2),
+                       "unit_id": needed[id_ingredient][1]}
+                      for id_ingredient, quantity in sorted(remaining.items())
+                      if round(quantity, 2) > 0]
+        return {"recipe_id": id_recipe, "group_id": id_group, "deductions": deductions,
+                "shortfalls": shortfalls}
+
+    @staticmethod
+    def refresh_recipe(id_recipe: int) -> None:
+        """
+        Reload a recipe's ingredients and visibility into the coverage index.
+
+        Does nothing until the index has been built, since the first build
+        reads the current data anyway.
+
+        Args:
+            id_recipe (int): The ID of the recipe.
+        """
+        index = _coverage_index.current
+        if index is None:
+            return
+        recipe = (RecipeModel
+                  .select(RecipeModel.is_public, RecipeModel.group)
+                  .where(RecipeModel.id == id_recipe)
+                  .tuples()
+                  .first())
+        ingredients = [row[0] for row in (RecipeIngredientModel
+                                          .select(RecipeIngredientModel.ingredient)
+                                          .where(RecipeIngredientModel.recipe == id_recipe)
+                                          .tuples())]
+        if recipe is None or not ingredients:
+            index.remove_recipe(id_recipe)
+        else:
+            index.set_recipe(id_recipe, ingredients,
+                             {"is_public": bool(recipe[0]), "group_id": recipe[1]})
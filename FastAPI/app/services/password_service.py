@@ -0,0 +1,126 @@
+"""
+Module for password service class and methods for password hashing.
+"""
+
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+from dotenv import load_dotenv
+from helpers import password_hashing
+
+# Load environment variables
+load_dotenv()
+
+PASSWORD_HASH_TIME_COST = int(os.getenv("PASSWORD_HASH_TIME_COST", "3"))
+PASSWORD_HASH_MEMORY_COST = int(os.getenv("PASSWORD_HASH_MEMORY_COST", "65536"))
+PASSWORD_HASH_PARALLELISM = int(os.getenv("PASSWORD_HASH_PARALLELISM", "1"))
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(os.cpu_count() or 1)))
+# Workers bulk imports may keep busy at once, so logins always find free ones
+PASSWORD_BULK_HASH_WORKERS = int(os.getenv("PASSWORD_BULK_HASH_WORKERS",
+                                           str(max(1, PASSWORD_HASH_WORKERS // 2))))
+
+_COST = (PASSWORD_HASH_TIME_COST, PASSWORD_HASH_MEMORY_COST, PASSWORD_HASH_PARALLELISM)
+
+# Hashing is CPU-bound, so it runs in separate processes instead of the event
+# loop or the database threads. Workers are spawned so they never inherit the
+# server's threads or open connections.
+_executor = ProcessPoolExecutor(
+    max_workers=PASSWORD_HASH_WORKERS,
+    mp_context=multiprocessing.get_context("spawn"),
+)
+
+# Held by each bulk hash while it is on the pool, shared by every bulk import.
+_bulk_slots = asyncio.Semaphore(PASSWORD_BULK_HASH_WORKERS)
+
+
+class PasswordService:
+    """
+    Service class for hashing and verifying passwords on the password process pool.
+
+    Methods:
+        hash_password(password: str): Hash a password.
+        hash_passwords(passwords: list): Hash many passwords on part of the pool.
+        verify_password(password_hash: str, password: str): Verify a password.
+        verify_unknown_user(password: str): Spend a verification on a missing user.
+        shutdown(): Stop the process pool.
+    """
+
+    # Verified against when the username is unknown, so a failed login takes as
+    # long whether or not the user exists; hashed on first use.
+    _dummy_hash: Optional[str] = None
+
+    @staticmethod
+    async def hash_password(password: str) -> str:
+        """
+        Hash a password with the configured Argon2 cost.
+
+        Args:
+            password (str): The plain-text password.
+
+        Returns:
+            str: The encoded hash.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_executor, password_hashing.hash_password,
+                                          password, *_COST)
+
+    @staticmethod
+    async def hash_passwords(passwords: list[str]) -> list[str]:
+        """
+        Hash many passwords, keeping at most PASSWORD_BULK_HASH_WORKERS workers busy.
+
+        The pool runs jobs in submission order, so the hashes are handed to it
+        as slots free up instead of all at once, and logins submitted meanwhile
+        find the other workers free.
+
+        Args:
+            passwords (list[str]): The plain-text passwords.
+
+        Returns:
+            list[str]: The encoded hashes, in the same order.
+        """
+        loop = asyncio.get_running_loop()
+
+        async def hash_one(password: str) -> str:
+            async with _bulk_slots:
+                return await loop.run_in_executor(_executor, password_hashing.hash_password,
+                                                  password, *_COST)
+
+        return list(await asyncio.gather(*(hash_one(password) for password in passwords)))
+
+    @staticmethod
+    async def verify_password(password_hash: str, password: str) -> tuple[bool, bool]:
+        """
+        Verify a password against its stored hash.
+
+        Args:
+            password_hash (str): The stored hash.
+            password (str): The plain-text password to check.
+
+        Returns:
+            tuple[bool, bool]: Whether the password matches, and whether the hash
+            must be recomputed with the current cost parameters.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            _executor, password_hashing.verify_password, password_hash, password, *_COST
+        )
+
+    @staticmethod
+    async def verify_unknown_user(password: str) -> None:
+        """
+        Verify a password against a dummy hash when the username is unknown.
+
+        Args:
+            password (str): The plain-text password that was submitted.
+        """
+        if PasswordService._dummy_hash is None:
+            PasswordService._dummy_hash = await PasswordService.hash_password("dummy-password")
+        await PasswordService.verify_password(PasswordService._dummy_hash, password)
+
+    @staticmethod
+    def shutdown() -> None:
+        """Stop the password process pool."""
+        _executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,342 @@
+"""
+Module for recipe service class and methods for recipe management.
+"""
+
+import json
+import math
+import os
+from typing import Optional
+from dotenv import load_dotenv
+from peewee import JOIN, Case, DoesNotExist, MySQLDatabase, fn
+from playhouse.mysql_ext import Match
+from config.database import (
+    IngredientModel,
+    RecipeCategoryBridgeModel,
+    RecipeCategoryModel,
+    RecipeIngredientModel,
+    RecipeModel,
+    UnitModel,
+    database,
+)
+from helpers.cache import create_cache
+from helpers.search_index import InvertedIndex
+from helpers.ttl_index import TTLIndex
+from models.recipe import RecipeFilters
+
+# Load environment variables
+load_dotenv()
+
+# Facet counts of recipe listings, keyed by their filters; cleared on recipe writes
+facet_cache = create_cache(
+    "recipe_facets",
+    ttl=float(os.getenv("FACET_CACHE_TTL", "30")),
+    max_size=int(os.getenv("FACET_CACHE_MAX_SIZE", "1000")),
+)
+
+# Lower bounds of the facet ranges; the last range is unbounded.
+COOKING_TIME_BUCKETS = (0, 15, 30, 60, 120)
+CALORIE_BUCKETS = (0, 250, 500, 750, 1000)
+
+# Search results are paged by their relevance truncated to this many steps
+# per unit, compared as integers, since equal float scores are not guaranteed
+# to compare equal once they went through a cursor.
+SEARCH_RANK_SCALE = 1_000_000
+# Seconds the fallback search index is served before it is rebuilt, to pick up
+# recipes written by other workers or other applications.
+SEARCH_INDEX_TTL = float(os.getenv("SEARCH_INDEX_TTL", "300"))
+
+
+def _recipe_text(recipe) -> str:
+    """Return the searchable text of a recipe row."""
+    return " ".join(filter(None, (recipe.get("title"), recipe.get("description"),
+                                  recipe.get("instructions"))))
+
+
+def _filter_conditions(filters: RecipeFilters, exclude: Optional[str] = None) -> list:
+    """Return the WHERE conditions of a listing, leaving out the facet dimension `exclude`."""
+    conditions = []
+    if filters.category_id is not None and exclude != "categories":
+        conditions.append(RecipeModel.id.in_(
+            RecipeCategoryBridgeModel
+            .select(RecipeCategoryBridgeModel.recipe)
+            .where(RecipeCategoryBridgeModel.category == filters.category_id)))
+    if filters.difficulty is not None and exclude != "difficulty":
+        conditions.append(RecipeModel.difficulty == filters.difficulty)
+    if exclude != "cooking_time":
+        if filters.min_cooking_time is not None:
+            conditions.append(RecipeModel.cooking_time >= filters.min_cooking_time)
+        if filters.max_cooking_time is not None:
+            conditions.append(RecipeModel.cooking_time < filters.max_cooking_time)
+    if exclude != "total_calories":
+        if filters.min_calories is not None:
+            conditions.append(RecipeModel.total_calories >= filters.min_calories)
+        if filters.max_calories is not None:
+            conditions.append(RecipeModel.total_calories < filters.max_calories)
+    if filters.is_public is not None:
+        conditions.append(RecipeModel.is_public == filters.is_public)
+    if filters.group_id is not None:
+        conditions.append(RecipeModel.group == filters.group_id)
+    return conditions
+
+
+def _range_facet(field, bounds: tuple, conditions: list) -> list[dict]:
+    """Count the recipes matching `conditions` in each range of `field` starting at `bounds`."""
+    bucket = Case(None, [((field >= low) & (field < high), index)
+                         for index, (low, high) in enumerate(zip(bounds, bounds[1:]))]
+                  + [(field >= bounds[-1], len(bounds) - 1)])
+    query = (RecipeModel
+             .select(bucket.alias("bucket"), fn.COUNT(RecipeModel.id).alias("count"))
+             .where(*conditions, field.is_null(False))
+             .group_by(bucket))
+    counts = {row["bucket"]: row["count"] for row in query.dicts() if row["bucket"] is not None}
+    return [{"min": low, "max": bounds[index + 1] if index + 1 < len(bounds) else None,
+             "count": counts[index]}
+            for index, low in enumerate(bounds) if index in counts]
+
+
+def _search_rank(score: float) -> int:
+    """Return the integer rank results are paged by for a relevance score."""
+    return math.floor(score * SEARCH_RANK_SCALE)
+
+
+def _build_search_index() -> InvertedIndex:
+    """Build the fallback search index from the recipe texts."""
+    index = InvertedIndex()
+    query = RecipeModel.select(RecipeModel.id, RecipeModel.title, RecipeModel.description,
+                               RecipeModel.instructions, RecipeModel.is_public,
+                               RecipeModel.group)
+    for recipe in query.dicts().iterator():
+        index.upsert(recipe["id"], _recipe_text(recipe),
+                     {"is_public": bool(recipe["is_public"]), "group_id": recipe["group"]})
+    return index
+
+
+# Fallback full-text index for databases without MySQL FULLTEXT support.
+_search_index: TTLIndex[InvertedIndex] = TTLIndex(_build_search_index, SEARCH_INDEX_TTL)
+
+
+class RecipeService:
+    """
+    Service class for handling recipe-related operations.
+
+    Methods:
+        get_recipe_detail(id_recipe: int): Get a recipe with its ingredients and categories.
+        get_recipes_page(filters: RecipeFilters, after_id: int, limit: int): Get one page of
+            filtered recipes.
+        get_facets(filters: RecipeFilters): Count the recipes of a listing per facet value.
+        invalidate_facets(): Drop the cached facet counts after a recipe write.
+        search_recipes(text: str, ...): Full-text search over recipes.
+    """
+
+    @staticmethod
+    def get_recipe_detail(id_recipe: int) -> dict:
+        """
+        Get a recipe with its ingredients, their units and its categories.
+
+        The whole graph is loaded with three queries (recipe, joined ingredient
+        lines, joined categories) whatever the number of ingredients.
+
+        Args:
+            id_recipe (int): The ID of the recipe.
+
+        Returns:
+            dict: The recipe fields plus `ingredients` and `categories` lists.
+
+        Raises:
+            ValueError: If the recipe does not exist.
+        """
+        try:
+            recipe = (RecipeModel
+                      .select(RecipeModel.id.alias("recipe_id"), RecipeModel.title,
+                              RecipeModel.description, RecipeModel.instructions,
+                              RecipeModel.cooking_time, RecipeModel.difficulty,
+                              RecipeModel.is_public, RecipeModel.total_calories,
+                              RecipeModel.group.alias("group_id"))
+                      .where(RecipeModel.id == id_recipe)
+                      .dicts()
+                      .get())
+        except DoesNotExist as exc:
+            raise ValueError("Recipe does not exist") from exc
+
+        recipe["ingredients"] = list(
+            RecipeIngredientModel
+            .select(IngredientModel.id.alias("ingredient_id"), IngredientModel.name,
+                    RecipeIngredientModel.quantity, IngredientModel.calories_per_unit,
+                    UnitModel.id.alias("unit_id"), UnitModel.name.alias("unit_name"),
+                    UnitModel.abbreviation.alias("unit_abbreviation"))
+            .join(IngredientModel, on=(RecipeIngredientModel.ingredient == IngredientModel.id))
+            .join(UnitModel, JOIN.LEFT_OUTER, on=(RecipeIngredientModel.unit == UnitModel.id))
+            .where(RecipeIngredientModel.recipe == id_recipe)
+            .order_by(IngredientModel.name)
+            .dicts()
+        )
+        recipe["categories"] = list(
+            RecipeCategoryModel
+            .select(RecipeCategoryModel.id.alias("category_id"), RecipeCategoryModel.name)
+            .join(RecipeCategoryBridgeModel,
+                  on=(RecipeCategoryBridgeModel.category == RecipeCategoryModel.id))
+            .where(RecipeCategoryBridgeModel.recipe == id_recipe)
+            .order_by(RecipeCategoryModel.name)
+            .dicts()
+        )
+        return recipe
+
+    @staticmethod
+    def get_recipes_page(filters: RecipeFilters, after_id: Optional[int],
+                         limit: int) -> tuple[list[dict], Optional[int]]:
+        """
+        Get one page of the recipes matching the filters, ordered by ID.
+
+        Args:
+            filters (RecipeFilters): The filters of the listing.
+            after_id (Optional[int]): Only recipes with a greater ID are returned.
+            limit (int): The maximum number of recipes in the page.
+
+        Returns:
+            tuple[list[dict], Optional[int]]: The recipes of the page and the
+            cursor of the next page, or None when there are no more recipes.
+        """
+        query = (RecipeModel
+                 .select(RecipeModel.id.alias("recipe_id"), RecipeModel.title,
+                         RecipeModel.description, RecipeModel.cooking_time, RecipeModel.difficulty,
+                         RecipeModel.total_calories, RecipeModel.is_public,
+                         RecipeModel.group.alias("group_id"))
+                 .order_by(RecipeModel.id)
+                 .limit(limit + 1))
+        conditions = _filter_conditions(filters)
+        if after_id is not None:
+            conditions.append(RecipeModel.id > after_id)
+        if conditions:
+            query = query.where(*conditions)
+        recipes = list(query.dicts())
+        if len(recipes) > limit:
+            return recipes[:limit], recipes[limit - 1]["recipe_id"]
+        return recipes, None
+
+    @staticmethod
+    def get_facets(filters: RecipeFilters) -> dict:
+        """
+        Count the recipes of a listing per category, difficulty, cooking time and calorie range.
+
+        The counts of each dimension apply every filter but its own. They are
+        served from `facet_cache` when possible.
+
+        Args:
+            filters (RecipeFilters): The filters of the listing.
+
+        Returns:
+            dict: The counts of each dimension.
+        """
+        key = json.dumps(filters.model_dump(), sort_keys=True)
+        facets = facet_cache.get(key)
+        if facets is not None:
+            return facets
+
+        categories = (RecipeCategoryModel
+                      .select(RecipeCategoryModel.id.alias("category_id"), RecipeCategoryModel.name,
+                              fn.COUNT(RecipeModel.id).alias("count"))
+                      .join(RecipeCategoryBridgeModel,
+                            on=(RecipeCategoryBridgeModel.category == RecipeCategoryModel.id))
+                      .join(RecipeModel, on=(RecipeCategoryBridgeModel.recipe == RecipeModel.id))
+                      .group_by(RecipeCategoryModel.id, RecipeCategoryModel.name)
+                      .order_by(fn.COUNT(RecipeModel.id).desc(), RecipeCategoryModel.id))
+        category_conditions = _filter_conditions(filters, "categories")
+        if category_conditions:
+            categories = categories.where(*category_conditions)
+        difficulty = (RecipeModel
+                      .select(RecipeModel.difficulty.alias("value"),
+                              fn.COUNT(RecipeModel.id).alias("count"))
+                      .where(*_filter_conditions(filters, "difficulty"),
+                             RecipeModel.difficulty.is_null(False))
+                      .group_by(RecipeModel.difficulty)
+                      .order_by(RecipeModel.difficulty))
+        facets = {
+            "categories": list(categories.dicts()),
+            "difficulty": list(difficulty.dicts()),
+            "cooking_time": _range_facet(RecipeModel.cooking_time, COOKING_TIME_BUCKETS,
+                                         _filter_conditions(filters, "cooking_time")),
+            "total_calories": _range_facet(RecipeModel.total_calories, CALORIE_BUCKETS,
+                                           _filter_conditions(filters, "total_calories")),
+        }
+        facet_cache.set(key, facets)
+        return facets
+
+    @staticmethod
+    def invalidate_facets() -> None:
+        """Drop every cached facet count; called after recipes are written."""
+        facet_cache.clear()
+
+    @staticmethod
+    def search_recipes(text: str, is_public: Optional[bool], group_id: Optional[int],
+                       after: Optional[tuple[int, int]],
+                       limit: int) -> tuple[list[dict], Optional[tuple]]:
+        """
+        Search recipes by title, description and instructions, most relevant first.
+
+        On MySQL the FULLTEXT index answers the query in natural language mode;
+        on other databases the in-process inverted index is used. Results are
+        ordered by their integer rank (the score scaled by SEARCH_RANK_SCALE),
+        then by ID.
+
+        Args:
+            text (str): The search text.
+            is_public (Optional[bool]): Only return recipes with this visibility.
+            group_id (Optional[int]): Only return recipes of this group.
+            after (Optional[tuple[int, int]]): The (rank, ID) of the last result of the
+                previous page.
+            limit (int): The maximum number of results.
+
+        Returns:
+            tuple[list[dict], Optional[tuple]]: The results and the (rank, ID)
+            to continue from, or None on the last page.
+        """
+        if isinstance(database, MySQLDatabase):
+            rows = RecipeService._search_fulltext(text, is_public, group_id, after, limit + 1)
+        else:
+            rows = RecipeService._search_index(text, is_public, group_id, after, limit + 1)
+        if len(rows) > limit:
+            last = rows[limit - 1]
+            return rows[:limit], (last["rank"], last["recipe_id"])
+        return rows, None
+
+    @staticmethod
+    def _search_fulltext(text, is_public, group_id, after, limit) -> list[dict]:
+        score = Match((RecipeModel.title, RecipeModel.description, RecipeModel.instructions),
+                      text, "IN NATURAL LANGUAGE MODE")
+        rank = fn.FLOOR(score * SEARCH_RANK_SCALE)
+        query = (RecipeModel
+                 .select(RecipeModel.id.alias("recipe_id"), RecipeModel.title,
+                         RecipeModel.description, RecipeModel.is_public,
+                         RecipeModel.group.alias("group_id"), score.alias("score"),
+                         rank.alias("rank"))
+                 .where(score > 0))
+        if is_public is not None:
+            query = query.where(RecipeModel.is_public == is_public)
+        if group_id is not None:
+            query = query.where(RecipeModel.group == group_id)
+        if after is not None:
+            after_rank, after_id = after
+            query = query.where((rank < after_rank)
+                                | ((rank == after_rank) & (RecipeModel.id > after_id)))
+        return list(query.order_by(rank.desc(), RecipeModel.id).limit(limit).dicts())
+
+    @staticmethod
+    def _search_index(text, is_public, group_id, after, limit) -> list[dict]:
+        ranked = sorted(((_search_rank(score), doc_id, score) for score, doc_id
+                         in _search_index.get().search(text, {"is_public": is_public,
+                                                              "group_id": group_id})),
+                        key=lambda item: (-item[0], item[1]))
+        if after is not None:
+            ranked = [item for item in ranked if (-item[0], item[1]) > (-after[0], after[1])]
+        ranked = ranked[:limit]
+        if not ranked:
+            return []
+        recipes = {
+            recipe["recipe_id"]: recipe for recipe in RecipeModel
+            .select(RecipeModel.id.alias("recipe_id"), RecipeModel.title, RecipeModel.description,
+                    RecipeModel.is_public, RecipeModel.group.alias("group_id"))
+            .where(RecipeModel.id.in_([doc_id for _, doc_id, _ in ranked]))
+            .dicts()
+        }
+        return [{**recipes[doc_id], "score": score, "rank": rank}
+                for rank, doc_id, score in ranked if doc_id in recipes]
@@ -0,0 +1,161 @@
+"""
+Module for shopping list service class and methods for shopping list management.
+"""
+
+import datetime
+import math
+from typing import Optional
+from peewee import Value, fn
+from config.database import (
+    MenuModel,
+    MenuRecipeModel,
+    PantryItemModel,
+    PantryModel,
+    RecipeIngredientModel,
+    ShoppingListItemModel,
+    ShoppingListModel,
+    database,
+)
+from helpers.unit_conversion import NO_UNIT
+from services.unit_service import UnitService
+
+
+def _menu_requirements_query(id_menu: int, id_group: Optional[int]):
+    """
+    Build the query totalling what a menu needs and what the group's pantry holds.
+
+    Both totals are grouped by ingredient and unit and returned by one UNION
+    ALL query; `needed` tells the two kinds of rows apart.
+    """
+    needed = (MenuRecipeModel
+              .select(Value(1).alias("needed"),
+                      RecipeIngredientModel.ingredient.alias("ingredient_id"),
+                      RecipeIngredientModel.unit.alias("unit_id"),
+                      fn.SUM(RecipeIngredientModel.quantity).alias("quantity"),
+                      fn.COUNT(RecipeIngredientModel.recipe).alias("lines"))
+              .join(RecipeIngredientModel,
+                    on=(RecipeIngredientModel.recipe == MenuRecipeModel.recipe))
+              .where(MenuRecipeModel.menu == id_menu)
+              .group_by(RecipeIngredientModel.ingredient, RecipeIngredientModel.unit))
+    if id_group is None:
+        return needed
+
+    menu_ingredients = (RecipeIngredientModel
+                        .select(RecipeIngredientModel.ingredient)
+                        .join(MenuRecipeModel,
+                              on=(MenuRecipeModel.recipe == RecipeIngredientModel.recipe))
+                        .where(MenuRecipeModel.menu == id_menu))
+    in_stock = (PantryItemModel
+                .select(Value(0).alias("needed"), PantryItemModel.ingredient.alias("ingredient_id"),
+                        PantryItemModel.unit.alias("unit_id"),
+                        fn.SUM(PantryItemModel.quantity).alias("quantity"),
+                        fn.COUNT(PantryItemModel.pantry).alias("lines"))
+                .join(PantryModel, on=(PantryItemModel.pantry == PantryModel.id))
+                .where((PantryModel.group == id_group)
+                       & (PantryItemModel.quantity > 0)
+                       & (PantryItemModel.expiry_date.is_null()
+                          | (PantryItemModel.expiry_date >= datetime.date.today()))
+                       & PantryItemModel.ingredient.in_(menu_ingredients))
+                .group_by(PantryItemModel.ingredient, PantryItemModel.unit))
+    return needed + in_stock
+
+
+def _shopping_lines(rows: list[dict]) -> tuple[list[dict], list[dict]]:
+    """
+    Net what is needed against what is in stock, one line per ingredient.
+
+    Every ingredient is listed in the unit most of its recipe lines use; the
+    other quantities are converted to it in one vectorized call.
+
+    Returns:
+        tuple[list[dict], list[dict]]: The lines to buy, and the needed
+        quantities that could not be converted to their ingredient's unit.
+    """
+    target_units: dict[int, tuple[int, int]] = {}
+    for row in rows:
+        if row["needed"]:
+            unit = row["unit_id"] or NO_UNIT
+            best = target_units.get(row["ingredient_id"])
+            if best is None or (row["lines"], -unit) > (best[1], -best[0]):
+                target_units[row["ingredient_id"]] = (unit, row["lines"])
+
+    rows = [row for row in rows if row["ingredient_id"] in target_units]
+    converted = UnitService.convert(
+        [float(row["quantity"]) for row in rows],
+        [row["unit_id"] or NO_UNIT for row in rows],
+        [target_units[row["ingredient_id"]][0] for row in rows],
+        [row["ingredient_id"] for row in rows],
+    )
+
+    totals: dict[int, float] = {}
+    unconvertible = []
+    for row, quantity in zip(rows, converted.tolist()):
+        if math.isnan(quantity):
+            if row["needed"]:
+                unconvertible.append({"ingredient_id": row["ingredient_id"],
+                                      "quantity": float(row["quantity"]),
+                                      "unit_id": row["unit_id"]})
+            continue
+        signed = quantity if row["needed"] else -quantity
+        totals[row["ingredient_id"]] = totals.get(row["ingredient_id"], 0.0) + signed
+    lines = [
+        {"ingredient_id": id_ingredient, "quantity": round(quantity, 2),
+         "unit_id": target_units[id_ingredient][0] or None}
+        for id_ingredient, quantity in sorted(totals.items())
+        if round(quantity, 2) > 0
+    ]
+    return lines, unconvertible
+
+
+class ShoppingListService:
+    """
+    Service class for handling shopping list-related operations.
+
+    Methods:
+        create_from_menu(id_menu: int): Create the shopping list of a menu.
+
+    Raises:
+        ValueError: If the menu does not exist.
+    """
+
+    @staticmethod
+    def create_from_menu(id_menu: int) -> dict:
+        """
+        Create a shopping list with what a menu needs beyond the group's pantry.
+
+        The needed and stocked quantities are totalled by one aggregate query;
+        the list and all of its items are then written by two INSERTs in one
+        transaction.
+
+        Args:
+            id_menu (int): The ID of the menu.
+
+        Returns:
+            dict: The new shopping list, its items and the needed quantities
+            that could not be converted to a common unit.
+
+        Raises:
+            ValueError: If the menu does not exist.
+        """
+        menu = MenuModel.select(MenuModel.group).where(MenuModel.id == id_menu).tuples().first()
+        if menu is None:
+            raise ValueError("Menu does not exist")
+        id_group = menu[0]
+
+        rows = list(_menu_requirements_query(id_menu, id_group).dicts())
+        lines, unconvertible = _shopping_lines(rows)
+
+        today = datetime.date.today()
+        with database.atomic():
+            id_list = ShoppingListModel.insert(group=id_group, created_date=today,
+                                               is_purchased=False, creation_date=today,
+                                               update_date=today).execute()
+            if lines:
+                ShoppingListItemModel.insert_many([
+                    {"list": id_list, "ingredient": line["ingredient_id"],
+                     "quantity": line["quantity"], "unit": line["unit_id"],
+                     "creation_date": today, "update_date": today}
+                    for line in lines
+                ]).execute()
+        return {"list_id": id_list, "group_id": id_group, "menu_id": id_menu, "items": lines,
+                "unconvertible": unconvertible}
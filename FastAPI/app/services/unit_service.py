@@ -0,0 +1,119 @@
+"""
+Module for unit service class and methods for unit conversion.
+"""
+
+import datetime
+import os
+from typing import Optional
+import numpy as np
+from dotenv import load_dotenv
+from peewee import IntegrityError
+from config.database import IngredientModel, UnitConversionModel, UnitModel, database
+from helpers.ttl_index import TTLIndex
+from helpers.unit_conversion import NO_INGREDIENT, ConversionGraph
+
+# Load environment variables
+load_dotenv()
+
+# Seconds before the conversion graph is reloaded, to pick up changes made by other processes
+UNIT_GRAPH_TTL = float(os.getenv("UNIT_GRAPH_TTL", "300"))
+
+def _load_conversion_graph() -> ConversionGraph:
+    """Load the conversion graph from the stored conversions."""
+    rows = (UnitConversionModel
+            .select(UnitConversionModel.from_unit, UnitConversionModel.to_unit,
+                    UnitConversionModel.factor, UnitConversionModel.ingredient)
+            .dicts())
+    return ConversionGraph(rows)
+
+
+_conversion_graph: TTLIndex[ConversionGraph] = TTLIndex(_load_conversion_graph, UNIT_GRAPH_TTL)
+
+
+def get_conversion_graph() -> ConversionGraph:
+    """
+    Get the conversion graph, loading it from the database when missing or stale.
+
+    Returns:
+        ConversionGraph: The current conversion graph.
+    """
+    return _conversion_graph.get()
+
+
+def invalidate_conversion_graph() -> None:
+    """Drop the conversion graph so the next conversion reloads it."""
+    _conversion_graph.invalidate()
+
+
+class UnitService:
+    """
+    Service class for handling unit conversions.
+
+    Methods:
+        set_conversion(from_unit: int, to_unit: int, factor: float, ingredient: Optional[int]):
+            Store a factor.
+        convert(quantities, from_units, to_units, ingredients): Convert arrays of quantities.
+
+    Raises:
+        ValueError: If a unit or ingredient does not exist.
+    """
+
+    @staticmethod
+    def set_conversion(from_unit: int, to_unit: int, factor: float,
+                       ingredient: Optional[int]) -> None:
+        """
+        Store the factor converting one unit to another, replacing any previous one.
+
+        Args:
+            from_unit (int): The ID of the unit converted from.
+            to_unit (int): The ID of the unit converted to.
+            factor (float): The number of `to_unit` in one `from_unit`.
+            ingredient (Optional[int]): The ingredient the factor applies to; None for all.
+
+        Raises:
+            ValueError: If a unit or the ingredient does not exist, or both units are the same.
+        """
+        if from_unit == to_unit:
+            raise ValueError("A unit cannot be converted to itself")
+        if UnitModel.select().where(UnitModel.id.in_([from_unit, to_unit])).count() != 2:
+            raise ValueError("Unit does not exist")
+        if (ingredient is not None
+                and not IngredientModel.select().where(IngredientModel.id == ingredient).exists()):
+            raise ValueError("Ingredient does not exist")
+
+        today = datetime.date.today()
+        same_conversion = ((UnitConversionModel.from_unit == from_unit)
+                           & (UnitConversionModel.to_unit == to_unit)
+                           & (UnitConversionModel.ingredient.is_null() if ingredient is None
+                              else UnitConversionModel.ingredient == ingredient))
+        update = UnitConversionModel.update(factor=factor, update_date=today).where(same_conversion)
+        with database.atomic():
+            if not update.execute():
+                try:
+                    with database.atomic():
+                        UnitConversionModel.insert(from_unit=from_unit, to_unit=to_unit,
+                                                   factor=factor, ingredient=ingredient,
+                                                   creation_date=today, update_date=today).execute()
+                except IntegrityError:
+                    # A concurrent request stored the same conversion first
+                    update.execute()
+        invalidate_conversion_graph()
+
+    @staticmethod
+    def convert(quantities, from_units, to_units, ingredients=None) -> np.ndarray:
+        """
+        Convert arrays of quantities between units in one vectorized call.
+
+        Args:
+            quantities (ArrayLike): The quantities to convert.
+            from_units (ArrayLike): The unit ID of each quantity.
+            to_units (ArrayLike): The unit ID to convert each quantity to.
+            ingredients (Optional[ArrayLike]): The ingredient ID of each quantity, None for none.
+
+        Returns:
+            np.ndarray: The converted quantities, NaN where the units are not connected.
+        """
+        if ingredients is not None:
+            ingredients = [NO_INGREDIENT if ingredient is None else ingredient
+                           for ingredient in ingredients]
+        return get_conversion_graph().convert(quantities, from_units, to_units, ingredients)
@@ -2,8 +2,54 @@
 Module for user service class and methods for user management.
 """
 
-from peewee import DoesNotExist
-from config.database import UserModel
+import logging
+import os
+from typing import Iterator, Optional
+from dotenv import load_dotenv
+from peewee import DoesNotExist, IntegrityError
+from config.database import UserModel, database, iterate_unbuffered
+from helpers.cache import create_cache
+
+# Load environment variables
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Read-through cache of user rows, keyed by ID
+user_cache = create_cache(
+    "user",
+    ttl=float(os.getenv("USER_CACHE_TTL", "60")),
+    max_size=int(os.getenv("USER_CACHE_MAX_SIZE", "10000")),
+)
+
+
+# Columns returned to clients; the password hash never leaves the service
+PUBLIC_USER_FIELDS = (
+    UserModel.id,
+    UserModel.username,
+    UserModel.email,
+    UserModel.phone_number,
+    UserModel.profile_picture,
+    UserModel.creation_date,
+    UserModel.update_date,
+)
+
+
+class UserAlreadyExistsError(ValueError):
+    """Raised when a username or email is already taken by another user."""
+
+
+def _user_row(user_data: UserModel) -> dict:
+    """Return the column values written for a user."""
+    return {
+        "username": user_data.username,
+        "email": user_data.email,
+        "password": user_data.password,
+        "phone_number": user_data.phone_number,
+        "profile_picture": user_data.profile_picture,  # Nullable field
+        "creation_date": user_data.creation_date,
+        "update_date": user_data.update_date,
+    }
 
 
 class UserService:
@@ -12,14 +58,19 @@ class UserService:
 
     Methods:
         create_user(user_data: UserModel): Create a new user in the database.
+        filter_new_users(rows: list): Drop the repeated or taken usernames of a chunk.
+        create_users_chunk(rows: list): Create a chunk of users in one transaction.
         get_user_by_id(id_user: int): Get a user by its ID.
-        get_all_users(): Get all users from the database.
+        get_user_by_username(username: str): Get a user by its username.
+        get_users_page(after_id: int, limit: int): Get one page of users by keyset.
+        iter_users(): Stream all users from the database.
         update_user(user_data: UserModel): Update a user in the database.
+        update_password_hash(id_user: int, password_hash: str): Replace a stored password hash.
         delete_user(id_user: int): Delete a user from the database.
 
     Raises:
-        ValueError: If the user already exists.
-        DoesNotExist: If the user does not exist.
+        UserAlreadyExistsError: If the username or email is already taken.
+        ValueError: If the user does not exist.
     """
 
     @staticmethod
@@ -27,6 +78,9 @@ class UserService:
         """
         Create a new user in the database.
 
+        The unique indexes on `username` and `email` reject duplicates, so the
+        user is written with a single INSERT and no prior lookup.
+
         Args:
             user_data (UserModel): The user object to be created.
 
@@ -34,59 +88,193 @@ class UserService:
             UserModel: The created user object.
 
         Raises:
-            ValueError: If the user already exists.
-        """
-        # Check if the user already exists
-        if UserModel.select().where(UserModel.username == user_data.username).exists():
-            raise ValueError("User already exists")
-
-        # Create a new user record
-        new_user = UserModel(
-            username=user_data.username,
-            email=user_data.email,
-            password=user_data.password,
-            phone_number=user_data.phone_number,
-            profile_picture=user_data.profile_picture,  # Nullable field
-            creation_date=user_data.creation_date,
-            update_date=user_data.update_date
-        )
-        new_user.save()
-        return new_user
+            UserAlreadyExistsError: If the username or email is already taken.
+        """
+        row = _user_row(user_data)
+        try:
+            id_user = UserModel.insert(row).execute()
+        except IntegrityError as exc:
+            raise UserAlreadyExistsError("User already exists") from exc
+        return UserModel(id=id_user, **row)
+
+    @staticmethod
+    def filter_new_users(
+            rows: list[tuple[int, UserModel]]) -> tuple[list[tuple[int, UserModel]], list[dict]]:
+        """
+        Drop the users of a chunk whose username is repeated or already taken.
+
+        Usernames are checked against the database with a single query, so
+        passwords are only hashed for users that can be created.
+
+        Args:
+            rows (list[tuple[int, UserModel]]): The users to create, each paired
+                with its position in the request.
+
+        Returns:
+            tuple[list[tuple[int, UserModel]], list[dict]]: The users left to
+            create and the rejected rows as dicts with `index`, `username` and `error`.
+        """
+        failures = []
+        candidates = {}
+        for index, user_data in rows:
+            if user_data.username in candidates:
+                failures.append({"index": index, "username": user_data.username,
+                                 "error": "Duplicate username in request"})
+            else:
+                candidates[user_data.username] = (index, user_data)
+
+        if not candidates:
+            return [], failures
+
+        existing = {
+            username for (username,) in UserModel
+            .select(UserModel.username)
+            .where(UserModel.username.in_(list(candidates)))
+            .tuples()
+        }
+        pending = []
+        for username, (index, user_data) in candidates.items():
+            if username in existing:
+                failures.append({"index": index, "username": username,
+                                 "error": "User already exists"})
+            else:
+                pending.append((index, user_data))
+        return pending, failures
+
+    @staticmethod
+    def create_users_chunk(rows: list[tuple[int, UserModel]]) -> tuple[int, list[dict]]:
+        """
+        Create a chunk of users in one transaction.
+
+        The rows are inserted with one multi-row insert. If that insert is
+        rejected (e.g. a concurrent request took a username), the rows are retried
+        one by one in savepoints so a bad row does not abort the chunk. The
+        database error of a rejected row is logged, not returned to the client.
+
+        Args:
+            rows (list[tuple[int, UserModel]]): The users to create, each paired
+                with its position in the request, as left by `filter_new_users`.
+
+        Returns:
+            tuple[int, list[dict]]: The number of users created and the rejected
+            rows as dicts with `index`, `username` and `error`.
+        """
+        failures = []
+        created = 0
+        if not rows:
+            return created, failures
+        with database.atomic():
+            try:
+                with database.atomic():
+                    UserModel.insert_many([_user_row(user_data) for _, user_data in rows]).execute()
+                created = len(rows)
+            except IntegrityError:
+                for index, user_data in rows:
+                    try:
+                        with database.atomic():
+                            UserModel.insert(_user_row(user_data)).execute()
+                        created += 1
+                    except IntegrityError:
+                        logger.warning("Bulk insert of user %r rejected.", user_data.username,
+                                       exc_info=True)
+                        failures.append({"index": index, "username": user_data.username,
+                                         "error": "User already exists"})
+        return created, failures
 
     @staticmethod
     def get_user_by_id(id_user: int) -> UserModel:
         """
-        Get a user by their ID.
+        Get a user by their ID, reading through the user cache.
+
+        Only the public columns are loaded and cached, so the password hash is
+        never stored in a shared cache backend.
 
         Args:
             id_user (int): The ID of the user.
 
+        Returns:
+            UserModel: The user object, without its password.
+
+        Raises:
+            ValueError: If the user does not exist.
+        """
+        cached = user_cache.get(id_user)
+        if cached is not None:
+            return UserModel(**cached)
+        version = user_cache.version(id_user)
+        try:
+            row = (UserModel
+                   .select(*PUBLIC_USER_FIELDS)
+                   .where(UserModel.id == id_user)
+                   .dicts()
+                   .get())
+        except DoesNotExist as exc:
+            raise ValueError("User does not exist") from exc
+        user_cache.set(id_user, row, version=version)
+        return UserModel(**row)
+
+    @staticmethod
+    def get_user_by_username(username: str) -> UserModel:
+        """
+        Get a user by their username.
+
+        Args:
+            username (str): The username of the user.
+
         Returns:
             UserModel: The user object.
 
         Raises:
-            DoesNotExist: If the user does not exist.
+            ValueError: If the user does not exist.
         """
         try:
-            return UserModel.get(UserModel.id == id_user)
+            return UserModel.get(UserModel.username == username)
         except DoesNotExist as exc:
             raise ValueError("User does not exist") from exc
 
     @staticmethod
-    def get_all_users() -> list[UserModel]:
+    def get_users_page(after_id: Optional[int], limit: int) -> tuple[list[dict], Optional[int]]:
         """
-        Get all users from the database.
+        Get one page of users ordered by ID, using the last seen ID as cursor.
+
+        Rows are returned as plain dicts, without building model instances or
+        selecting password hashes.
+
+        Args:
+            after_id (Optional[int]): Only users with a greater ID are returned.
+            limit (int): The maximum number of users in the page.
 
         Returns:
-            list[UserModel]: A list of user objects.
+            tuple[list[dict], Optional[int]]: The user rows of the page and the
+            cursor of the next page, or None when there are no more users.
+        """
+        query = UserModel.select(*PUBLIC_USER_FIELDS).order_by(UserModel.id).limit(limit + 1)
+        if after_id is not None:
+            query = query.where(UserModel.id > after_id)
+        users = list(query.dicts())
+        if len(users) > limit:
+            return users[:limit], users[limit - 1]["id"]
+        return users, None
+
+    @staticmethod
+    def iter_users() -> Iterator[dict]:
         """
-        users = list(UserModel.select())
-        return users
-    
+        Stream all users from the database without loading them into memory.
+
+        Password hashes are not selected.
+
+        Yields:
+            dict: One user row, keyed by column name.
+        """
+        yield from iterate_unbuffered(UserModel.select(*PUBLIC_USER_FIELDS).order_by(UserModel.id))
+
     @staticmethod
     def update_user(id_user: int, user_data: UserModel) -> UserModel:
         """
-        Update a user in the database.
+        Update a user in the database with a single UPDATE statement.
+
+        The creation date is never changed; the returned object echoes the
+        submitted data.
 
         Args:
             id_user (int): The ID of the user to be updated.
@@ -96,41 +284,46 @@ class UserService:
             UserModel: The updated user object.
 
         Raises:
-            DoesNotExist: If the user does not exist.
+            UserAlreadyExistsError: If the new username or email is already taken.
+            ValueError: If the user does not exist.
         """
+        row = _user_row(user_data)
         try:
-            # Fetch the existing user
-            existing_user = UserModel.get(UserModel.id == id_user)
-
-            # Update user details
-            existing_user.username = user_data.username
-            existing_user.email = user_data.email
-            existing_user.phone_number = user_data.phone_number
-            existing_user.password = user_data.password
-            existing_user.profile_picture = user_data.profile_picture  # Nullable field
-
-            # Save updated user to the database
-            existing_user.save()
-            return existing_user
-        except DoesNotExist as exc:
-            raise ValueError("User does not exist") from exc
+            updated = (UserModel
+                       .update({key: value for key, value in row.items() if key != "creation_date"})
+                       .where(UserModel.id == id_user)
+                       .execute())
+        except IntegrityError as exc:
+            raise UserAlreadyExistsError("Username or email already in use") from exc
+        user_cache.delete(id_user)
+        if not updated:
+            raise ValueError("User does not exist")
+        return UserModel(id=id_user, **row)
+
+    @staticmethod
+    def update_password_hash(id_user: int, password_hash: str) -> None:
+        """
+        Replace the stored password hash of a user, e.g. after a cost change.
+
+        Args:
+            id_user (int): The ID of the user.
+            password_hash (str): The new password hash.
+        """
+        UserModel.update(password=password_hash).where(UserModel.id == id_user).execute()
+        user_cache.delete(id_user)
 
     @staticmethod
     def delete_user(id_user: int) -> None:
         """
-        Delete a user from the database.
+        Delete a user from the database with a single DELETE statement.
 
         Args:
             id_user (int): The ID of the user to be deleted.
 
         Raises:
-            DoesNotExist: If the user does not exist.
+            ValueError: If the user does not exist.
         """
-        try:
-            # Fetch the user to be deleted
-            user = UserModel.get(UserModel.id == id_user)
-            # Delete the user instance from the database
-            user.delete_instance()
-        except DoesNotExist as exc:
-            raise ValueError("User does not exist") from exc
-        
\ No newline at end of file
+        deleted = UserModel.delete().where(UserModel.id == id_user).execute()
+        user_cache.delete(id_user)
+        if not deleted:
+            raise ValueError("User does not exist")
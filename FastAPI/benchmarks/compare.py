@@ -0,0 +1,53 @@
+"""
+compare.py
+
+Compare two result files written by `run_benchmark.py`.
+
+Usage (from the FastAPI directory):
+    python benchmarks/compare.py benchmarks/results/BASE.json benchmarks/results/NEW.json
+"""
+
+import argparse
+import json
+
+METRICS = ("throughput_rps", "p50_ms", "p95_ms", "p99_ms")
+
+
+def load(path: str) -> dict:
+    """Load a result file and index its results by operation."""
+    with open(path, encoding="utf-8") as handle:
+        report = json.load(handle)
+    report["results"] = {result["operation"]: result for result in report["results"]}
+    return report
+
+
+def change(base: float, new: float) -> str:
+    """Format the relative change between two measurements."""
+    if not base:
+        return "n/a"
+    return f"{(new - base) / base * 100:+.1f}%"
+
+
+def main():
+    """Print a table of every metric of both runs and their relative change."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n", maxsplit=1)[0])
+    parser.add_argument("base")
+    parser.add_argument("new")
+    args = parser.parse_args()
+
+    base, new = load(args.base), load(args.new)
+    print(f"base: {base['commit']} ({base['timestamp']})")
+    print(f"new:  {new['commit']} ({new['timestamp']})")
+    print(f"{'operation':<10} {'metric':<15} {'base':>12} {'new':>12} {'change':>9}")
+    for operation, base_result in base["results"].items():
+        new_result = new["results"].get(operation)
+        if new_result is None:
+            continue
+        for metric in METRICS:
+            print(f"{operation:<10} {metric:<15} {base_result[metric]:>12} "
+                  f"{new_result[metric]:>12} "
+                  f"{change(base_result[metric], new_result[metric]):>9}")
+
+
+if __name__ == "__main__":
+    main()
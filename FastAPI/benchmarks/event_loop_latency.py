@@ -0,0 +1,125 @@
+"""
+event_loop_latency.py
+
+Benchmark showing how blocking ORM calls inside `async def` handlers affect the
+latency of every other request served by the same worker.
+
+Two small applications are driven with the same concurrent load: one calls a
+blocking stand-in for a slow query directly from the handler (the previous
+behaviour of the user routes) and one runs it through `run_in_db_executor`.
+The p50/p95/p99 latency of a cheap endpoint served alongside them is reported.
+
+Usage (from the FastAPI directory):
+    python benchmarks/event_loop_latency.py --requests 400 --rate 200
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+
+import httpx
+from fastapi import FastAPI
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "app"))
+
+from helpers.db_executor import run_in_db_executor  # noqa: E402  pylint: disable=wrong-import-position
+
+
+def slow_query(delay: float) -> int:
+    """Blocking stand-in for a slow Peewee query."""
+    time.sleep(delay)
+    return 1
+
+
+def build_app(offload: bool, delay: float) -> FastAPI:
+    """
+    Build an application serving a slow and a fast endpoint.
+
+    Args:
+        offload (bool): Whether the slow endpoint runs on the database thread pool.
+        delay (float): Seconds the slow endpoint blocks for.
+
+    Returns:
+        FastAPI: The application under test.
+    """
+    bench_app = FastAPI()
+
+    @bench_app.get("/slow")
+    async def slow():
+        if offload:
+            return {"value": await run_in_db_executor(slow_query, delay)}
+        return {"value": slow_query(delay)}
+
+    @bench_app.get("/fast")
+    async def fast():
+        return {"value": 0}
+
+    return bench_app
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    """Return the `pct` percentile of `samples` in milliseconds."""
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index] * 1000
+
+
+async def run(offload: bool, args) -> dict:
+    """
+    Drive one application with interleaved slow and fast requests.
+
+    Requests are issued open-loop at a fixed arrival rate and latency is taken
+    from the scheduled start, so time spent waiting for a blocked event loop
+    is counted.
+
+    Returns:
+        dict: Latency percentiles of the fast endpoint.
+    """
+    transport = httpx.ASGITransport(app=build_app(offload, args.delay))
+    latencies: list[float] = []
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        loop = asyncio.get_running_loop()
+        origin = loop.time()
+
+        async def one(index: int):
+            scheduled = origin + index / args.rate
+            await asyncio.sleep(max(0.0, scheduled - loop.time()))
+            if index % 2:
+                await client.get("/slow")
+                return
+            await client.get("/fast")
+            latencies.append(loop.time() - scheduled)
+
+        await asyncio.gather(*(one(i) for i in range(args.requests)))
+        elapsed = loop.time() - origin
+
+    return {
+        "mode": "thread_pool" if offload else "inline",
+        "requests": args.requests,
+        "rate_per_second": args.rate,
+        "elapsed_seconds": round(elapsed, 3),
+        "fast_p50_ms": round(statistics.median(latencies) * 1000, 2),
+        "fast_p95_ms": round(percentile(latencies, 95), 2),
+        "fast_p99_ms": round(percentile(latencies, 99), 2),
+    }
+
+
+def main():
+    """Run the benchmark before and after offloading and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n", maxsplit=1)[0])
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--rate", type=float, default=200.0, help="requests per second")
+    parser.add_argument("--delay", type=float, default=0.02, help="seconds per slow query")
+    args = parser.parse_args()
+
+    results = [asyncio.run(run(False, args)), asyncio.run(run(True, args))]
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,230 @@
+"""
+nutrition_client.py
+
+Check the nutrition API client against a local stub server.
+
+The stub serves the `/foods` endpoint the client expects on a free port,
+counting the requests it receives, the IDs asked for and how many requests
+are in flight at once. Each check drives a fresh client and verifies one
+behaviour: concurrent lookups of the same ID share one request, IDs are sent
+in batches of at most the batch size, no more requests than the concurrency
+cap are in flight, cached answers are reused until their TTL expires, and a
+throttled request is retried after a capped delay. The script exits with a
+non-zero status if any check fails.
+
+Usage (from the FastAPI directory):
+    python benchmarks/nutrition_client.py
+"""
+
+import argparse
+import asyncio
+import math
+import os
+import sys
+import tempfile
+import threading
+import time
+
+import uvicorn
+from fastapi import FastAPI, Query, Response
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+APP_DIR = os.path.join(BENCHMARK_DIR, "..", "app")
+
+sys.path.insert(0, APP_DIR)
+
+# pylint: disable-next=wrong-import-position
+from helpers.nutrition_client import NutritionCache, NutritionClient  # noqa: E402
+
+
+class StubStats:
+    """What the stub server received."""
+
+    def __init__(self):
+        self.requests: list[list[str]] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.throttle_next = 0
+
+    def reset(self) -> None:
+        """Forget the requests received so far."""
+        self.requests.clear()
+        self.max_in_flight = 0
+
+
+def build_stub(stats: StubStats, delay: float) -> FastAPI:
+    """
+    Build the stub nutrition API.
+
+    IDs starting with "unknown" are left out of the answers; the others have
+    as many calories as characters.
+
+    Args:
+        stats (StubStats): Where the received requests are recorded.
+        delay (float): Seconds each answer takes.
+
+    Returns:
+        FastAPI: The stub application.
+    """
+    stub = FastAPI()
+
+    @stub.get("/foods")
+    async def foods(ids: str = Query(...)):
+        if stats.throttle_next:
+            stats.throttle_next -= 1
+            return Response(status_code=429, headers={"Retry-After": "3600"})
+        batch = ids.split(",")
+        stats.requests.append(batch)
+        stats.in_flight += 1
+        stats.max_in_flight = max(stats.max_in_flight, stats.in_flight)
+        try:
+            await asyncio.sleep(delay)
+        finally:
+            stats.in_flight -= 1
+        return {"foods": [{"id": api_id, "calories": float(len(api_id))}
+                          for api_id in batch if not api_id.startswith("unknown")]}
+
+    return stub
+
+
+def start_stub(stub: FastAPI) -> tuple[uvicorn.Server, str]:
+    """
+    Serve the stub on a free local port from a background thread.
+
+    Returns:
+        tuple[uvicorn.Server, str]: The server, to stop it, and its base URL.
+    """
+    server = uvicorn.Server(uvicorn.Config(stub, host="127.0.0.1", port=0, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    port = server.servers[0].sockets[0].getsockname()[1]
+    return server, f"http://127.0.0.1:{port}"
+
+
+def make_client(base_url: str, args, cache_ttl: float = 60.0, timeout: float = 5.0,
+                batch_delay: float = 0.01) -> NutritionClient:
+    """Create a client with a cache file of its own."""
+    cache_path = os.path.join(tempfile.mkdtemp(prefix="recipe-nutrition-"), "cache.sqlite3")
+    return NutritionClient(base_url, "", NutritionCache(cache_path, cache_ttl),
+                           batch_size=args.batch_size, batch_delay=batch_delay,
+                           concurrency=args.concurrency, timeout=timeout, retries=1)
+
+
+def expected(api_ids) -> dict:
+    """Return the answers the stub gives for API IDs."""
+    return {api_id: None if api_id.startswith("unknown") else float(len(api_id))
+            for api_id in api_ids}
+
+
+async def check_coalescing(base_url: str, stats: StubStats, args) -> tuple[bool, str]:
+    """Concurrent lookups of the same IDs must share their requests."""
+    client = make_client(base_url, args)
+    api_ids = [f"shared-{index}" for index in range(args.batch_size)] + ["unknown-1"]
+    try:
+        results = await asyncio.gather(*(client.lookup(api_ids) for _ in range(args.lookups)))
+    finally:
+        await client.aclose()
+    asked = [api_id for batch in stats.requests for api_id in batch]
+    ok = all(result == expected(api_ids) for result in results) and sorted(asked) == sorted(api_ids)
+    return ok, f"{args.lookups} lookups of {len(api_ids)} IDs sent {len(asked)} IDs"
+
+
+async def check_batching(base_url: str, stats: StubStats, args) -> tuple[bool, str]:
+    """Distinct IDs asked for within the batch delay must be sent in full batches."""
+    # Long enough for every lookup to read the cache before the first batch is due
+    client = make_client(base_url, args, batch_delay=0.5)
+    api_ids = [f"batch-{index}" for index in range(args.ids)]
+    try:
+        results = await asyncio.gather(*(client.lookup([api_id]) for api_id in api_ids))
+    finally:
+        await client.aclose()
+    sizes = [len(batch) for batch in stats.requests]
+    ok = (all(result == expected([api_id]) for result, api_id in zip(results, api_ids))
+          and len(sizes) == math.ceil(args.ids / args.batch_size) and max(sizes) <= args.batch_size)
+    return ok, f"{args.ids} IDs in {len(sizes)} requests of at most {max(sizes)} IDs"
+
+
+async def check_concurrency(base_url: str, stats: StubStats, args) -> tuple[bool, str]:
+    """No more requests than the concurrency cap may be in flight."""
+    client = make_client(base_url, args)
+    try:
+        await client.lookup([f"cap-{index}" for index in range(args.ids)])
+    finally:
+        await client.aclose()
+    ok = stats.max_in_flight <= args.concurrency and len(stats.requests) > args.concurrency
+    return ok, (f"{len(stats.requests)} requests, at most {stats.max_in_flight} in flight "
+                f"(cap {args.concurrency})")
+
+
+async def check_cache_ttl(base_url: str, stats: StubStats, args) -> tuple[bool, str]:
+    """Answers, unknown IDs included, must be reused until their TTL expires."""
+    ttl = 0.5
+    client = make_client(base_url, args, cache_ttl=ttl)
+    api_ids = ["cached-1", "unknown-2"]
+    try:
+        await client.lookup(api_ids)
+        first = len(stats.requests)
+        cached = await client.lookup(api_ids)
+        second = len(stats.requests) - first
+        await asyncio.sleep(ttl * 1.5)
+        await client.lookup(api_ids)
+        third = len(stats.requests) - first - second
+    finally:
+        await client.aclose()
+    ok = first == 1 and second == 0 and third == 1 and cached == expected(api_ids)
+    return ok, f"requests: {first} on a miss, {second} within the TTL, {third} after it"
+
+
+async def check_retry_after_cap(base_url: str, stats: StubStats, args) -> tuple[bool, str]:
+    """A throttled request must be retried within the client timeout, whatever Retry-After says."""
+    timeout = 0.5
+    client = make_client(base_url, args, timeout=timeout)
+    stats.throttle_next = 1
+    start = time.perf_counter()
+    try:
+        result = await client.lookup(["retried-1"])
+    finally:
+        await client.aclose()
+    elapsed = time.perf_counter() - start
+    ok = result == expected(["retried-1"]) and elapsed < timeout + 1.0
+    return ok, f"answered after {elapsed:.2f}s despite Retry-After: 3600 (timeout {timeout}s)"
+
+
+CHECKS = {
+    "coalescing": check_coalescing,
+    "batching": check_batching,
+    "concurrency": check_concurrency,
+    "cache_ttl": check_cache_ttl,
+    "retry_after_cap": check_retry_after_cap,
+}
+
+
+def main():
+    """Start the stub, run every check against it and report the results."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n", maxsplit=1)[0])
+    parser.add_argument("--ids", type=int, default=100, help="distinct IDs of the batching checks")
+    parser.add_argument("--lookups", type=int, default=20,
+                        help="concurrent lookups of the coalescing check")
+    parser.add_argument("--batch-size", type=int, default=10)
+    parser.add_argument("--concurrency", type=int, default=3)
+    parser.add_argument("--delay", type=float, default=0.05,
+                        help="seconds the stub takes per request")
+    args = parser.parse_args()
+
+    stats = StubStats()
+    server, base_url = start_stub(build_stub(stats, args.delay))
+    failed = False
+    try:
+        for name, check in CHECKS.items():
+            stats.reset()
+            ok, detail = asyncio.run(check(base_url, stats, args))
+            failed |= not ok
+            print(f"{'ok' if ok else 'FAIL':<5}{name}: {detail}")
+    finally:
+        server.should_exit = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+query_budget.py
+
+Check that service calls run a fixed number of queries whatever the size of
+the data they load.
+
+Recipes with growing numbers of ingredients and categories are seeded in a
+temporary SQLite database; every checked call must run the same number of
+queries for each of them, and no more than its budget. The script exits with
+a non-zero status if any call does not.
+
+Usage (from the FastAPI directory):
+    python benchmarks/query_budget.py --sizes 1 10 100
+"""
+
+import argparse
+import datetime
+import os
+import sys
+import tempfile
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+APP_DIR = os.path.join(BENCHMARK_DIR, "..", "app")
+
+sys.path.insert(0, APP_DIR)
+
+# Maximum number of queries of each checked call.
+BUDGETS = {
+    "get_recipe_detail": 3,
+}
+
+
+def parse_args():
+    """Parse the command line options."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n", maxsplit=1)[0])
+    parser.add_argument("--sizes", nargs="+", type=int, default=[1, 10, 100],
+                        help="ingredients and categories per seeded recipe")
+    return parser.parse_args()
+
+
+def configure_environment() -> None:
+    """Point the application at a fresh SQLite database before it is imported."""
+    os.environ["DATABASE_ENGINE"] = "sqlite"
+    os.environ["SQLITE_PATH"] = os.path.join(tempfile.mkdtemp(prefix="recipe-queries-"),
+                                             "queries.db")
+    os.environ["CACHE_BACKEND"] = "local"
+
+
+def seed_recipe(size: int) -> int:
+    """
+    Insert a recipe with `size` ingredients and `size` categories.
+
+    Returns:
+        int: The ID of the recipe.
+    """
+    import config.database as db  # pylint: disable=import-outside-toplevel
+
+    today = datetime.date.today()
+    with db.database.atomic():
+        unit = db.UnitModel.create(name="gram", abbreviation="g")
+        recipe = db.RecipeModel.create(title=f"Recipe with {size} ingredients", is_public=True,
+                                       creation_date=today, update_date=today)
+        for index in range(size):
+            ingredient = db.IngredientModel.create(name=f"ingredient-{size}-{index}",
+                                                   calories_per_unit=1,
+                                                   creation_date=today, update_date=today)
+            db.RecipeIngredientModel.create(recipe=recipe, ingredient=ingredient,
+                                            quantity=index + 1,
+                                            unit=unit if index % 2 else None,
+                                            creation_date=today, update_date=today)
+            category = db.RecipeCategoryModel.create(name=f"category-{size}-{index}")
+            db.RecipeCategoryBridgeModel.create(recipe=recipe, category=category)
+    return recipe.id
+
+
+def count_queries(function, *args) -> int:
+    """Run `function(*args)` and return the number of queries it executed."""
+    import config.database as db  # pylint: disable=import-outside-toplevel
+
+    count = 0
+
+    def listener(_sql, _duration):
+        nonlocal count
+        count += 1
+
+    db.add_query_listener(listener)
+    try:
+        function(*args)
+    finally:
+        db.remove_query_listener(listener)
+    return count
+
+
+def main():
+    """Seed the recipes and check the query count of every checked call."""
+    args = parse_args()
+    configure_environment()
+    from run_benchmark import create_schema  # pylint: disable=import-outside-toplevel
+    import config.database as db  # pylint: disable=import-outside-toplevel
+    from services.recipe_service import RecipeService  # pylint: disable=import-outside-toplevel
+
+    create_schema()
+    failed = False
+    with db.database.connection_context():
+        recipe_ids = {size: seed_recipe(size) for size in args.sizes}
+        for name, budget in BUDGETS.items():
+            counts = {size: count_queries(getattr(RecipeService, name), recipe_id)
+                      for size, recipe_id in recipe_ids.items()}
+            ok = len(set(counts.values())) == 1 and max(counts.values()) <= budget
+            failed |= not ok
+            print(f"{'ok' if ok else 'FAIL':<5}{name}: {counts} (budget {budget})")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
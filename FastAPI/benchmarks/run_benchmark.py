@@ -0,0 +1,254 @@
+"""
+run_benchmark.py
+
+Reproducible benchmark of the `/users` routes.
+
+The FastAPI application is run in-process against a seeded SQLite database
+standing in for MySQL (DATABASE_ENGINE=sqlite). Every operation is driven by a
+fixed number of concurrent clients; throughput and p50/p95/p99 latency are
+reported and saved as JSON together with the commit they were measured on, so
+runs can be compared with `benchmarks/compare.py`.
+
+Usage (from the FastAPI directory):
+    python benchmarks/run_benchmark.py --users 10000 --requests 2000 --concurrency 50
+"""
+
+import argparse
+import asyncio
+import datetime
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+APP_DIR = os.path.join(BENCHMARK_DIR, "..", "app")
+RESULTS_DIR = os.path.join(BENCHMARK_DIR, "results")
+OPERATIONS = ("create", "get", "list", "update", "delete")
+
+sys.path.insert(0, APP_DIR)
+
+
+def parse_args():
+    """Parse the command line options."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n", maxsplit=1)[0])
+    parser.add_argument("--users", type=int, default=10000, help="users seeded before the run")
+    parser.add_argument("--requests", type=int, default=2000, help="requests per operation")
+    parser.add_argument("--concurrency", type=int, default=50, help="concurrent clients")
+    parser.add_argument("--operations", nargs="+", choices=OPERATIONS, default=list(OPERATIONS))
+    parser.add_argument("--db-path", default=None, help="SQLite file (a temporary one by default)")
+    parser.add_argument("--password-memory-cost", type=int, default=None,
+                        help="override PASSWORD_HASH_MEMORY_COST (KiB) for the run")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default=None, help="where to write the JSON results")
+    return parser.parse_args()
+
+
+def configure_environment(args) -> str:
+    """
+    Point the application at a fresh SQLite database before it is imported.
+
+    Returns:
+        str: The path of the SQLite file.
+    """
+    db_path = args.db_path or os.path.join(tempfile.mkdtemp(prefix="recipe-bench-"), "bench.db")
+    if os.path.exists(db_path):
+        os.remove(db_path)
+    os.environ["DATABASE_ENGINE"] = "sqlite"
+    os.environ["SQLITE_PATH"] = db_path
+    os.environ["CACHE_BACKEND"] = "local"
+    # The benchmark client must not be throttled by its own API key.
+    os.environ["API_KEY_RATE_LIMIT"] = "1000000000"
+    os.environ["API_KEY_BURST"] = "1000000000"
+    if args.password_memory_cost is not None:
+        os.environ["PASSWORD_HASH_MEMORY_COST"] = str(args.password_memory_cost)
+    return db_path
+
+
+def create_schema() -> None:
+    """Create every table of the Peewee models."""
+    from peewee import Model  # pylint: disable=import-outside-toplevel
+    import config.database as db  # pylint: disable=import-outside-toplevel
+
+    models = [value for value in vars(db).values()
+              if isinstance(value, type) and issubclass(value, Model) and value is not Model]
+    with db.database.connection_context():
+        db.database.create_tables(models)
+
+
+def user_payload(index: int, password: str = "benchmark-password") -> dict:
+    """Return the request body of a benchmark user."""
+    return {
+        "id": 0,
+        "username": f"bench-user-{index}",
+        "email": f"bench-user-{index}@example.com",
+        "password": password,
+        "phone_number": "3000000000",
+        "profile_picture": None,
+        "creation_date": "2024-01-01",
+        "update_date": "2024-01-01",
+    }
+
+
+async def seed_users(count: int) -> None:
+    """Insert `count` users sharing one pre-computed password hash."""
+    from config.database import UserModel, database  # pylint: disable=import-outside-toplevel
+    from services.password_service import PasswordService  # pylint: disable=import-outside-toplevel
+
+    password_hash = await PasswordService.hash_password("benchmark-password")
+    rows = []
+    for index in range(count):
+        row = user_payload(index, password_hash)
+        del row["id"]
+        rows.append(row)
+    with database.connection_context():
+        with database.atomic():
+            for start in range(0, len(rows), 500):
+                UserModel.insert_many(rows[start:start + 500]).execute()
+
+
+def summarize(operation: str, latencies: list[float], errors: int, elapsed: float) -> dict:
+    """Compute throughput and latency percentiles of one operation."""
+    ordered = sorted(latencies)
+
+    def percentile(pct: float) -> float:
+        if not ordered:
+            return 0.0
+        index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+        return round(ordered[index] * 1000, 3)
+
+    return {
+        "operation": operation,
+        "requests": len(latencies) + errors,
+        "errors": errors,
+        "elapsed_seconds": round(elapsed, 3),
+        "throughput_rps": round((len(latencies) + errors) / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": percentile(50),
+        "p95_ms": percentile(95),
+        "p99_ms": percentile(99),
+    }
+
+
+async def drive(client, operation: str, requests: list[tuple], concurrency: int) -> dict:
+    """
+    Send the given requests with `concurrency` concurrent clients.
+
+    Args:
+        client (httpx.AsyncClient): The client bound to the application.
+        operation (str): The name of the operation, for the report.
+        requests (list[tuple]): (method, url, json body, expected status) tuples.
+        concurrency (int): The number of concurrent clients.
+
+    Returns:
+        dict: The summary of the operation.
+    """
+    queue = list(reversed(requests))
+    latencies: list[float] = []
+    errors = 0
+
+    async def worker():
+        nonlocal errors
+        while queue:
+            method, url, body, expected = queue.pop()
+            start = time.perf_counter()
+            response = await client.request(method, url, json=body)
+            elapsed = time.perf_counter() - start
+            if response.status_code == expected:
+                latencies.append(elapsed)
+            else:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(operation, latencies, errors, time.perf_counter() - start)
+
+
+def build_requests(operation: str, args, rng: random.Random) -> list[tuple]:
+    """Build the requests of one operation against the seeded data."""
+    created = range(args.users, args.users + args.requests)
+    if operation == "create":
+        return [("POST", "/users/user", user_payload(i), 201) for i in created]
+    if operation == "get":
+        return [("GET", f"/users/user/{rng.randint(1, args.users)}", None, 200)
+                for _ in range(args.requests)]
+    if operation == "list":
+        last_page = max(0, args.users - 100)
+        return [("GET", f"/users/users?limit=100&after_id={rng.randint(0, last_page)}", None, 200)
+                for _ in range(args.requests)]
+    if operation == "update":
+        return [("PUT", f"/users/user/{user_id}", user_payload(user_id - 1), 200)
+                for user_id in (rng.randint(1, args.users) for _ in range(args.requests))]
+    # Delete the users seeded last, so the other operations keep their data.
+    return [("DELETE", f"/users/user/{user_id}", None, 200)
+            for user_id in range(args.users, max(0, args.users - args.requests), -1)]
+
+
+async def run(args) -> list[dict]:
+    """Seed the database, start the application and drive every operation."""
+    import httpx  # pylint: disable=import-outside-toplevel
+    from main import app  # pylint: disable=import-outside-toplevel
+    from helpers.api_key_auth import API_KEY  # pylint: disable=import-outside-toplevel
+
+    create_schema()
+    await seed_users(args.users)
+    rng = random.Random(args.seed)
+    results = []
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench",
+                                     headers={"x-api-key": API_KEY or ""}, timeout=None) as client:
+            for operation in args.operations:
+                result = await drive(client, operation, build_requests(operation, args, rng),
+                                     args.concurrency)
+                print(json.dumps(result))
+                results.append(result)
+    return results
+
+
+def git_commit() -> str:
+    """Return the commit the benchmark runs on, or 'unknown' outside of git."""
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BENCHMARK_DIR,
+                              check=True, capture_output=True, text=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def main():
+    """Run the benchmark and save the results as JSON."""
+    args = parse_args()
+    db_path = configure_environment(args)
+    results = asyncio.run(run(args))
+
+    commit = git_commit()
+    report = {
+        "commit": commit,
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "database": {"engine": "sqlite", "path": db_path},
+        "parameters": {
+            "users": args.users,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "seed": args.seed,
+            "password_memory_cost": os.environ.get("PASSWORD_HASH_MEMORY_COST"),
+        },
+        "results": results,
+    }
+    output = args.output
+    if output is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        stamp = datetime.datetime.now().strftime("%Y%m%d-%H%M%S")
+        output = os.path.join(RESULTS_DIR, f"{stamp}-{commit}.json")
+    with open(output, "w", encoding="utf-8") as handle:
+        json.dump(report, handle, indent=2)
+    print(f"Results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
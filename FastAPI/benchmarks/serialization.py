@@ -0,0 +1,154 @@
+"""
+serialization.py
+
+Benchmark comparing the two ways of serializing large list responses.
+
+The same page of users is served by two endpoints of a small application: one
+returns Peewee model instances validated through the `UserPage` response model
+(the previous behaviour of `GET /users/users`) and one returns `.dicts()` rows
+encoded by a precompiled TypeAdapter. Both bodies are checked to be equal, and
+the rows per second of each are reported.
+
+Usage (from the FastAPI directory):
+    python benchmarks/serialization.py --rows 10000 --repeats 5
+"""
+
+import argparse
+import asyncio
+import datetime
+import json
+import os
+import sys
+import tempfile
+import time
+
+import httpx
+from fastapi import FastAPI
+from pydantic import TypeAdapter
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+APP_DIR = os.path.join(BENCHMARK_DIR, "..", "app")
+
+sys.path.insert(0, APP_DIR)
+
+# Users inserted per statement while seeding.
+SEED_CHUNK_SIZE = 500
+
+
+def parse_args():
+    """Parse the command line options."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n", maxsplit=1)[0])
+    parser.add_argument("--rows", type=int, default=10000, help="users per response")
+    parser.add_argument("--repeats", type=int, default=5, help="requests per mode")
+    return parser.parse_args()
+
+
+def configure_environment() -> None:
+    """Point the application at a fresh SQLite database before it is imported."""
+    os.environ["DATABASE_ENGINE"] = "sqlite"
+    os.environ["SQLITE_PATH"] = os.path.join(tempfile.mkdtemp(prefix="recipe-serialization-"),
+                                             "users.db")
+    os.environ["CACHE_BACKEND"] = "local"
+
+
+def seed_users(rows: int) -> None:
+    """Insert `rows` users."""
+    import config.database as db  # pylint: disable=import-outside-toplevel
+
+    today = str(datetime.date.today())
+    users = [{"username": f"bench-user-{index}", "email": f"bench-user-{index}@example.com",
+              "password": "$2b$12$" + "x" * 53, "phone_number": f"555{index:07d}",
+              "profile_picture": None if index % 2 else f"https://example.com/{index}.png",
+              "creation_date": today, "update_date": today}
+             for index in range(rows)]
+    with db.database.connection_context(), db.database.atomic():
+        for start in range(0, rows, SEED_CHUNK_SIZE):
+            db.UserModel.insert_many(users[start:start + SEED_CHUNK_SIZE]).execute()
+
+
+def build_app(rows: int) -> FastAPI:
+    """
+    Build an application serving the same page of users both ways.
+
+    Args:
+        rows (int): Users per page.
+
+    Returns:
+        FastAPI: The application under test.
+    """
+    # pylint: disable=import-outside-toplevel
+    import config.database as db
+    from helpers.db_executor import run_in_db_executor
+    from helpers.serialization import PrecompiledJSONResponse
+    from models.user import UserPage, UserPageRows
+    from services.user_service import UserService
+
+    page_adapter = TypeAdapter(UserPageRows)
+    bench_app = FastAPI()
+
+    def get_models_page() -> list:
+        with db.database.connection_context():
+            return list(db.UserModel.select().order_by(db.UserModel.id).limit(rows))
+
+    def get_rows_page() -> list[dict]:
+        with db.database.connection_context():
+            return UserService.get_users_page(None, rows)[0]
+
+    @bench_app.get("/models", response_model=UserPage)
+    async def models_page():
+        return {"items": await run_in_db_executor(get_models_page), "next_cursor": None}
+
+    @bench_app.get("/rows", response_model=UserPage)
+    async def rows_page():
+        users = await run_in_db_executor(get_rows_page)
+        return PrecompiledJSONResponse({"items": users, "next_cursor": None}, page_adapter)
+
+    return bench_app
+
+
+async def run(args) -> list[dict]:
+    """
+    Request the page from both endpoints and time them.
+
+    Returns:
+        list[dict]: The rows per second of each endpoint.
+    """
+    transport = httpx.ASGITransport(app=build_app(args.rows))
+    results, bodies = [], {}
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for mode in ("models", "rows"):
+            await client.get(f"/{mode}")
+            timings = []
+            for _ in range(args.repeats):
+                start = time.perf_counter()
+                response = await client.get(f"/{mode}")
+                timings.append(time.perf_counter() - start)
+                response.raise_for_status()
+            bodies[mode] = response.json()
+            best = min(timings)
+            results.append({
+                "mode": mode,
+                "rows": args.rows,
+                "repeats": args.repeats,
+                "best_ms": round(best * 1000, 2),
+                "rows_per_second": round(args.rows / best),
+                "body_bytes": len(response.content),
+            })
+    if bodies["models"] != bodies["rows"]:
+        raise SystemExit("The two endpoints returned different bodies")
+    return results
+
+
+def main():
+    """Seed the users, run the benchmark for both modes and print the results."""
+    args = parse_args()
+    configure_environment()
+    from run_benchmark import create_schema  # pylint: disable=import-outside-toplevel
+
+    create_schema()
+    seed_users(args.rows)
+    print(json.dumps(asyncio.run(run(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()